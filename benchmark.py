@@ -0,0 +1,151 @@
+# ################ End-to-end benchmark of solve() and solveto() with reproducible random cubes #######################
+# Usage: python benchmark.py -n 100 --seed 1 --timeout 3 --backend thread --out result.json
+#        python benchmark.py -n 20 --max-length 19 --timeout 10 --scaling   (1 to 6 threads, for free-threaded builds)
+import argparse
+import json
+import random
+import sys
+import time
+from cube import FaceCube, RoughCube
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def random_cube(rng):
+    """Return a uniformly distributed random solvable cube in RoughCube representation.
+    :param rng: A random.Random instance
+    """
+    cp = list(range(8))
+    ep = list(range(12))
+    rng.shuffle(cp)
+    rng.shuffle(ep)
+    co = [rng.randrange(3) for _ in range(7)]
+    co.append(-sum(co) % 3)  # the total twist is a multiple of 3
+    eo = [rng.randrange(2) for _ in range(11)]
+    eo.append(sum(eo) % 2)  # the total flip is even
+    cube = RoughCube(cp, co, ep, eo)
+    if cube.corner_parity() != cube.edge_parity():  # swapping two edges changes the edge parity
+        ep[10], ep[11] = ep[11], ep[10]
+        cube = RoughCube(cp, co, ep, eo)
+    return cube
+
+
+def random_cubestrings(n, seed=0):
+    """Return a list of n cube definition strings of random cubes. The same seed gives the same cubes."""
+    rng = random.Random(seed)
+    return [FaceCube.from_roughcube(random_cube(rng)).to_string() for _ in range(n)]
+
+
+def _percentile(values, p):
+    """Nearest rank percentile of the sorted list values."""
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))]
+
+
+def _peak_rss_kb():
+    """Peak resident set size of this process and of its finished child processes in kilobytes, None if unknown."""
+    if resource is None:
+        return None
+    rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+              resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return rss // 1024 if sys.platform == 'darwin' else rss  # bytes on macOS, kilobytes on Linux
+
+
+def run(n=100, seed=0, max_length=20, timeout=3, backend='thread', solve_to=False):
+    """Solve n random cubes and return the measurements as a dictionary.
+    :param n: The number of cubes
+    :param seed: The seed of the random cubes
+    :param max_length: See solver.solve()
+    :param timeout: See solver.solve()
+    :param backend: See solver.solve()
+    :param solve_to: If True, solve each cube to a second random cube with solver.solveto()
+    """
+    import solver
+
+    cubes = random_cubestrings(n, seed)
+    goals = random_cubestrings(n, seed + 1) if solve_to else None
+    latencies = []
+    lengths = {}
+    errors = 0
+    start = time.perf_counter()
+    for i, cubestring in enumerate(cubes):
+        t = time.perf_counter()
+        if solve_to:
+            s = solver.solveto(cubestring, goals[i], max_length, timeout, backend)
+        else:
+            s = solver.solve(cubestring, max_length, timeout, backend)
+        latencies.append(time.perf_counter() - t)
+        if not s.endswith('f)'):  # an error message
+            errors += 1
+            continue
+        length = int(s[s.rindex('(') + 1:-2])
+        lengths[length] = lengths.get(length, 0) + 1
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'cubes': n,
+        'seed': seed,
+        'max_length': max_length,
+        'timeout': timeout,
+        'backend': backend,
+        'solveto': solve_to,
+        'errors': errors,
+        'total_seconds': total,
+        'solves_per_second': n / total if total > 0 else None,
+        'latency_seconds': {'min': latencies[0], 'p50': _percentile(latencies, 50), 'p90': _percentile(latencies, 90),
+                            'p99': _percentile(latencies, 99), 'max': latencies[-1]} if latencies else None,
+        'length_histogram': {str(k): lengths[k] for k in sorted(lengths)},
+        'mean_length': sum(k * v for k, v in lengths.items()) / sum(lengths.values()) if lengths else None,
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+def thread_scaling(n=20, seed=0, max_length=19, timeout=10, threads=(1, 2, 3, 4, 5, 6)):
+    """Solve the same random cubes with the freethread backend and 1, 2, ... threads and return the measurements.
+    The speedup is the solve rate relative to the first thread count. It is only above 1 on a free-threaded Python
+    build, with the GIL the threads take turns."""
+    import solver
+
+    saved = solver.FREE_THREAD_WORKERS
+    runs = []
+    try:
+        for k in threads:
+            solver.FREE_THREAD_WORKERS = k
+            r = run(n, seed, max_length, timeout, 'freethread')
+            r['threads'] = k
+            runs.append(r)
+    finally:
+        solver.FREE_THREAD_WORKERS = saved
+    for r in runs:
+        r['speedup'] = r['solves_per_second'] / runs[0]['solves_per_second']
+    return {'free_threaded': solver.FREE_THREADED, 'python': sys.version, 'runs': runs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark solve() with reproducible random cubes.')
+    parser.add_argument('-n', type=int, default=100, help='number of cubes')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random cubes')
+    parser.add_argument('--max-length', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=3)
+    parser.add_argument('--backend', choices=('thread', 'process', 'split', 'freethread'), default='thread')
+    parser.add_argument('--solveto', action='store_true', help='solve to random goal cubes with solveto()')
+    parser.add_argument('--scaling', action='store_true',
+                        help='measure the freethread backend with 1 to 6 threads, ignores --backend and --solveto')
+    parser.add_argument('--out', help='write the JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+    if args.scaling:
+        report = thread_scaling(args.n, args.seed, args.max_length, args.timeout)
+    else:
+        report = run(args.n, args.seed, args.max_length, args.timeout, args.backend, args.solveto)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# ################ Cache of solutions keyed by the class of the cube under the 48 symmetries and inversion #############
+import dbm
+import os
+import threading
+from collections import OrderedDict
+from cubedefs import Move, N_MOVE, N_SYM
+from cube import RoughCube
+import symmetries as sy
+
+
+def canonical(cube):
+    """Find the canonical representative of the class of a cube under the 48 symmetries and inversion.
+    :param cube: The cube in RoughCube representation
+    :return: (key, s, inverted). The representative is symCube[s] * cube * symCube[s]^-1, inverted if inverted is True.
+     key are the packed cubies of the representative, the smallest of all 96 candidates.
+    """
+    sym_cube, inv_idx = sy.symCube, sy.inv_idx
+    best = None
+    x = RoughCube()
+    xi = RoughCube()
+    for s in range(N_SYM):
+        x.copy_from(sym_cube[s])
+        x.multiply(cube)
+        x.multiply(sym_cube[inv_idx[s]])
+        key = bytes(x.corners + x.edges)
+        if best is None or key < best[0]:
+            best = (key, s, False)
+        x.inv_rough_cube(xi)
+        key = bytes(xi.corners + xi.edges)
+        if key < best[0]:
+            best = (key, s, True)
+    return best
+
+
+def _invert(maneuver):
+    return [(m // 3) * 3 + (2 - m % 3) for m in reversed(maneuver)]  # R1->R3, R2->R2, R3->R1 etc.
+
+
+def to_canonical(maneuver, s, inverted):
+    """Map a maneuver which solves a cube to the maneuver which solves its canonical representative."""
+    if inverted:
+        maneuver = _invert(maneuver)
+    return [Move(sy.conj_move[N_MOVE * s + m]) for m in maneuver]  # s*m*s^-1
+
+
+def from_canonical(maneuver, s, inverted):
+    """Map a maneuver which solves the canonical representative back to the maneuver which solves the cube."""
+    if inverted:
+        maneuver = _invert(maneuver)
+    si = sy.inv_idx[s]
+    return [Move(sy.conj_move[N_MOVE * si + m]) for m in maneuver]  # s^-1*m*s
+
+
+class SolutionCache:
+    """LRU cache of solutions in front of solver.solve() and solver.solveto().
+
+    All cubes of a symmetry+inverse class share one entry, a hit is mapped into the frame of the requested cube.
+    Optionally the entries are also kept in a dbm database on disk which survives restarts. Only the process which
+    made the cache uses the database, and it opens the database for each access instead of keeping it open: the worker
+    processes of solve_many are forked with a copy of the cache, and processes writing through an inherited handle
+    lose entries, dbm.dumb for example keeps its index in memory and rewrites it on close. The workers use their copy
+    of the entries in memory only.
+    """
+    def __init__(self, maxsize=100000, path=None):
+        """
+        :param maxsize: The maximal number of entries kept in memory. The least recently used entry is evicted.
+        :param path: The file name of the persistent database, None for a cache in memory only
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> maneuver of the canonical representative as bytes
+        self._lock = threading.Lock()
+        self._path = path
+        self._pid = os.getpid()  # the process which uses the database
+        if path is not None:
+            dbm.open(path, 'c').close()
+
+    def _persistent(self):
+        """Return True if this process uses the database."""
+        return self._path is not None and os.getpid() == self._pid
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        man = self._entries.get(key)
+        if man is not None:
+            self._entries.move_to_end(key)
+        elif self._persistent():
+            with dbm.open(self._path, 'r') as db:
+                man = db.get(key)
+            if man is not None:
+                self._put(key, man)
+        return man
+
+    def _put(self, key, man):
+        self._entries[key] = man
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def lookup(self, cube, max_length=20):
+        """Return a maneuver which solves the cube in RoughCube representation or None.
+        A cached maneuver longer than max_length counts as a miss.
+        """
+        key, s, inverted = canonical(cube)
+        with self._lock:
+            man = self._get(key)
+            if man is None or len(man) > max_length:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return from_canonical(man, s, inverted)
+
+    def store(self, cube, maneuver):
+        """Store a maneuver which solves the cube in RoughCube representation, unless a shorter one is cached."""
+        key, s, inverted = canonical(cube)
+        man = bytes(to_canonical(maneuver, s, inverted))
+        with self._lock:
+            old = self._get(key)
+            if old is not None and len(old) <= len(man):
+                return
+            self._put(key, man)
+            if self._persistent():
+                with dbm.open(self._path, 'w') as db:
+                    db[key] = man
+
+    def stats(self):
+        """Return the hit and miss counters and the number of entries in memory."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def clear(self):
+        """Remove all entries from memory and reset the counters. The persistent database is not changed."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def close(self):
+        """Stop using the persistent database, the entries in memory are kept."""
+        with self._lock:
+            self._path = None
@@ -1,6 +1,51 @@
 from cubedefs import (Color, Corner, Edge, cornerFacelet,
                       cornerColor, edgeFacelet, edgeColor,
-                      N_SYM, CubeMoves)
+                      N_SYM, CubeMoves, CubeError)
+
+# ################################ Tables of the facelet parser ########################################################
+# The parser translates a cube definition string with bytes.translate into the colors 0..5 and decodes each corner and
+# edge with a single table lookup. Invalid characters and color combinations become _INVALID.
+_INVALID = 255
+_COLOR_NAMES = ''.join(c.name for c in Color)  # 'URFDLB'
+_SCANNER_COLORS = 'YRBWOG'  # the colors of FaceCube.from_colors, in the order of Color
+_FACELET_TABLE = bytes(_COLOR_NAMES.find(chr(b)) if chr(b) in _COLOR_NAMES else _INVALID for b in range(256))
+_SCANNER_TABLE = bytes(_SCANNER_COLORS.find(chr(b)) if chr(b) in _SCANNER_COLORS else _INVALID for b in range(256))
+_SCANNER_TO_NAME = dict(zip(_SCANNER_COLORS, _COLOR_NAMES))
+_CORNER_FACELETS = tuple(tuple(int(f) for f in corner) for corner in cornerFacelet)
+_EDGE_FACELETS = tuple(tuple(int(f) for f in edge) for edge in edgeFacelet)
+
+
+def _corner_decode():
+    """table[36 * c0 + 6 * c1 + c2] is the packed corner cp + 8 * co with the facelet colors c0, c1, c2."""
+    table = bytearray([_INVALID] * 216)
+    for j, colors in enumerate(cornerColor):
+        for ori in range(3):
+            f = [0] * 3
+            for k in range(3):
+                f[(k + ori) % 3] = colors[k]
+            table[36 * f[0] + 6 * f[1] + f[2]] = j | ori << 3
+    return bytes(table)
+
+
+def _edge_decode():
+    """table[6 * c0 + c1] is the packed edge ep + 16 * eo with the facelet colors c0, c1."""
+    table = bytearray([_INVALID] * 36)
+    for j, (c0, c1) in enumerate(edgeColor):
+        table[6 * c0 + c1] = j
+        table[6 * c1 + c0] = j | 16
+    return bytes(table)
+
+
+_CORNER_DECODE = _corner_decode()
+_EDGE_DECODE = _edge_decode()
+_CENTERS = bytes(range(6))
+
+
+def _decode(t):
+    """Decode the colors t of the 54 facelets into the packed corners and edges of a RoughCube."""
+    corners = bytearray([_CORNER_DECODE[36 * t[a] + 6 * t[b] + t[c]] for a, b, c in _CORNER_FACELETS])
+    edges = bytearray([_EDGE_DECODE[6 * t[a] + t[b]] for a, b in _EDGE_FACELETS])
+    return corners, edges
 
 
 class FaceCube:
@@ -21,42 +66,23 @@ class FaceCube:
             return f'Error: Cube definition string {facelets} contains less than 54 facelets.'
         elif len(facelets) > 54:
             return f'Error: Cube definition string {facelets} contains more than 54 facelets.'
-        cnt = [0 for _ in range(6)]
-
-        for index, character in enumerate(facelets):
-            for color in Color:
-                if character == color.name:
-                    self.facelets[index] = color
-                    cnt[color.value] += 1
-                    break
+        t = facelets.encode('latin-1', 'replace').translate(_FACELET_TABLE)  # invalid characters are not counted
 
-        if all(x == 9 for x in cnt):
+        if all(t.count(c) == 9 for c in range(6)):
+            self.facelets = [self.colors[c] for c in t]
             return True
         else:
             return 'Error: Cube definition string ' + facelets + ' does not contain exactly 9 facelets of each color.'
 
     def from_colors(self, colors):
-        valid_colors = ["Y", "R", "B", "W", "O", "G"]
-        facelets = ''
         for color in colors:
-            if color not in valid_colors:
+            if color not in _SCANNER_TO_NAME:
                 return f'Error: Invalid color {color} in facelet colors.'
-            for member in Color:
-                if valid_colors.index(color) == member.value:
-                    facelets += member.name
-                    break
-        self.from_string(facelets)
+        self.from_string(''.join([_SCANNER_TO_NAME[color] for color in colors]))
 
     def to_string(self):
         """Give a string representation of the facelet cube."""
-        facelets = ''
-        for i in range(54):
-            for member in Color:
-                if self.facelets[i] == member:
-                    facelets += member.name
-                    break
-
-        return facelets
+        return ''.join([_COLOR_NAMES[c] for c in self.facelets])
 
     def to_2dstring(self):
         """Give a 2dstring representation of a facelet cube."""
@@ -71,26 +97,53 @@ class FaceCube:
     def from_roughcube(cls, roughcube):
         """Return a facelet representation of the cube."""
         fc = cls()
-        for i in Color:
-            j = roughcube.cp[i]  # corner j is at corner position i
-            ori = roughcube.co[i]  # orientation of C j at position i
+        for i, c in enumerate(roughcube.corners):
+            j = c & 7  # corner j is at corner position i
+            ori = c >> 3  # orientation of C j at position i
             for k in range(3):
                 fc.facelets[cornerFacelet[i][(k + ori) % 3]] = cornerColor[j][k]
-        for i in Edge:
-            j = roughcube.ep[i]  # similar for Es
-            ori = roughcube.eo[i]
+        for i, e in enumerate(roughcube.edges):
+            j = e & 15  # similar for Es
+            ori = e >> 4
             for k in range(2):
                 fc.facelets[edgeFacelet[i][(k + ori) % 2]] = edgeColor[j][k]
         return fc
 
 
+def ori_add(ori_a, ori_b):
+    """The orientation of a corner with orientation ori_a in cube a and ori_b in cube b in the product a*b.
+    Orientations >= 3 belong to the mirrored cubes of the symmetries.
+    """
+    if ori_a < 3:
+        if ori_b < 3:
+            return (ori_a + ori_b) - 3 if ori_a + ori_b >= 3 else ori_a + ori_b
+        return (ori_a + ori_b) - 3 if ori_a + ori_b >= 6 else ori_a + ori_b
+    if ori_b < 3:
+        return (ori_a - ori_b) + 3 if ori_a - ori_b < 3 else ori_a - ori_b
+    return (ori_a - ori_b) + 3 if ori_a - ori_b < 0 else ori_a - ori_b
+
+
+# A RoughCube stores each cubie in one byte: a corner as cp + 8 * co, an edge as ep + 16 * eo.
+# _CORNER_MUL[a + 48 * ori_b] is the corner of a*b if corner a of cube a is at the position of a corner with
+# orientation ori_b in cube b. _EDGE_MUL is the same for the edges.
+_CORNER_MUL = bytes((a & 7) | ori_add(a >> 3, ori_b) << 3 for ori_b in range(6) for a in range(48))
+_EDGE_MUL = bytes((a & 15) | ((a >> 4) ^ ori_b) << 4 for ori_b in range(2) for a in range(32))
+# _CORNER_INV[ori] is the orientation of the inverse corner, shifted to its place in the byte
+_CORNER_INV = bytes((ori if ori >= 3 else -ori % 3) << 3 for ori in range(6))
+
+
 class RoughCube:
     """Represent a cube on level 1 with 8 corner cubies, 12 edge cubies and the cubie orientations.
 
     Is also used to represent:
     1. the 18 cube moves
     2. the 48 symmetries of the cube.
+
+    The cubies are packed into the bytearrays corners and edges. cp, co, ep and eo give read-only copies of the
+    permutations and orientations.
     """
+    __slots__ = ('corners', 'edges')
+
     def __init__(self, cp=None, co=None, ep=None, eo=None):
         """
         Initializes corners and edges.
@@ -99,67 +152,66 @@ class RoughCube:
         :param ep: edge permutation
         :param eo: edge orientation
         """
-        self.cp = cp.copy() if cp else [member for member in Corner]
-        self.co = co.copy() if co else [0] * 8
-        self.ep = ep.copy() if ep else [member for member in Edge]
-        self.eo = eo.copy() if eo else [0] * 12
+        cp = cp if cp else range(8)
+        co = co if co else bytes(8)
+        ep = ep if ep else range(12)
+        eo = eo if eo else bytes(12)
+        self.corners = bytearray(p | o << 3 for p, o in zip(cp, co))
+        self.edges = bytearray(p | o << 4 for p, o in zip(ep, eo))
+
+    @property
+    def cp(self):
+        return bytes(c & 7 for c in self.corners)
+
+    @property
+    def co(self):
+        return bytes(c >> 3 for c in self.corners)
+
+    @property
+    def ep(self):
+        return bytes(e & 15 for e in self.edges)
+
+    @property
+    def eo(self):
+        return bytes(e >> 4 for e in self.edges)
+
+    def copy(self):
+        """Return a copy of this rough cube."""
+        cube = RoughCube.__new__(RoughCube)
+        cube.corners = bytearray(self.corners)
+        cube.edges = bytearray(self.edges)
+        return cube
+
+    def copy_from(self, other):
+        """Overwrite this rough cube with other without allocating a new cube."""
+        self.corners[:] = other.corners
+        self.edges[:] = other.edges
 
     def __str__(self):
         """Print string for a rough cube."""
         s = ''
-        for member in Color:
-            s += '(' + str(self.cp[member]) + ',' + str(self.co[member]) + ')'
+        for c in self.corners:
+            s += '(' + str(Corner(c & 7)) + ',' + str(c >> 3) + ')'
         s += '\n'
-        for member in Edge:
-            s += '(' + str(self.ep[member]) + ',' + str(self.eo[member]) + ')'
+        for e in self.edges:
+            s += '(' + str(Edge(e & 15)) + ',' + str(e >> 4) + ')'
         return s
 
     def __eq__(self, other):
         """Define equality of two rough cubes."""
-        if self.cp == other.cp and self.co == other.co and self.ep == other.ep and self.eo == other.eo:
-            return True
-        else:
-            return False
+        return self.corners == other.corners and self.edges == other.edges
 
     def corner_multiply(self, other):
         """Multiply this cubie cube with another cubie cube b, restricted to the corners.
         Does not change b.
         """
-
-        c_perm = [0] * 8
-        c_ori = [0] * 8
-
-        for c in Corner:
-            c_perm[c] = self.cp[other.cp[c]]
-            ori_a = self.co[other.cp[c]]
-            ori_b = other.co[c]
-
-            if ori_a < 3:
-                if ori_b < 3:
-                    ori = (ori_a + ori_b) - 3 if ori_a + ori_b >= 3 else ori_a + ori_b
-                else:
-                    ori = (ori_a + ori_b) - 3 if ori_a + ori_b >= 6 else ori_a + ori_b
-            else:
-                if ori_b < 3:
-                    ori = (ori_a - ori_b) + 3 if ori_a - ori_b < 3 else ori_a - ori_b
-                else:
-                    ori = (ori_a - ori_b) + 3 if ori_a - ori_b < 0 else ori_a - ori_b
-            c_ori[c] = ori
-
-        for c in Corner:
-            self.cp[c] = c_perm[c]
-            self.co[c] = c_ori[c]
+        a = self.corners
+        a[:] = [_CORNER_MUL[a[c & 7] + 48 * (c >> 3)] for c in other.corners]
 
     def edge_multiply(self, other):
         """ Multiply this cubie cube with another cubiecube b, restricted to the edges. Does not change b."""
-        e_perm = [0] * 12
-        e_ori = [0] * 12
-        for e in Edge:
-            e_perm[e] = self.ep[other.ep[e]]
-            e_ori[e] = (other.eo[e] + self.eo[other.ep[e]]) % 2
-        for e in Edge:
-            self.ep[e] = e_perm[e]
-            self.eo[e] = e_ori[e]
+        a = self.edges
+        a[:] = [_EDGE_MUL[a[e & 15] + 32 * (e >> 4)] for e in other.edges]
 
     def multiply(self, other):
         self.corner_multiply(other)
@@ -167,100 +219,97 @@ class RoughCube:
 
     def inv_rough_cube(self, other):
         """Store the inverse of this rough cube in d."""
-        for e in Edge:
-            other.ep[self.ep[e]] = e
-        for e in Edge:
-            other.eo[e] = self.eo[other.ep[e]]
-
-        for c in Corner:
-            other.cp[self.cp[c]] = c
-        for c in Corner:
-            ori = self.co[other.cp[c]]
-            if ori >= 3:
-                other.co[c] = ori
-            else:
-                other.co[c] = -ori if other.co[c] >= 0 else other.co[c] + 3
+        d = other.edges
+        for e, x in enumerate(self.edges):
+            d[x & 15] = e | (x & 16)
+        d = other.corners
+        for c, x in enumerate(self.corners):
+            d[x & 7] = c | _CORNER_INV[x >> 3]
 
     def corner_parity(self):
         """Give the parity of the corner permutation."""
+        cp = self.cp
         s = 0
         for i in range(Corner.DRB, Corner.URF, -1):
             for j in range(i - 1, Corner.URF - 1, -1):
-                if self.cp[j] > self.cp[i]:
+                if cp[j] > cp[i]:
                     s += 1
         return s % 2
 
     def edge_parity(self):
         """Give the parity of the edge permutation. A solvable cube has the same corner and edge parity."""
+        ep = self.ep
         s = 0
         for i in range(Edge.BR, Edge.UR, -1):
             for j in range(i - 1, Edge.UR - 1, -1):
-                if self.ep[j] > self.ep[i]:
+                if ep[j] > ep[i]:
                     s += 1
         return s % 2
 
     def symmetries(self, symcube, inv_idx):
-        """Generate a list of the symmetries and antisymmetries of the cubie cube."""
+        """Generate a list of the symmetries and antisymmetries of the rough cube.
+        The conjugates symcube[j] * self * symcube[j]^-1 are computed cubie by cubie and a candidate is rejected at the
+        first cubie which matches neither the cube nor its inverse. Most cubes have no symmetry, so almost all
+        candidates are rejected after one or two corners.
+        """
         s = []
-        tcube = RoughCube()
+        corners, edges = self.corners, self.edges
+        inv = RoughCube.__new__(RoughCube)
+        inv.corners = bytearray(8)
+        inv.edges = bytearray(12)
+        self.inv_rough_cube(inv)
+        inv_corners, inv_edges = inv.corners, inv.edges
         for j in range(N_SYM):
-            cube = RoughCube(symcube[j].cp, symcube[j].co, symcube[j].ep, symcube[j].eo)
-            cube.multiply(self)
-            cube.multiply(symcube[inv_idx[j]])
-            if self == cube:
+            a, b = symcube[j].corners, symcube[inv_idx[j]].corners
+            sym = anti = True
+            for i, t in enumerate(b):
+                c = corners[t & 7]  # corner i of a * self * b
+                x = _CORNER_MUL[_CORNER_MUL[a[c & 7] + 48 * (c >> 3)] + 48 * (t >> 3)]
+                sym = sym and x == corners[i]
+                anti = anti and x == inv_corners[i]
+                if not (sym or anti):
+                    break
+            else:
+                a, b = symcube[j].edges, symcube[inv_idx[j]].edges
+                for i, t in enumerate(b):
+                    e = edges[t & 15]
+                    x = _EDGE_MUL[_EDGE_MUL[a[e & 15] + 32 * (e >> 4)] + 32 * (t >> 4)]
+                    sym = sym and x == edges[i]
+                    anti = anti and x == inv_edges[i]
+                    if not (sym or anti):
+                        break
+            if sym:
                 s.append(j)
-            cube.inv_rough_cube(tcube)
-            if self == tcube:  # then we have antisymmetry
+            if anti:  # then we have antisymmetry
                 s.append(j + N_SYM)
         return s
 
     def get_twist(self):
         """Get the twist of the 8 corners. 0 <= twist < 2187 in phase 1, twist = 0 in phase 2."""
         ret = 0
-        for i in range(Corner.URF, Corner.DRB):
-            ret = 3 * ret + self.co[i]
+        for c in self.corners[:Corner.DRB]:
+            ret = 3 * ret + (c >> 3)
         return ret
 
     def set_twist(self, twist):
+        corners = self.corners
         twistparity = 0
         for i in range(Corner.DRB - 1, Corner.URF - 1, -1):
-            self.co[i] = twist % 3
-            twistparity += self.co[i]
+            corners[i] = (corners[i] & 7) | (twist % 3) << 3
+            twistparity += twist % 3
             twist = twist // 3
-        self.co[Corner.DRB] = ((3 - twistparity % 3) % 3)
+        corners[Corner.DRB] = (corners[Corner.DRB] & 7) | ((3 - twistparity % 3) % 3) << 3
 
     @classmethod
     def from_facecube(cls, facecube:FaceCube):
         """Return a cubie representation of the facelet cube."""
-        co = list()
-        cp = list()
-        eo = list()
-        ep = list()
-
-        # find every corner and its orientation
-        for corner in cornerFacelet:
-            for i in range(3):
-                if (facecube.facelets[corner[i]] == Color.U
-                        or facecube.facelets[corner[i]] == Color.D):
-                    source = [facecube.facelets[corner[i]],
-                              facecube.facelets[corner[(i + 1) % 3]],
-                              facecube.facelets[corner[(i + 2) % 3]]]
-                    co.append(i)
-                    cp.append(cornerColor.index(source))
-                    break
-
-        for edge in edgeFacelet:
-            source = [facecube.facelets[edge[0]],
-                      facecube.facelets[edge[1]]]
-            if source in edgeColor:
-                ep.append(edgeColor.index(source))
-                eo.append(0)
-            else:
-                source.reverse()
-                ep.append(edgeColor.index(source))
-                eo.append(1)
-
-        return cls(cp, co, ep, eo)
+        corners, edges = _decode(bytes(facecube.facelets))
+        if _INVALID in corners or _INVALID in edges:
+            raise ValueError('facelet cube with an invalid corner or edge')
+        cube = cls.__new__(cls)
+        cube.corners = corners
+        cube.edges = edges
+        return cube
 
 
 basicMoveCube = list()
@@ -274,4 +323,75 @@ for color in Color:
     rc = RoughCube()
     for i in range(3):
         rc.multiply(basicMoveCube[color])
-        moveCube.append(RoughCube(rc.cp, rc.co, rc.ep, rc.eo))
+        moveCube.append(rc.copy())
+
+
+# ################################ Bulk parsing of cube definition strings ############################################
+
+def _perm_parity(perm):
+    """The parity of a permutation, computed from its cycles."""
+    seen = 0
+    parity = 0
+    for i in range(len(perm)):
+        if not seen >> i & 1:
+            j = i
+            while not seen >> j & 1:  # walk the cycle of i, a cycle of length n has n - 1 transpositions
+                seen |= 1 << j
+                j = perm[j]
+                parity ^= 1
+            parity ^= 1
+    return parity
+
+
+def parse_cube(record, colors=False):
+    """Decode one cube definition string and check that it is a solvable cube.
+    :param record: 54 facelet characters as bytes or str
+    :param colors: If True, the facelets are given in the colors Y, R, B, W, O, G of FaceCube.from_colors
+    :return: (CubeError.OK, cube) with the cube in RoughCube representation or (error code, None)
+    """
+    if isinstance(record, str):
+        record = record.encode('latin-1', 'replace')
+    if len(record) != 54:
+        return CubeError.LENGTH, None
+    t = record.translate(_SCANNER_TABLE if colors else _FACELET_TABLE)
+    if _INVALID in t:
+        return CubeError.CHARACTER, None
+    if t.count(0) != 9 or t.count(1) != 9 or t.count(2) != 9 or t.count(3) != 9 or t.count(4) != 9:
+        return CubeError.COLOR_COUNT, None  # 54 facelets and 5 counts of 9 leave 9 for the last color
+    if t[4::9] != _CENTERS:
+        return CubeError.CENTERS, None
+    corners, edges = _decode(t)
+    if _INVALID in corners:
+        return CubeError.CORNER, None
+    if _INVALID in edges:
+        return CubeError.EDGE, None
+    cp = [c & 7 for c in corners]
+    ep = [e & 15 for e in edges]
+    if len(set(cp)) != 8:
+        return CubeError.CORNER_DUPLICATE, None
+    if len(set(ep)) != 12:
+        return CubeError.EDGE_DUPLICATE, None
+    if (sum(corners) - 28) // 8 % 3 != 0:  # the sum of the corner bytes is sum(cp) + 8 * sum(co) = 28 + 8 * sum(co)
+        return CubeError.TWIST, None
+    if (sum(edges) - 66) // 16 % 2 != 0:  # sum(ep) = 66
+        return CubeError.FLIP, None
+    if _perm_parity(cp) != _perm_parity(ep):
+        return CubeError.PARITY, None
+    cube = RoughCube.__new__(RoughCube)
+    cube.corners = corners
+    cube.edges = edges
+    return CubeError.OK, cube
+
+
+def parse_cubes(data, colors=False, stride=54):
+    """Decode a buffer with many cube definition strings.
+    :param data: The cubes as bytes, bytearray, memoryview or str, one record of 54 facelets every stride bytes
+    :param colors: See parse_cube()
+    :param stride: The distance of the records, for example 55 for records terminated by a newline
+    :return: A list with (error code, cube or None) for each record, see parse_cube(). An incomplete last record gives
+     CubeError.LENGTH.
+    """
+    if isinstance(data, str):
+        data = data.encode('latin-1', 'replace')
+    data = bytes(data)
+    return [parse_cube(data[i:i + 54], colors) for i in range(0, len(data), stride)]
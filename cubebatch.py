@@ -0,0 +1,189 @@
+# ############### Vectorized arrays of cubes. A CubeBatch holds N cubes as NumPy arrays, one row per cube. #############
+# The operations have the same meaning as the methods of RoughCube, but work on all cubes of the batch at once.
+import numpy as np
+from cubedefs import Color, cornerFacelet, edgeFacelet, cornerColor, edgeColor, N_SYM
+from cube import RoughCube
+from tablegen import ORI_ADD, get_twist, set_twist
+
+_CORNER_FACELET = np.array(cornerFacelet, dtype=np.intp)
+_EDGE_FACELET = np.array(edgeFacelet, dtype=np.intp)
+_CORNER_COLOR = np.array(cornerColor, dtype=np.int8)
+_EDGE_COLOR = np.array(edgeColor, dtype=np.int8)
+# the orientation of the inverse corner, orientations >= 3 belong to the mirrored cubes of the symmetries
+_CORNER_INV = np.array([0, 2, 1, 3, 4, 5], dtype=np.int8)
+
+# _CORNER_CODE[36 * c0 + 6 * c1 + c2] is the corner with the colors c0, c1, c2 in clockwise order starting with the U or
+# D color, -1 if there is no such corner.
+_CORNER_CODE = np.full(216, -1, dtype=np.int8)
+for _j, (_c0, _c1, _c2) in enumerate(cornerColor):
+    _CORNER_CODE[36 * _c0 + 6 * _c1 + _c2] = _j
+# _EDGE_CODE[6 * c0 + c1] is edge + 16 * orientation of the edge with the colors c0, c1, -1 if there is no such edge
+_EDGE_CODE = np.full(36, -1, dtype=np.int8)
+for _j, (_c0, _c1) in enumerate(edgeColor):
+    _EDGE_CODE[6 * _c0 + _c1] = _j
+    _EDGE_CODE[6 * _c1 + _c0] = _j + 16
+
+# _COLOR_OF[character] is the color of a facelet character of the cube definition string, -1 for other characters
+_COLOR_OF = np.full(256, -1, dtype=np.int8)
+for _c in Color:
+    _COLOR_OF[ord(_c.name)] = _c
+_COLOR_NAMES = np.frombuffer(''.join(c.name for c in Color).encode('ascii'), dtype=np.uint8)
+
+
+def _parity(perm):
+    """The parities of the permutations in the rows of perm."""
+    n = perm.shape[1]
+    upper = np.triu(np.ones((n, n), dtype=bool), 1)
+    return ((perm[:, :, None] > perm[:, None, :]) & upper).sum(axis=(1, 2)) % 2
+
+
+class CubeBatch:
+    """Represent N cubes with the arrays cp, co of shape (N, 8) and ep, eo of shape (N, 12).
+
+    A batch with a single cube broadcasts against a batch with N cubes in multiply().
+    """
+
+    def __init__(self, cp, co, ep, eo):
+        self.cp = np.asarray(cp, dtype=np.int8)
+        self.co = np.asarray(co, dtype=np.int8)
+        self.ep = np.asarray(ep, dtype=np.int8)
+        self.eo = np.asarray(eo, dtype=np.int8)
+
+    def __len__(self):
+        return len(self.cp)
+
+    def __getitem__(self, index):
+        """Return the cube index as RoughCube or the cubes of a slice or index array as CubeBatch."""
+        if isinstance(index, (int, np.integer)):
+            return RoughCube(self.cp[index].tolist(), self.co[index].tolist(), self.ep[index].tolist(),
+                             self.eo[index].tolist())
+        return CubeBatch(self.cp[index], self.co[index], self.ep[index], self.eo[index])
+
+    def __eq__(self, other):
+        """Compare the cubes of two batches, return a boolean array."""
+        return ((self.cp == other.cp).all(axis=1) & (self.co == other.co).all(axis=1)
+                & (self.ep == other.ep).all(axis=1) & (self.eo == other.eo).all(axis=1))
+
+    @classmethod
+    def identity(cls, n):
+        """Return a batch of n solved cubes."""
+        return cls(np.tile(np.arange(8), (n, 1)), np.zeros((n, 8)), np.tile(np.arange(12), (n, 1)), np.zeros((n, 12)))
+
+    @classmethod
+    def from_roughcubes(cls, cubes):
+        """Return a batch of the cubes of a sequence of RoughCubes."""
+        corners = np.frombuffer(b''.join(c.corners for c in cubes), dtype=np.int8).reshape(-1, 8)
+        edges = np.frombuffer(b''.join(c.edges for c in cubes), dtype=np.int8).reshape(-1, 12)
+        return cls(corners & 7, corners >> 3, edges & 15, edges >> 4)  # the packing of RoughCube
+
+    def to_roughcubes(self):
+        return [self[i] for i in range(len(self))]
+
+    def copy(self):
+        return CubeBatch(self.cp.copy(), self.co.copy(), self.ep.copy(), self.eo.copy())
+
+    def corner_multiply(self, other):
+        """Multiply the corners of the cubes of this batch with the corners of the cubes of other."""
+        cp = np.broadcast_to(other.cp, np.broadcast_shapes(self.cp.shape, other.cp.shape))
+        self.co = ORI_ADD[np.take_along_axis(np.broadcast_to(self.co, cp.shape), cp, 1), other.co]
+        self.cp = np.take_along_axis(np.broadcast_to(self.cp, cp.shape), cp, 1)
+
+    def edge_multiply(self, other):
+        """Multiply the edges of the cubes of this batch with the edges of the cubes of other."""
+        ep = np.broadcast_to(other.ep, np.broadcast_shapes(self.ep.shape, other.ep.shape))
+        self.eo = np.take_along_axis(np.broadcast_to(self.eo, ep.shape), ep, 1) ^ other.eo
+        self.ep = np.take_along_axis(np.broadcast_to(self.ep, ep.shape), ep, 1)
+
+    def multiply(self, other):
+        """Multiply the cubes of this batch with the cubes of other, a CubeBatch or a RoughCube."""
+        if isinstance(other, RoughCube):
+            other = CubeBatch.from_roughcubes([other])
+        self.corner_multiply(other)
+        self.edge_multiply(other)
+
+    def inv_rough_cube(self, other=None):
+        """Store the inverse cubes of this batch in other and return it. A new batch is made if other is None."""
+        rows = np.arange(len(self))[:, None]
+        cp = np.empty_like(self.cp)
+        co = np.empty_like(self.co)
+        ep = np.empty_like(self.ep)
+        eo = np.empty_like(self.eo)
+        cp[rows, self.cp] = np.arange(8, dtype=np.int8)
+        co[rows, self.cp] = _CORNER_INV[self.co]
+        ep[rows, self.ep] = np.arange(12, dtype=np.int8)
+        eo[rows, self.ep] = self.eo
+        if other is None:
+            return CubeBatch(cp, co, ep, eo)
+        other.cp, other.co, other.ep, other.eo = cp, co, ep, eo
+        return other
+
+    def corner_parity(self):
+        """Give the parities of the corner permutations."""
+        return _parity(self.cp)
+
+    def edge_parity(self):
+        """Give the parities of the edge permutations. A solvable cube has the same corner and edge parity."""
+        return _parity(self.ep)
+
+    def get_twist(self):
+        """Get the twists of the corners. 0 <= twist < 2187 in phase 1, twist = 0 in phase 2."""
+        return get_twist(self.co)
+
+    def set_twist(self, twist):
+        """Set the corner orientations of all cubes from an array of twists."""
+        self.co = set_twist(twist)
+
+    def symmetries(self, symcube, inv_idx):
+        """Return a boolean array of shape (N, 96). Entry [i, j] is True if j < 48 and symmetry j is a symmetry of cube
+        i or if j >= 48 and symmetry j - 48 is an antisymmetry of cube i, as in RoughCube.symmetries()."""
+        result = np.zeros((len(self), 2 * N_SYM), dtype=bool)
+        for j in range(N_SYM):
+            cube = CubeBatch.from_roughcubes([symcube[j]])
+            cube.multiply(self)
+            cube.multiply(symcube[inv_idx[j]])
+            result[:, j] = self == cube
+            result[:, j + N_SYM] = self == cube.inv_rough_cube()
+        return result
+
+    @classmethod
+    def from_strings(cls, cubestrings):
+        """Return a batch of the cubes given by a sequence of cube definition strings.
+        Raise ValueError if a string does not define a cube with valid cubies. Use verify() for the parities and
+        orientations."""
+        raw = np.frombuffer(''.join(cubestrings).encode('ascii', 'replace'), dtype=np.uint8)
+        if len(raw) != 54 * len(cubestrings):
+            raise ValueError('all cube definition strings must contain 54 facelets')
+        facelets = _COLOR_OF[raw.reshape(-1, 54)]
+        if (facelets < 0).any():
+            raise ValueError('invalid facelet character in cube definition string')
+
+        colors = facelets[:, _CORNER_FACELET]  # (N, 8, 3)
+        co = np.argmax((colors == Color.U) | (colors == Color.D), axis=2).astype(np.int8)
+        k = (co[:, :, None] + np.arange(3)) % 3  # the colors in clockwise order starting with the U or D color
+        rotated = np.take_along_axis(colors, k, 2).astype(np.intp)
+        cp = _CORNER_CODE[36 * rotated[:, :, 0] + 6 * rotated[:, :, 1] + rotated[:, :, 2]]
+        colors = facelets[:, _EDGE_FACELET].astype(np.intp)  # (N, 12, 2)
+        code = _EDGE_CODE[6 * colors[:, :, 0] + colors[:, :, 1]]
+        if (cp < 0).any() or (code < 0).any():
+            raise ValueError('cube definition string with an invalid corner or edge')
+        return cls(cp, co, code & 15, code >> 4)
+
+    def to_strings(self):
+        """Return the list of the cube definition strings of the cubes."""
+        n = len(self)
+        rows = np.arange(n)[:, None]
+        facelets = np.repeat(np.repeat(np.arange(6, dtype=np.int8), 9)[None, :], n, axis=0)  # the centers
+        for k in range(3):
+            facelets[rows, _CORNER_FACELET[np.arange(8), (k + self.co) % 3]] = _CORNER_COLOR[self.cp, k]
+        for k in range(2):
+            facelets[rows, _EDGE_FACELET[np.arange(12), (k + self.eo) % 2]] = _EDGE_COLOR[self.ep, k]
+        text = _COLOR_NAMES[facelets].tobytes().decode('ascii')
+        return [text[54 * i:54 * (i + 1)] for i in range(n)]
+
+    def verify(self):
+        """Return a boolean array, True for the cubes which are solvable: the permutations are permutations, the total
+        twist is a multiple of 3, the total flip is even and the corner and edge parities are equal."""
+        return ((np.sort(self.cp, axis=1) == np.arange(8)).all(axis=1)
+                & (np.sort(self.ep, axis=1) == np.arange(12)).all(axis=1)
+                & (self.co.astype(np.int64).sum(axis=1) % 3 == 0) & (self.eo.astype(np.int64).sum(axis=1) % 2 == 0)
+                & (self.corner_parity() == self.edge_parity()))
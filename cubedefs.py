@@ -165,6 +165,22 @@ class BS(IntEnum):
     MIRR_LR2 = 3
 
 
+class CubeError(IntEnum):
+    """The result codes of the bulk parser cube.parse_cubes."""
+    OK = 0
+    LENGTH = 1  # the record does not have 54 facelets
+    CHARACTER = 2  # invalid facelet character
+    COLOR_COUNT = 3  # not exactly 9 facelets of each color
+    CENTERS = 4  # the centers are not in the order U, R, F, D, L, B
+    CORNER = 5  # a corner position has a color combination of no corner
+    EDGE = 6  # an edge position has a color combination of no edge
+    CORNER_DUPLICATE = 7  # a corner appears twice
+    EDGE_DUPLICATE = 8  # an edge appears twice
+    TWIST = 9  # the total corner twist is not a multiple of 3
+    FLIP = 10  # the total edge flip is odd
+    PARITY = 11  # the corner and edge permutations have different parities
+
+
 # Map the corner positions to facelet positions.
 cornerFacelet = [[Facelet.U9, Facelet.R1, Facelet.F3], 
                  [Facelet.U7, Facelet.F1, Facelet.L3], 
@@ -298,6 +314,7 @@ N_U_EDGES_PHASE2 = 1680  # number of different positions of the edges UR, UF, UL
 N_CORNERS = 40320  # 8! corner permutations in phase 2
 N_CORNERS_CLASS = 2768  # number of equivalence classes concerning symmetry group D4h
 N_UD_EDGES = 40320  # 8! permutations of the edges in the U-face and D-face in phase 2
+N_UD_EDGES_CLASS = 2768  # number of equivalence classes concerning symmetry group D4h
 
 N_SYM = 48  # number of cube symmetries of full group Oh
 N_SYM_D4h = 16  # Number of symmetries of subgroup D4h
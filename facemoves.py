@@ -0,0 +1,126 @@
+# ################ Moves on the facelet level. A sticker state is a cube definition string of 54 facelets. ############
+# FACELET_MOVE[m][i] is the facelet whose sticker moves to facelet i with move m, so the state after the move is
+# [state[FACELET_MOVE[m][i]] for i in range(54)]. The tables are derived from moveCube, no cubie conversion is needed
+# to apply a maneuver.
+from operator import itemgetter
+from cubedefs import Move, cornerFacelet, edgeFacelet
+from cube import moveCube
+
+
+def _facelet_move(mc):
+    """The facelet permutation of the move mc in RoughCube representation."""
+    perm = list(range(54))  # the centers do not move
+    for i, c in enumerate(mc.corners):
+        j, ori = c & 7, c >> 3  # corner j is at position i
+        for k in range(3):
+            perm[cornerFacelet[i][(k + ori) % 3]] = int(cornerFacelet[j][k])
+    for i, e in enumerate(mc.edges):
+        j, ori = e & 15, e >> 4
+        for k in range(2):
+            perm[edgeFacelet[i][(k + ori) % 2]] = int(edgeFacelet[j][k])
+    return tuple(perm)
+
+
+FACELET_MOVE = [_facelet_move(mc) for mc in moveCube]
+_GETTER = [itemgetter(*perm) for perm in FACELET_MOVE]
+# the tokens of a maneuver string: the move names R1, R2, R3 and the standard notation R, R2, R'
+_MOVE_OF = {}
+for _m in Move:
+    _MOVE_OF[_m.name] = _MOVE_OF[_m.name[0] + ('', '2', "'")[_m % 3]] = _m
+
+
+def parse_maneuver(maneuver):
+    """Return the list of moves of a maneuver.
+    :param maneuver: A string like "R1 U2 F3" as returned by solver.solve(), a trailing length like "(3f)" is ignored.
+     The standard notation "R U2 F'" is accepted too. A list of moves is returned unchanged.
+    """
+    if not isinstance(maneuver, str):
+        return list(maneuver)
+    moves = []
+    for token in maneuver.split():
+        if token.startswith('('):
+            break
+        m = _MOVE_OF.get(token)
+        if m is None:
+            raise ValueError('invalid move ' + token + ' in maneuver ' + maneuver)
+        moves.append(m)
+    return moves
+
+
+def maneuver_permutation(maneuver):
+    """Return the facelet permutation of a whole maneuver, used like FACELET_MOVE[m]."""
+    perm = tuple(range(54))
+    for m in parse_maneuver(maneuver):
+        perm = _GETTER[m](perm)  # perm[FACELET_MOVE[m][i]]: first the moves so far, then m
+    return perm
+
+
+def _to_bytes(state):
+    return state.encode('ascii') if isinstance(state, str) else bytes(state)
+
+
+def apply_move(state, m):
+    """Return the sticker state after the move m."""
+    s = bytes(_GETTER[m](_to_bytes(state)))
+    return s.decode('ascii') if isinstance(state, str) else s
+
+
+def apply_maneuver(state, maneuver):
+    """Return the sticker state after the maneuver. The state is a str or bytes, the result has the same type."""
+    s = bytes(itemgetter(*maneuver_permutation(maneuver))(_to_bytes(state)))
+    return s.decode('ascii') if isinstance(state, str) else s
+
+
+def iter_states(state, maneuver):
+    """Yield the sticker state after every move of the maneuver, for example to animate it. The states have the type
+    of state."""
+    as_str = isinstance(state, str)
+    s = _to_bytes(state)
+    for m in parse_maneuver(maneuver):
+        s = bytes(_GETTER[m](s))
+        yield s.decode('ascii') if as_str else s
+
+
+def apply_maneuver_batch(states, maneuver, intermediate=False):
+    """Apply a maneuver to many sticker states at once. Needs NumPy.
+    :param states: An array of shape (N, 54) with one sticker state per row, any dtype
+    :param maneuver: See parse_maneuver()
+    :param intermediate: If True, return an array of shape (len(maneuver), N, 54) with the states after every move
+    :return: The states after the maneuver
+    """
+    import numpy as np
+    moves = parse_maneuver(maneuver)
+    if not intermediate:
+        return states[:, np.array(maneuver_permutation(moves))]
+    result = np.empty((len(moves),) + states.shape, dtype=states.dtype)
+    perm = np.arange(54)
+    for i, m in enumerate(moves):
+        perm = perm[np.array(FACELET_MOVE[m])]
+        result[i] = states[:, perm]
+    return result
+
+
+# ################################ Verification of solutions ###########################################################
+
+_SOLVED = b'UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB'
+
+
+def verify_solution(cubestring, maneuver):
+    """Return True if the maneuver solves the cube. A cube which some maneuver solves is always a valid cube, so the
+    cube definition string need not be checked separately.
+    :param cubestring: The cube definition string, str or bytes
+    :param maneuver: See parse_maneuver(). An invalid maneuver does not solve the cube.
+    """
+    state = _to_bytes(cubestring)
+    if len(state) != 54:
+        return False
+    try:
+        perm = maneuver_permutation(maneuver)
+    except ValueError:
+        return False
+    return bytes(itemgetter(*perm)(state)) == _SOLVED
+
+
+def verify_solutions(cubestrings, maneuvers):
+    """Return a list with verify_solution(cubestring, maneuver) for the pairs of two sequences."""
+    return [verify_solution(c, m) for c, m in zip(cubestrings, maneuvers)]
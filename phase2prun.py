@@ -0,0 +1,41 @@
+# ############ The optional phase 2 pruning table for the edges, used by the solver with PHASE2_PRUNING = 'strong'. ####
+# edges_depth3 holds the phase 2 distance mod 3 of the permutation of all 12 edges in phase 2, that is of the ud_edges
+# coordinate together with the slice_sorted coordinate < 24. The ud_edges coordinate is reduced by the 16 symmetries of
+# D4h like the corners coordinate of the corners x ud_edges table. The entry of (ud_edges, slice_sorted) is
+#   ix = 24 * ud_edges_classidx[ud_edges] + slice_conj[(slice_sorted << 4) + ud_edges_sym[ud_edges]]
+# and is stored with 2 bits per entry: (edges_depth3[ix >> 2] >> 2 * (ix & 3)) & 3. Like the tables of symmetries.py
+# the table is built on first use and stored in the table bundle.
+import tables
+import symmetries as sy
+from cubedefs import N_UD_EDGES_CLASS, N_PERM_4
+
+# The tables which only the strong pruning needs. With PHASE2_PRUNING = 'compact' the solver neither builds nor maps
+# them.
+TABLES = ('edges_depth3', 'ud_edges_tables', 'ud_edges_classidx', 'ud_edges_sym', 'ud_edges_rep', 'slice_conj')
+
+
+def _edges_depth3():
+    fname = "phase2_edges_depth3"
+    if not tables.has_table(fname):
+        import tablegen
+        print("creating " + fname + " table...")
+        tables.store_tables({fname: ('B', tablegen.edges_depth3(tables.get('ud_edges_rep')))})
+    return tables.load_table(fname, 'B', (N_UD_EDGES_CLASS * N_PERM_4 + 3) // 4)
+
+
+tables.register('edges_depth3', _edges_depth3)
+
+
+def get_edges_depth3(ud_edges, slice_sorted):
+    """Return the phase 2 distance mod 3 of the edges. The search kernels do the lookup inline."""
+    ix = 24 * sy.ud_edges_classidx[ud_edges] + sy.slice_conj[(slice_sorted << 4) + sy.ud_edges_sym[ud_edges]]
+    return (tables.get('edges_depth3')[ix >> 2] >> ((ix & 3) << 1)) & 3
+
+
+def __getattr__(name):
+    """Build or load the table edges_depth3 on first access."""
+    if name == 'edges_depth3':
+        table = tables.get(name)
+        globals()[name] = table
+        return table
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
@@ -1,11 +1,84 @@
+import asyncio
+import functools
+import itertools
+import os
+import queue
+import sys
 import threading
-from cubedefs import Move
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing as mp
+from cubedefs import Move, N_MOVE
+import symmetries as sy
+import phase2prun as p2
+import tables
+
+
+# Every TERMINATION_CHECK_NODES nodes the search checks whether it has to terminate. Phase 1 leaves check every time.
+TERMINATION_CHECK_NODES = 256
+
+# The moves which are allowed after a move, the index N_MOVE is used if there is no previous move. Successive moves on
+# the same face or on the same axis in the wrong order are not allowed.
+_PHASE2_MOVES = (Move.U1, Move.U2, Move.U3, Move.R2, Move.F2, Move.D1, Move.D2, Move.D3, Move.L2, Move.B2)
+
+
+def _allowed_moves(moves):
+    return [tuple(m for m in moves if last == N_MOVE or (last // 3 - m // 3) not in (0, 3))
+            for last in range(N_MOVE + 1)]
+
+
+_MOVES_PHASE1 = _allowed_moves(tuple(Move))
+# dist = 0 means that we are already are in the subgroup H. If there are less than 5 moves left this forces all
+# remaining moves to be phase 2 moves. So we can forbid these at the end of phase 1 and generate these moves in phase 2.
+_MOVES_PHASE1_H = _allowed_moves(tuple(m for m in Move if m not in _PHASE2_MOVES))
+_MOVES_PHASE2 = _allowed_moves(_PHASE2_MOVES)
+
+_MAX_PHASE1 = 20  # the iterative deepening in run() uses at most 19 phase 1 moves
+_MAX_PHASE2 = 11  # and at most 10 phase 2 moves
+_MAX_PHASE2_QUICK = 20  # the quick fallback pass of the hard deadline mode allows long phase 2 maneuvers
+
+# The pruning of phase 2. 'compact' bounds the distance with the corners x ud_edges table and cornslice_depth. 'strong'
+# adds the symmetry reduced edges table of phase2prun.py, which also tracks the slice permutation. It saves phase 2
+# nodes for some more lookups per node and about 150 kB of tables. The worker processes of the process backends read
+# the environment variable, so set it before the first solve. Other values are rejected by solve().
+PHASE2_PRUNING = os.environ.get('TWOPHASE_PHASE2_PRUNING', 'compact')
+
+
+def _check_phase2_pruning():
+    if PHASE2_PRUNING not in ('compact', 'strong'):
+        raise ValueError('PHASE2_PRUNING is ' + repr(PHASE2_PRUNING) + ", expected 'compact' or 'strong'")
+
+
+def _preload():
+    """Build or load the tables of the search. The tables of the strong phase 2 pruning only if it is used."""
+    _check_phase2_pruning()
+    tables.preload(exclude=p2.TABLES if PHASE2_PRUNING != 'strong' else ())
+
+
+def _edges_depth(ud_edges, slice_sorted):
+    """Return the phase 2 distance of the edges. Starting from the edges, the phase 2 moves which decrease the distance
+    mod 3 of the pruning table lead to the solved edges."""
+    depth_mod3 = p2.get_edges_depth3(ud_edges, slice_sorted)
+    depth = 0
+    while ud_edges != 0 or slice_sorted != 0:
+        if depth_mod3 == 0:
+            depth_mod3 = 3
+        for m in _PHASE2_MOVES:
+            ud_edges1 = mv.ud_edges_move[18 * ud_edges + m]
+            slice_sorted1 = mv.slice_sorted_move[18 * slice_sorted + m]
+            if p2.get_edges_depth3(ud_edges1, slice_sorted1) == depth_mod3 - 1:
+                depth += 1
+                ud_edges, slice_sorted = ud_edges1, slice_sorted1
+                depth_mod3 -= 1
+                break
+    return depth
 
 
 class SolverThread(threading.Thread):
 
     def __init__(self, cb_cube, rot, inv, ret_length, timeout,
-                 start_time, solutions, terminated, shortest_length):
+                 start_time, solutions, terminated, shortest_length, lock=None, deadline=None, quick=False,
+                 notify=None):
         """
         :param cb_cube: The cube to be solved in CubieCube representation
         :param rot: Rotates the  cube 120° * rot along the long diagonal before applying the two-phase-algorithm
@@ -21,36 +94,68 @@ class SolverThread(threading.Thread):
         :param solutions: An array with the found solutions found by the six parallel threads
         :param terminated: An event shared by the six threads to signal a termination request
         :param shortest_length: The length of the shortes solutions in the solution array
+        :param lock: A lock shared by all searches which guards solutions and shortest_length. If None, the thread uses
+         a lock of its own.
+        :param deadline: None or a time.monotonic() value. The search checks the time in both phases and terminates
+         all searches at the deadline, even if no solution has been found.
+        :param quick: If True, phase 2 maneuvers may be up to 19 moves long. Used for a fast, non-optimal solution.
+        :param notify: None or a function which is called with every new shortest solution and the seconds since
+         start_time. It is called while the lock is held and should return quickly.
         """
         threading.Thread.__init__(self)
-        self.cb_cube = cb_cube
+        # The search is iterative. The moves so far and the coordinates of every depth are kept in preallocated stacks,
+        # the first n1 entries of sofar_phase1 and n2 entries of sofar_phase2 are the current maneuver. The stacks are
+        # large enough for the quick mode, so a search context can be reset for any request.
+        self.sofar_phase1 = [0] * _MAX_PHASE1
+        self.sofar_phase2 = [0] * _MAX_PHASE2_QUICK
+        # flipslice class and symmetry, twist, slice_sorted, dist, allowed moves and position in the allowed moves for
+        # every depth of phase 1
+        self.stack_phase1 = tuple([0] * (_MAX_PHASE1 + 1) for _ in range(7))
+        # corners, ud_edges, slice_sorted, dist, edges dist, allowed moves and position for every depth of phase 2
+        self.stack_phase2 = tuple([0] * (_MAX_PHASE2_QUICK + 1) for _ in range(7))
+        # the coordinates of the rotated/inverted cube are kept over a reset, see prepare()
         self.co_cube = None
+        self.prepared = None
+        self.reset(cb_cube, rot, inv, ret_length, timeout, start_time, solutions, terminated, shortest_length, lock,
+                   deadline, quick, notify)
+
+    def reset(self, cb_cube, rot, inv, ret_length, timeout,
+              start_time, solutions, terminated, shortest_length, lock=None, deadline=None, quick=False, notify=None):
+        """Prepare the search for a new request, the parameters are those of __init__. The stacks are reused. A reset
+        search is run with run() in the calling thread, a thread can only be started once."""
+        self.cb_cube = cb_cube
         self.rot = rot
         self.inv = inv
-        self.sofar_phase1 = None
-        self.sofar_phase2 = None
         self.phase2_done = False
-        self.lock = threading.Lock()
+        self.lock = lock if lock is not None else threading.Lock()
         self.ret_length = ret_length
         self.timeout = timeout
         self.start_time = start_time
+        self.deadline = deadline
+        self.max_phase2 = _MAX_PHASE2_QUICK if quick else _MAX_PHASE2
+        self.notify = notify
 
-        self.cornersave = 0
+        self.cornersave = None  # the corners of the last phase 1 leaf, None if there is none yet
+        self.n1 = 0
+        self.n2 = 0
 
         # these variables are shared by the six threads, initialized in function solve
         self.solutions = solutions
         self.terminated = terminated
         self.shortest_length = shortest_length
 
-    def search_phase2(self, corners, ud_edges, slice_sorted, dist, togo_phase2):
-        # ##############################################################################################################
-        if self.terminated.is_set() or self.phase2_done:
-            return None
-        ################################################################################################################
-        if togo_phase2 == 0 and slice_sorted == 0:
-            self.lock.acquire()  # phase 2 solved, store solution
-            man = self.sofar_phase1 + self.sofar_phase2
-            if len(self.solutions) == 0 or (len(self.solutions[-1]) > len(man)):
+    def must_stop(self):
+        """Return True if the search has to terminate. Reaching the deadline terminates all searches."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.terminated.set()
+        return self.terminated.is_set()
+
+    def store_solution(self):
+        """Phase 2 is solved, store the maneuver if it is shorter than the shortest solution of all searches so far.
+        The solutions list need not be shared, only shortest_length and the lock are."""
+        with self.lock:
+            man = self.sofar_phase1[:self.n1] + self.sofar_phase2[:self.n2]
+            if len(man) < self.shortest_length[0]:
 
                 if self.inv == 1:  # we solved the inverse cube
                     man = list(reversed(man))
@@ -58,119 +163,244 @@ class SolverThread(threading.Thread):
                 man[:] = [Move(sy.conj_move[N_MOVE * 16 * self.rot + m]) for m in man]
                 self.solutions.append(man)
                 self.shortest_length[0] = len(man)
+                if self.notify is not None:
+                    self.notify(man, time.monotonic() - self.start_time)
 
             if self.shortest_length[0] <= self.ret_length:  # we have reached the target length
                 self.terminated.set()
-            self.lock.release()
-            self.phase2_done = True
-        else:
-            for m in Move:
-                if m in [Move.R1, Move.R3, Move.F1, Move.F3,
-                         Move.L1, Move.L3, Move.B1, Move.B3]:
-                    continue
+        self.phase2_done = True
 
-                if len(self.sofar_phase2) > 0:
-                    diff = self.sofar_phase2[-1] // 3 - m // 3
-                    if diff in [0, 3]:  # successive moves: on same face or on same axis with wrong order
-                        continue
-                else:
-                    if len(self.sofar_phase1) > 0:
-                        diff = self.sofar_phase1[-1] // 3 - m // 3
-                        if diff in [0, 3]:  # successive moves: on same face or on same axis with wrong order
-                            continue
-
-                corners_new = mv.corners_move[18 * corners + m]
-                ud_edges_new = mv.ud_edges_move[18 * ud_edges + m]
-                slice_sorted_new = mv.slice_sorted_move[18 * slice_sorted + m]
-
-                classidx = sy.corner_classidx[corners_new]
-                sym = sy.corner_sym[corners_new]
-                dist_new_mod3 = pr.get_corners_ud_edges_depth3(
-                    40320 * classidx + sy.ud_edges_conj[(ud_edges_new << 4) + sym])
-                dist_new = pr.distance[3 * dist + dist_new_mod3]
-                if max(dist_new, pr.cornslice_depth[24 * corners_new + slice_sorted_new]) >= togo_phase2:
-                    continue  # impossible to reach solved cube in togo_phase2 - 1 moves
-
-                self.sofar_phase2.append(m)
-                self.search_phase2(corners_new, ud_edges_new, slice_sorted_new, dist_new, togo_phase2 - 1)
-                self.sofar_phase2.pop(-1)
-
-    def search(self, flip, twist, slice_sorted, dist, togo_phase1):
-        # ##############################################################################################################
-        if self.terminated.is_set():
+    def search_phase2(self, corners, ud_edges, slice_sorted, dist, togo_phase2, edges_dist=0):
+        """Depth first search for a phase 2 maneuver of length togo_phase2. edges_dist is the phase 2 distance of the
+        edges, it is only used with PHASE2_PRUNING = 'strong'."""
+        if self.must_stop():
             return
-        ################################################################################################################
-        if togo_phase1 == 0:  # phase 1 solved
+        self.n2 = 0
+        if togo_phase2 == 0:
+            if slice_sorted == 0:
+                self.store_solution()
+            return
+        sofar = self.sofar_phase2
+        st_corners, st_ud_edges, st_slice, st_dist, st_edges_dist, st_moves, st_pos = self.stack_phase2
+        corners_move, ud_edges_move, slice_sorted_move = mv.corners_move, mv.ud_edges_move, mv.slice_sorted_move
+        corner_classidx, corner_sym, ud_edges_conj = sy.corner_classidx, sy.corner_sym, sy.ud_edges_conj
+        get_depth3, distance, cornslice_depth = pr.get_corners_ud_edges_depth3, pr.distance, pr.cornslice_depth
+        edges_depth3 = None
+        if PHASE2_PRUNING == 'strong':  # the compact pruning does not load the tables of the edges bound
+            edges_depth3 = p2.edges_depth3
+            ud_edges_classidx, ud_edges_sym, slice_conj = sy.ud_edges_classidx, sy.ud_edges_sym, sy.slice_conj
+        edges_dist_new = 0
+        countdown = TERMINATION_CHECK_NODES
 
-            if time.monotonic() > self.start_time + self.timeout and len(self.solutions) > 0:
-                self.terminated.set()
+        st_corners[0], st_ud_edges[0], st_slice[0], st_dist[0] = corners, ud_edges, slice_sorted, dist
+        st_edges_dist[0] = edges_dist
+        st_moves[0] = _MOVES_PHASE2[self.sofar_phase1[self.n1 - 1] if self.n1 > 0 else N_MOVE]
+        st_pos[0] = 0
+        depth = 0
+        while depth >= 0:
+            moves = st_moves[depth]
+            pos = st_pos[depth]
+            if pos == len(moves):
+                depth -= 1
+                continue
+            m = moves[pos]
+            st_pos[depth] = pos + 1
 
-            # compute initial phase 2 coordinates
-            if self.sofar_phase1:  # check if list is not empty
-                m = self.sofar_phase1[-1]
-            else:
-                m = Move.U1  # value is irrelevant here, no phase 1 moves
-
-            if m in [Move.R3, Move.F3, Move.L3, Move.B3]:  # phase 1 solution come in pairs
-                corners = mv.corners_move[18 * self.cornersave + m - 1]  # apply R2, F2, L2 ord B2 on last ph1 solution
-            else:
-                corners = self.co_cube.corners
-                for m in self.sofar_phase1:  # get current corner configuration
-                    corners = mv.corners_move[18 * corners + m]
-                self.cornersave = corners
-
-            # new solution must be shorter and we do not use phase 2 maneuvers with length > 11 - 1 = 10
-            togo2_limit = min(self.shortest_length[0] - len(self.sofar_phase1), 11)
-            if pr.cornslice_depth[24 * corners + slice_sorted] >= togo2_limit:  # precheck speeds up the computation
-                return
+            corners_new = corners_move[18 * st_corners[depth] + m]
+            ud_edges_new = ud_edges_move[18 * st_ud_edges[depth] + m]
+            slice_sorted_new = slice_sorted_move[18 * st_slice[depth] + m]
+
+            classidx = corner_classidx[corners_new]
+            sym = corner_sym[corners_new]
+            dist_new_mod3 = get_depth3(40320 * classidx + ud_edges_conj[(ud_edges_new << 4) + sym])
+            dist_new = distance[3 * st_dist[depth] + dist_new_mod3]
+            togo = togo_phase2 - depth
+            if max(dist_new, cornslice_depth[24 * corners_new + slice_sorted_new]) >= togo:
+                continue  # impossible to reach solved cube in togo - 1 moves
+            if edges_depth3 is not None:  # the edges bound, only computed for nodes the other bounds keep
+                sym = ud_edges_sym[ud_edges_new]
+                ix = 24 * ud_edges_classidx[ud_edges_new] + slice_conj[(slice_sorted_new << 4) + sym]
+                edges_dist_new = distance[3 * st_edges_dist[depth] + ((edges_depth3[ix >> 2] >> ((ix & 3) << 1)) & 3)]
+                if edges_dist_new >= togo:
+                    continue
+
+            countdown -= 1
+            if countdown == 0:
+                countdown = TERMINATION_CHECK_NODES
+                if self.must_stop():
+                    return
+
+            sofar[depth] = m
+            depth += 1
+            if depth == togo_phase2:
+                if slice_sorted_new == 0:  # phase 2 solved
+                    self.n2 = depth
+                    self.store_solution()
+                    return
+                depth -= 1
+                continue
+            st_corners[depth], st_ud_edges[depth], st_slice[depth] = corners_new, ud_edges_new, slice_sorted_new
+            st_dist[depth], st_edges_dist[depth] = dist_new, edges_dist_new
+            st_moves[depth] = _MOVES_PHASE2[m]
+            st_pos[depth] = 0
 
-            u_edges = self.co_cube.u_edges
-            d_edges = self.co_cube.d_edges
-            for m in self.sofar_phase1:
-                u_edges = mv.u_edges_move[18 * u_edges + m]
-                d_edges = mv.d_edges_move[18 * d_edges + m]
-            ud_edges = coord.u_edges_plus_d_edges_to_ud_edges[24 * u_edges + d_edges % 24]
-
-            dist2 = self.co_cube.get_depth_phase2(corners, ud_edges)
-            for togo2 in range(dist2, togo2_limit):  # do not use more than togo2_limit - 1 moves in phase 2
-                self.sofar_phase2 = []
-                self.phase2_done = False
-                self.search_phase2(corners, ud_edges, slice_sorted, dist2, togo2)
-                if self.phase2_done:  # solution already found
-                    break
+    def phase1_solved(self, slice_sorted):
+        """The first n1 moves of sofar_phase1 solve phase 1, try to solve phase 2 from there.
+        Return False if the cornslice_depth precheck rejects the phase 1 maneuver."""
+        sofar = self.sofar_phase1
+        n1 = self.n1
+        if time.monotonic() > self.start_time + self.timeout and self.shortest_length[0] < 999:
+            # shortest_length is shared by all searches, the solutions list may be local to a worker process
+            self.terminated.set()
 
+        # compute initial phase 2 coordinates
+        if n1 > 0:
+            m = sofar[n1 - 1]
         else:
-            for m in Move:
-                # dist = 0 means that we are already are in the subgroup H. If there are less than 5 moves left
-                # this forces all remaining moves to be phase 2 moves. So we can forbid these at the end of phase 1
-                # and generate these moves in phase 2.
-                if dist == 0 and togo_phase1 < 5 and m in [Move.U1, Move.U2, Move.U3, Move.R2,
-                                                           Move.F2, Move.D1, Move.D2, Move.D3,
-                                                           Move.L2, Move.B2]:
-                    continue
+            m = Move.U1  # value is irrelevant here, no phase 1 moves
 
-                if len(self.sofar_phase1) > 0:
-                    diff = self.sofar_phase1[-1] // 3 - m // 3
-                    if diff in [0, 3]:  # successive moves: on same face or on same axis with wrong order
-                        continue
+        # phase 1 solution come in pairs, the leaf before was the one which ends with R1, F1, L1 or B1
+        if m in (Move.R3, Move.F3, Move.L3, Move.B3) and self.cornersave is not None:
+            corners = mv.corners_move[18 * self.cornersave + m - 1]  # apply R2, F2, L2 ord B2 on last ph1 solution
+        else:
+            corners = self.co_cube.corners
+            for i in range(n1):  # get current corner configuration
+                corners = mv.corners_move[18 * corners + sofar[i]]
+            self.cornersave = corners
 
-                flip_new = mv.flip_move[18 * flip + m]  # N_MOVE = 18
-                twist_new = mv.twist_move[18 * twist + m]
-                slice_sorted_new = mv.slice_sorted_move[18 * slice_sorted + m]
+        # new solution must be shorter and we do not use phase 2 maneuvers with length > 11 - 1 = 10
+        togo2_limit = min(self.shortest_length[0] - n1, self.max_phase2)
+        if pr.cornslice_depth[24 * corners + slice_sorted] >= togo2_limit:  # precheck speeds up the computation
+            return False
 
-                flipslice = 2048 * (slice_sorted_new // 24) + flip_new  # N_FLIP * (slice_sorted // N_PERM_4) + flip
-                classidx = sy.flipslice_classidx[flipslice]
-                sym = sy.flipslice_sym[flipslice]
-                dist_new_mod3 = pr.get_flipslice_twist_depth3(2187 * classidx + sy.twist_conj[(twist_new << 4) + sym])
-                dist_new = pr.distance[3 * dist + dist_new_mod3]
-                if dist_new >= togo_phase1:  # impossible to reach subgroup H in togo_phase1 - 1 moves
-                    continue
+        u_edges = self.co_cube.u_edges
+        d_edges = self.co_cube.d_edges
+        for i in range(n1):
+            u_edges = mv.u_edges_move[18 * u_edges + sofar[i]]
+            d_edges = mv.d_edges_move[18 * d_edges + sofar[i]]
+        ud_edges = coord.u_edges_plus_d_edges_to_ud_edges[24 * u_edges + d_edges % 24]
 
-                self.sofar_phase1.append(m)
-                self.search(flip_new, twist_new, slice_sorted_new, dist_new, togo_phase1 - 1)
-                self.sofar_phase1.pop(-1)
+        dist2 = self.co_cube.get_depth_phase2(corners, ud_edges)
+        edges_dist = _edges_depth(ud_edges, slice_sorted) if PHASE2_PRUNING == 'strong' else 0
+        # do not use more than togo2_limit - 1 moves in phase 2
+        for togo2 in range(max(dist2, edges_dist), togo2_limit):
+            self.phase2_done = False
+            self.search_phase2(corners, ud_edges, slice_sorted, dist2, togo2, edges_dist)
+            if self.phase2_done:  # solution already found
+                break
+        return True
 
-    def run(self):
+    def search(self, flip, twist, slice_sorted, dist, togo_phase1, prefix=()):
+        """Depth first search for all phase 1 maneuvers of length togo_phase1 which start with the moves of prefix."""
+        if self.must_stop():
+            return
+        self.n1 = 0
+        if togo_phase1 == 0:
+            self.phase1_solved(slice_sorted)
+            return
+        sofar = self.sofar_phase1
+        st_class, st_sym, st_twist, st_slice, st_dist, st_moves, st_pos = self.stack_phase1
+        twist_move, slice_sorted_move, flipslice_sym_move = mv.twist_move, mv.slice_sorted_move, sy.flipslice_sym_move
+        conj_move, mult_sym, twist_conj = sy.conj_move, sy.mult_sym, sy.twist_conj
+        get_depth3, distance = pr.get_flipslice_twist_depth3, pr.distance
+        countdown = TERMINATION_CHECK_NODES
+
+        flipslice = 2048 * (slice_sorted // 24) + flip  # N_FLIP * (slice_sorted // N_PERM_4) + flip
+        st_class[0], st_sym[0] = sy.flipslice_classidx[flipslice], sy.flipslice_sym[flipslice]
+        st_twist[0], st_slice[0], st_dist[0] = twist, slice_sorted, dist
+        st_moves[0] = (_MOVES_PHASE1_H if dist == 0 and togo_phase1 < 5 else _MOVES_PHASE1)[N_MOVE]
+        st_pos[0] = 0
+        base = len(prefix)  # the search does not backtrack into the prefix
+        if base > 0 and not self.enter_prefix(prefix, togo_phase1):
+            return
+        depth = base
+        while depth >= base:
+            moves = st_moves[depth]
+            pos = st_pos[depth]
+            if pos == len(moves):
+                depth -= 1
+                continue
+            m = moves[pos]
+            st_pos[depth] = pos + 1
+
+            # The flipslice coordinate is s^-1*rep*s with rep the representant of its class and s = st_sym[depth].
+            # Then s^-1*rep*s*m = s^-1*(rep*m')*s with m' = s*m*s^-1 and rep*m' = t^-1*rep'*t is in the move table.
+            sym = st_sym[depth]
+            class_sym = flipslice_sym_move[18 * st_class[depth] + conj_move[18 * sym + m]]  # N_MOVE = 18
+            classidx = class_sym >> 4
+            sym = mult_sym[48 * (class_sym & 15) + sym]  # t*s, N_SYM = 48
+            twist_new = twist_move[18 * st_twist[depth] + m]
+            dist_new_mod3 = get_depth3(2187 * classidx + twist_conj[(twist_new << 4) + sym])
+            dist_new = distance[3 * st_dist[depth] + dist_new_mod3]
+            togo = togo_phase1 - depth
+            if dist_new >= togo:  # impossible to reach subgroup H in togo - 1 moves
+                continue
+            slice_sorted_new = slice_sorted_move[18 * st_slice[depth] + m]  # only needed for the nodes which are kept
+
+            countdown -= 1
+            if countdown == 0:
+                countdown = TERMINATION_CHECK_NODES
+                if self.must_stop():
+                    return
+
+            sofar[depth] = m
+            depth += 1
+            if depth == togo_phase1:  # phase 1 solved
+                if self.must_stop():
+                    return
+                self.n1 = depth
+                self.phase1_solved(slice_sorted_new)
+                depth -= 1
+                continue
+            st_class[depth], st_sym[depth], st_twist[depth], st_slice[depth], st_dist[depth] = \
+                classidx, sym, twist_new, slice_sorted_new, dist_new
+            st_moves[depth] = (_MOVES_PHASE1_H if dist_new == 0 and togo < 6 else _MOVES_PHASE1)[m]
+            st_pos[depth] = 0
+
+    def enter_prefix(self, prefix, togo_phase1, stats=None):
+        """Fill the phase 1 stacks along the moves of prefix, after search() has set up the first entry.
+        Return False if the subtree below the prefix contains no phase 1 maneuver to search.
+        With stats, count the nodes of the prefix like the kernel does. A node above the last move of the prefix is
+        shared by several subtrees, it is counted only by the first of them, so the counts of all subtrees add up to
+        those of the whole tree."""
+        sofar = self.sofar_phase1
+        st_class, st_sym, st_twist, st_slice, st_dist, st_moves, st_pos = self.stack_phase1
+        for depth, m in enumerate(prefix):
+            if m not in st_moves[depth]:  # the prefix is not a canonical maneuver
+                return False
+            counted = stats is not None and all(prefix[k] == _MOVES_PHASE1[prefix[k - 1]][0]
+                                                for k in range(depth + 1, len(prefix)))
+            st_pos[depth] = len(st_moves[depth])  # the other moves of this depth belong to other subtrees
+            sym = st_sym[depth]
+            class_sym = sy.flipslice_sym_move[18 * st_class[depth] + sy.conj_move[18 * sym + m]]
+            classidx = class_sym >> 4
+            sym = sy.mult_sym[48 * (class_sym & 15) + sym]
+            twist_new = mv.twist_move[18 * st_twist[depth] + m]
+            slice_sorted_new = mv.slice_sorted_move[18 * st_slice[depth] + m]
+            dist_new_mod3 = pr.get_flipslice_twist_depth3(2187 * classidx + sy.twist_conj[(twist_new << 4) + sym])
+            dist_new = pr.distance[3 * st_dist[depth] + dist_new_mod3]
+            togo = togo_phase1 - depth
+            if dist_new >= togo:
+                if counted:
+                    stats.pruned_phase1 += 1
+                return False
+            if counted:
+                stats.nodes_phase1[depth + 1] += 1
+            sofar[depth] = m
+            if depth + 1 == togo_phase1:  # the prefix itself solves phase 1
+                if not self.must_stop():
+                    self.cornersave = None  # the leaf of the other move of the pair belongs to another subtree
+                    self.n1 = depth + 1
+                    self.phase1_solved(slice_sorted_new)
+                return False
+            st_class[depth + 1], st_sym[depth + 1], st_twist[depth + 1], st_slice[depth + 1], st_dist[depth + 1] = \
+                classidx, sym, twist_new, slice_sorted_new, dist_new
+            st_moves[depth + 1] = (_MOVES_PHASE1_H if dist_new == 0 and togo < 6 else _MOVES_PHASE1)[m]
+            st_pos[depth + 1] = 0
+        return True
+
+    def prepare(self):
+        """Compute the coordinates of the rotated/inverted cube and return its phase 1 distance."""
         cb = None
         if self.rot == 0:  # no rotation
             cb = cubie.CubieCube(self.cb_cube.cp, self.cb_cube.co, self.cb_cube.ep, self.cb_cube.eo)
@@ -188,115 +418,905 @@ class SolverThread(threading.Thread):
             cb = tmp
 
         self.co_cube = coord.CoordCube(cb)  # the rotated/inverted cube in coordinate representation
+        return self.co_cube.get_depth_phase1()
 
-        dist = self.co_cube.get_depth_phase1()
-        for togo1 in range(dist, 20):  # iterative deepening, solution has at least dist moves
-            self.sofar_phase1 = []
+    def run(self):
+        dist = self.prepare()
+        for togo1 in range(dist, _MAX_PHASE1):  # iterative deepening, solution has at least dist moves
             self.search(self.co_cube.flip, self.co_cube.twist, self.co_cube.slice_sorted, dist, togo1)
 
 
 # ################################End class SolverThread################################################################
 
 
-def solve(cubestring, max_length=20, timeout=3):
+# ################################ Search statistics ###################################################################
+
+class SearchStats:
+    """Counters of a search, collected by InstrumentedSolverThread and summed over all searches of a solve() call."""
+
+    def __init__(self):
+        self.nodes_phase1 = [0] * (_MAX_PHASE1 + 1)  # nodes expanded per depth
+        self.nodes_phase2 = [0] * (_MAX_PHASE2_QUICK + 1)
+        self.pruned_phase1 = 0  # dist_new >= togo in phase 1
+        self.pruned_cornslice = 0  # the cornslice_depth precheck at a phase 1 leaf
+        self.pruned_phase2 = 0  # the max(dist_new, cornslice_depth) bound in phase 2
+        self.phase1_leaves = 0
+        self.phase2_entries = 0  # calls of search_phase2
+        self.solution_times = []  # (seconds since the start, length) for the first and every improved solution
+        self.cache_hit = False
+
+    def merge(self, other):
+        """Add the counters of other to self."""
+        for i, n in enumerate(other.nodes_phase1):
+            self.nodes_phase1[i] += n
+        for i, n in enumerate(other.nodes_phase2):
+            self.nodes_phase2[i] += n
+        self.pruned_phase1 += other.pruned_phase1
+        self.pruned_cornslice += other.pruned_cornslice
+        self.pruned_phase2 += other.pruned_phase2
+        self.phase1_leaves += other.phase1_leaves
+        self.phase2_entries += other.phase2_entries
+        self.solution_times = sorted(self.solution_times + other.solution_times)
+        self.cache_hit = self.cache_hit or other.cache_hit
+
+    def as_dict(self):
+        # a solution counts as an improvement only if it is shorter than all solutions found before by any search
+        improvements = []
+        for t, length in self.solution_times:
+            if not improvements or length < improvements[-1][1]:
+                improvements.append((t, length))
+        return {
+            'nodes_phase1': self.nodes_phase1,
+            'nodes_phase2': self.nodes_phase2,
+            'pruned_phase1': self.pruned_phase1,
+            'pruned_cornslice': self.pruned_cornslice,
+            'pruned_phase2': self.pruned_phase2,
+            'phase1_leaves': self.phase1_leaves,
+            'phase2_entries': self.phase2_entries,
+            'phase2_entries_per_leaf': self.phase2_entries / self.phase1_leaves if self.phase1_leaves else 0.0,
+            'time_to_first_solution': improvements[0][0] if improvements else None,
+            'improvements': improvements,
+            'cache_hit': self.cache_hit,
+        }
+
+
+class InstrumentedSolverThread(SolverThread):
+    """A SolverThread which counts what the search does in self.stats.
+
+    The kernels are copies of the ones of SolverThread with counters added, so the uninstrumented search does not pay
+    for them. Changes of the search in SolverThread have to be made here too, tests/test_search.py checks that both
+    search the same nodes and that the counts are those of the reference search.
+    """
+
+    def reset(self, *args, **kwargs):
+        SolverThread.reset(self, *args, **kwargs)
+        self.stats = SearchStats()  # a new object, the caller may still hold the statistics of the last request
+
+    def store_solution(self):
+        length = self.n1 + self.n2
+        improved = length < self.shortest_length[0]
+        SolverThread.store_solution(self)
+        if improved:
+            self.stats.solution_times.append((time.monotonic() - self.start_time, length))
+
+    def phase1_solved(self, slice_sorted):
+        self.stats.phase1_leaves += 1
+        if not SolverThread.phase1_solved(self, slice_sorted):
+            self.stats.pruned_cornslice += 1
+
+    def search_phase2(self, corners, ud_edges, slice_sorted, dist, togo_phase2, edges_dist=0):
+        """Depth first search for a phase 2 maneuver of length togo_phase2. edges_dist is the phase 2 distance of the
+        edges, it is only used with PHASE2_PRUNING = 'strong'."""
+        stats = self.stats
+        stats.phase2_entries += 1
+        if self.must_stop():
+            return
+        self.n2 = 0
+        if togo_phase2 == 0:
+            if slice_sorted == 0:
+                self.store_solution()
+            return
+        sofar = self.sofar_phase2
+        st_corners, st_ud_edges, st_slice, st_dist, st_edges_dist, st_moves, st_pos = self.stack_phase2
+        corners_move, ud_edges_move, slice_sorted_move = mv.corners_move, mv.ud_edges_move, mv.slice_sorted_move
+        corner_classidx, corner_sym, ud_edges_conj = sy.corner_classidx, sy.corner_sym, sy.ud_edges_conj
+        get_depth3, distance, cornslice_depth = pr.get_corners_ud_edges_depth3, pr.distance, pr.cornslice_depth
+        edges_depth3 = None
+        if PHASE2_PRUNING == 'strong':  # the compact pruning does not load the tables of the edges bound
+            edges_depth3 = p2.edges_depth3
+            ud_edges_classidx, ud_edges_sym, slice_conj = sy.ud_edges_classidx, sy.ud_edges_sym, sy.slice_conj
+        edges_dist_new = 0
+        nodes = stats.nodes_phase2
+        pruned = 0
+        countdown = TERMINATION_CHECK_NODES
+
+        st_corners[0], st_ud_edges[0], st_slice[0], st_dist[0] = corners, ud_edges, slice_sorted, dist
+        st_edges_dist[0] = edges_dist
+        st_moves[0] = _MOVES_PHASE2[self.sofar_phase1[self.n1 - 1] if self.n1 > 0 else N_MOVE]
+        st_pos[0] = 0
+        depth = 0
+        try:
+            while depth >= 0:
+                moves = st_moves[depth]
+                pos = st_pos[depth]
+                if pos == len(moves):
+                    depth -= 1
+                    continue
+                m = moves[pos]
+                st_pos[depth] = pos + 1
+
+                corners_new = corners_move[18 * st_corners[depth] + m]
+                ud_edges_new = ud_edges_move[18 * st_ud_edges[depth] + m]
+                slice_sorted_new = slice_sorted_move[18 * st_slice[depth] + m]
+
+                classidx = corner_classidx[corners_new]
+                sym = corner_sym[corners_new]
+                dist_new_mod3 = get_depth3(40320 * classidx + ud_edges_conj[(ud_edges_new << 4) + sym])
+                dist_new = distance[3 * st_dist[depth] + dist_new_mod3]
+                togo = togo_phase2 - depth
+                if max(dist_new, cornslice_depth[24 * corners_new + slice_sorted_new]) >= togo:
+                    pruned += 1
+                    continue  # impossible to reach solved cube in togo - 1 moves
+                if edges_depth3 is not None:
+                    sym = ud_edges_sym[ud_edges_new]
+                    ix = 24 * ud_edges_classidx[ud_edges_new] + slice_conj[(slice_sorted_new << 4) + sym]
+                    edges_dist_new = distance[3 * st_edges_dist[depth]
+                                              + ((edges_depth3[ix >> 2] >> ((ix & 3) << 1)) & 3)]
+                    if edges_dist_new >= togo:
+                        pruned += 1
+                        continue
+
+                countdown -= 1
+                if countdown == 0:
+                    countdown = TERMINATION_CHECK_NODES
+                    if self.must_stop():
+                        return
+
+                sofar[depth] = m
+                depth += 1
+                nodes[depth] += 1
+                if depth == togo_phase2:
+                    if slice_sorted_new == 0:  # phase 2 solved
+                        self.n2 = depth
+                        self.store_solution()
+                        return
+                    depth -= 1
+                    continue
+                st_corners[depth], st_ud_edges[depth], st_slice[depth] = corners_new, ud_edges_new, slice_sorted_new
+                st_dist[depth], st_edges_dist[depth] = dist_new, edges_dist_new
+                st_moves[depth] = _MOVES_PHASE2[m]
+                st_pos[depth] = 0
+        finally:
+            stats.pruned_phase2 += pruned
+
+    def search(self, flip, twist, slice_sorted, dist, togo_phase1, prefix=()):
+        """Depth first search for all phase 1 maneuvers of length togo_phase1 which start with the moves of prefix."""
+        if self.must_stop():
+            return
+        self.n1 = 0
+        if togo_phase1 == 0:
+            self.phase1_solved(slice_sorted)
+            return
+        sofar = self.sofar_phase1
+        st_class, st_sym, st_twist, st_slice, st_dist, st_moves, st_pos = self.stack_phase1
+        twist_move, slice_sorted_move, flipslice_sym_move = mv.twist_move, mv.slice_sorted_move, sy.flipslice_sym_move
+        conj_move, mult_sym, twist_conj = sy.conj_move, sy.mult_sym, sy.twist_conj
+        get_depth3, distance = pr.get_flipslice_twist_depth3, pr.distance
+        stats = self.stats
+        nodes = stats.nodes_phase1
+        pruned = 0
+        countdown = TERMINATION_CHECK_NODES
+
+        flipslice = 2048 * (slice_sorted // 24) + flip  # N_FLIP * (slice_sorted // N_PERM_4) + flip
+        st_class[0], st_sym[0] = sy.flipslice_classidx[flipslice], sy.flipslice_sym[flipslice]
+        st_twist[0], st_slice[0], st_dist[0] = twist, slice_sorted, dist
+        st_moves[0] = (_MOVES_PHASE1_H if dist == 0 and togo_phase1 < 5 else _MOVES_PHASE1)[N_MOVE]
+        st_pos[0] = 0
+        base = len(prefix)
+        if base > 0 and not self.enter_prefix(prefix, togo_phase1, stats):
+            return
+        depth = base
+        try:
+            while depth >= base:
+                moves = st_moves[depth]
+                pos = st_pos[depth]
+                if pos == len(moves):
+                    depth -= 1
+                    continue
+                m = moves[pos]
+                st_pos[depth] = pos + 1
+
+                sym = st_sym[depth]
+                class_sym = flipslice_sym_move[18 * st_class[depth] + conj_move[18 * sym + m]]  # N_MOVE = 18
+                classidx = class_sym >> 4
+                sym = mult_sym[48 * (class_sym & 15) + sym]  # N_SYM = 48
+                twist_new = twist_move[18 * st_twist[depth] + m]
+                dist_new_mod3 = get_depth3(2187 * classidx + twist_conj[(twist_new << 4) + sym])
+                dist_new = distance[3 * st_dist[depth] + dist_new_mod3]
+                togo = togo_phase1 - depth
+                if dist_new >= togo:  # impossible to reach subgroup H in togo - 1 moves
+                    pruned += 1
+                    continue
+                slice_sorted_new = slice_sorted_move[18 * st_slice[depth] + m]
+
+                countdown -= 1
+                if countdown == 0:
+                    countdown = TERMINATION_CHECK_NODES
+                    if self.must_stop():
+                        return
+
+                sofar[depth] = m
+                depth += 1
+                nodes[depth] += 1
+                if depth == togo_phase1:  # phase 1 solved
+                    if self.must_stop():
+                        return
+                    self.n1 = depth
+                    self.phase1_solved(slice_sorted_new)
+                    depth -= 1
+                    continue
+                st_class[depth], st_sym[depth], st_twist[depth], st_slice[depth], st_dist[depth] = \
+                    classidx, sym, twist_new, slice_sorted_new, dist_new
+                st_moves[depth] = (_MOVES_PHASE1_H if dist_new == 0 and togo < 6 else _MOVES_PHASE1)[m]
+                st_pos[depth] = 0
+        finally:
+            stats.pruned_phase1 += pruned
+
+
+# ################################ Process backend #####################################################################
+
+# The six (rot, inv) searches run in worker processes which stay alive between calls, so the tables are loaded only
+# once per worker. The termination event and the shortest length are shared by all workers.
+PROCESS_WORKERS = max(6, os.cpu_count() or 1)  # at least one worker per direction
+_pool = None
+_pool_terminated = None
+_pool_shortest_length = None
+_pool_lock = threading.Lock()  # one process search at a time, the shared state is per pool
+
+
+def _init_worker(terminated, shortest_length):
+    global _pool_terminated, _pool_shortest_length
+    _pool_terminated = terminated
+    _pool_shortest_length = shortest_length
+    _preload()
+
+
+def _search_direction(cb_cube, rot, inv, ret_length, timeout, start_time, deadline, instrument):
+    """Run the search for a single (rot, inv) direction in a worker process.
+    Return its shortest solution or None and its SearchStats if instrument is True, else None."""
+    solutions = []
+    stats = _search_in_context(InstrumentedSolverThread if instrument else SolverThread,
+                               cb_cube, rot, inv, ret_length, timeout, start_time, solutions,
+                               _pool_terminated, _pool_shortest_length, _pool_shortest_length.get_lock(), deadline)
+    return solutions[-1] if solutions else None, stats
+
+
+def _get_pool():
+    global _pool, _pool_terminated, _pool_shortest_length
+    if _pool is None:
+        _pool_terminated = mp.Event()
+        _pool_shortest_length = mp.Array('i', [999])
+        _pool = ProcessPoolExecutor(max_workers=PROCESS_WORKERS, initializer=_init_worker,
+                                    initargs=(_pool_terminated, _pool_shortest_length))
+    return _pool
+
+
+def shutdown():
+    """Stop the worker threads of the thread backend and the worker processes of the process backend and of
+    solve_many, after they have finished their current searches. They are restarted on the next call if necessary."""
+    global _pool, _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is not None:
+            _thread_pool.shutdown()
+            _thread_pool = None
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+    with _batch_lock:
+        for pool in _batch_pools.values():
+            pool.shutdown()
+        _batch_pools.clear()
+    global _async_executor
+    with _async_lock:
+        if _async_executor is not None:
+            _async_executor.shutdown()
+            _async_executor = None
+
+
+def _forget_pools():
+    """Drop the pools and locks inherited by a forked child. The worker threads and processes of the parent do not
+    exist there, so the child would wait forever for the tasks it submits. The pools are created again when needed."""
+    global _thread_pool, _thread_pool_lock, _pool, _pool_terminated, _pool_shortest_length, _pool_lock
+    global _batch_pools, _batch_lock, _async_executor, _async_lock
+    _thread_pool, _thread_pool_lock = None, threading.Lock()
+    _pool, _pool_terminated, _pool_shortest_length, _pool_lock = None, None, None, threading.Lock()
+    _batch_pools, _batch_lock = {}, threading.Lock()
+    _async_executor, _async_lock = None, threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):  # the worker processes of solve_many and of the process backends are forked
+    os.register_at_fork(after_in_child=_forget_pools)
+
+
+# With a hard deadline, a request waits for the pool and for its searches only until the deadline. The searches of a
+# request which gave up may still be queued or running then, so _pool_lock is released only after the last of them
+# has returned: the searches of the pool share the termination event and the shortest length.
+DEADLINE_GRACE = 0.05  # the seconds a search may take after the deadline to return its solution
+
+
+def _acquire_pool(deadline):
+    """Acquire _pool_lock. With a deadline, return False if the pool is still busy with other requests then."""
+    if deadline is None:
+        return _pool_lock.acquire()
+    return _pool_lock.acquire(timeout=max(0.0, deadline - time.monotonic()))
+
+
+def _release_pool(futures):
+    """Release _pool_lock as soon as all the futures submitted by the request are done."""
+    lock = _pool_lock
+    remaining = [len(futures)]
+    count_lock = threading.Lock()
+
+    def done(_):
+        with count_lock:
+            remaining[0] -= 1
+            if remaining[0] > 0:
+                return
+        lock.release()
+
+    if not futures:
+        lock.release()
+    for f in futures:
+        f.add_done_callback(done)  # called at once if f is done
+
+
+def _wait_pool(futures, terminated, deadline):
+    """Wait for futures of the pool and return those which are done. A termination request of the caller is passed on
+    to the workers. With a deadline, the workers are terminated then and the wait ends DEADLINE_GRACE seconds later."""
+    pending = set(futures)
+    while pending:
+        timeout = 0.05
+        if deadline is not None:
+            now = time.monotonic()
+            if now > deadline:
+                _pool_terminated.set()  # also stops the tasks which have not started yet
+            if now > deadline + DEADLINE_GRACE:
+                break
+            timeout = min(timeout, deadline + DEADLINE_GRACE - now)
+        pending = wait(pending, timeout=timeout)[1]
+        if terminated is not None and terminated.is_set():
+            _pool_terminated.set()
+    return [f for f in futures if f.done()]
+
+
+def _run_processes(cc, tr, max_length, timeout, s_time, deadline, terminated=None, stats=None):
+    if not _acquire_pool(deadline):
+        return []  # the pool was busy with other requests until the deadline
+    futures = []
+    try:
+        pool = _get_pool()
+        _pool_terminated.clear()
+        _pool_shortest_length[0] = 999
+        futures = [pool.submit(_search_direction, cc, i % 3, i // 3, max_length, timeout, s_time, deadline,
+                               stats is not None) for i in tr]
+    finally:
+        _release_pool(futures)
+    results = [f.result() for f in _wait_pool(futures, terminated, deadline)]
+    if stats is not None:
+        for _, st in results:
+            stats.merge(st)
+    # same order as the solutions list of the thread backend: the last solution is the shortest
+    return sorted([r for r, _ in results if r is not None], key=len, reverse=True)
+
+
+# ################################ Split backend #######################################################################
+
+# The process backend runs one task per direction, so it cannot use more than six cores and a single hard direction
+# determines the run time. The split backend cuts the phase 1 tree of every direction and every depth of the iterative
+# deepening into the subtrees of the first _SPLIT_DEPTH moves. The subtrees are tasks of the process pool, idle workers
+# take the next one from its queue. The tasks are submitted in the order of the iterative deepening, so all directions
+# advance depth by depth together. The workers share the termination event and the shortest length of the process
+# backend, which bounds phase 2 in all subtrees as soon as any worker has found a solution.
+_SPLIT_DEPTH = 2
+_SPLIT_PREFIXES = [(m0, m1) for m0 in Move for m1 in _MOVES_PHASE1[m0]]  # 243 subtrees per depth and direction
+_split_requests = itertools.count()  # numbers the requests, a worker prepares each direction once per request
+
+
+def _phase1_depth(cb_cube, key):
+    """Return the phase 1 distance of the direction of key, computed in a worker process."""
+    return _split_context(SolverThread, cb_cube, key, 0, 0, 0, None)[1]
+
+
+def _split_context(thread_class, cb_cube, key, ret_length, timeout, start_time, deadline):
+    """Return the search context of the worker for the direction of key = (request, rot, inv), reset for a new task,
+    and the phase 1 distance of the direction. The coordinates are computed only for the first task of a request."""
+    ctx = _contexts.__dict__.get((thread_class, key[1], key[2]))
+    args = (cb_cube, key[1], key[2], ret_length, timeout, start_time, [], _pool_terminated, _pool_shortest_length,
+            _pool_shortest_length.get_lock(), deadline)
+    if ctx is None:
+        ctx = _contexts.__dict__[(thread_class, key[1], key[2])] = thread_class(*args)
+    else:
+        ctx.reset(*args)
+    if ctx.prepared is None or ctx.prepared[0] != key:
+        ctx.prepared = key, ctx.prepare()
+    return ctx, ctx.prepared[1]
+
+
+def _search_subtree(cb_cube, key, togo1, prefix, ret_length, timeout, start_time, deadline, instrument):
+    """Search the phase 1 maneuvers of length togo1 which start with prefix in a worker process.
+    Return the shortest solution found or None and the SearchStats if instrument is True, else None."""
+    ctx, dist = _split_context(InstrumentedSolverThread if instrument else SolverThread, cb_cube, key, ret_length,
+                               timeout, start_time, deadline)
+    co = ctx.co_cube
+    ctx.search(co.flip, co.twist, co.slice_sorted, dist, togo1, prefix)
+    return ctx.solutions[-1] if ctx.solutions else None, getattr(ctx, 'stats', None)
+
+
+def _subtrees(tr, dists):
+    """Yield the tasks (i, togo1, prefix) in the order of the iterative deepening."""
+    for togo1 in range(min(dists), _MAX_PHASE1):
+        for i, dist in zip(tr, dists):
+            if togo1 < dist:
+                continue
+            for prefix in _SPLIT_PREFIXES if togo1 >= _SPLIT_DEPTH else [()]:
+                yield i, togo1, prefix
+
+
+def _run_split(cc, tr, max_length, timeout, s_time, deadline, terminated=None, stats=None):
+    if not _acquire_pool(deadline):
+        return []  # the pool was busy with other requests until the deadline
+    submitted = []
+    results = []
+    try:
+        pool = _get_pool()
+        _pool_terminated.clear()
+        _pool_shortest_length[0] = 999
+        request = next(_split_requests)
+        submitted = [pool.submit(_phase1_depth, cc, (request, i % 3, i // 3)) for i in tr]
+        if len(_wait_pool(submitted, terminated, deadline)) < len(submitted):
+            return []  # the workers were still loading the tables at the deadline
+        dists = [f.result() for f in submitted]
+        pending = set()
+        for i, togo1, prefix in _subtrees(tr, dists):
+            # submit lazily, the search usually terminates long before the last task
+            while len(pending) >= 2 * PROCESS_WORKERS:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                results.extend(f.result() for f in done)
+                if terminated is not None and terminated.is_set():
+                    _pool_terminated.set()
+                if deadline is not None and time.monotonic() > deadline:
+                    _pool_terminated.set()
+            if _pool_terminated.is_set():
+                break
+            f = pool.submit(_search_subtree, cc, (request, i % 3, i // 3), togo1, prefix, max_length, timeout, s_time,
+                            deadline, stats is not None)
+            submitted.append(f)
+            pending.add(f)
+        # the remaining tasks return at once if the search has terminated
+        results.extend(f.result() for f in _wait_pool(pending, terminated, deadline))
+    finally:
+        _release_pool(submitted)
+    if stats is not None:
+        for _, st in results:
+            stats.merge(st)
+    return sorted([r for r, _ in results if r is not None], key=len, reverse=True)
+
+
+# ################################ Thread backend ######################################################################
+
+# The searches of the thread backend run in a pool of long-lived worker threads which take them from the queue of the
+# executor. Each worker keeps one search context per SolverThread class and resets it for every search, so a request
+# neither starts threads nor allocates search stacks. The executor starts a new worker only if no worker is idle, so
+# concurrent requests search side by side as with a thread per search, and the pool grows to the largest number of
+# searches which ran at the same time. Only beyond THREAD_WORKERS concurrent searches, 6 for each request, are requests
+# served one after another: their searches wait in the queue of the executor, and unless they have a hard deadline,
+# their timeout runs from the call and not from the start of the searches.
+THREAD_WORKERS = 6 * 32
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+_contexts = threading.local()  # SolverThread class -> search context of the worker thread
+
+
+def _get_thread_pool():
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=THREAD_WORKERS, thread_name_prefix='search')
+        return _thread_pool
+
+
+def _search_in_context(thread_class, *args, **kwargs):
+    """Run a search with the search context of the calling thread. Return its SearchStats or None."""
+    ctx = _contexts.__dict__.get(thread_class)
+    if ctx is None:
+        ctx = _contexts.__dict__[thread_class] = thread_class(*args, **kwargs)
+    else:
+        ctx.reset(*args, **kwargs)
+    ctx.run()  # the worker thread itself does the search
+    return getattr(ctx, 'stats', None)
+
+
+def _run_threads(cc, tr, max_length, timeout, s_time, deadline, terminated=None, stats=None, notify=None):
+    # these mutable variables are modidified by all six searches
+    shortest_length = [999]
+    solutions = []
+    if terminated is None:
+        terminated = threading.Event()
+    lock = threading.Lock()
+    thread_class = SolverThread if stats is None else InstrumentedSolverThread
+    pool = _get_thread_pool()
+    futures = [pool.submit(_search_in_context, thread_class, cc, i % 3, i // 3, max_length, timeout, s_time,
+                           solutions, terminated, shortest_length, lock, deadline, notify=notify) for i in tr]
+    # The pool is shared by concurrent calls, so the searches of this call may wait behind those of other calls. With
+    # a deadline, do not wait longer than that for them.
+    done, not_done = wait(futures, timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+    if not_done:
+        terminated.set()  # running searches stop at their next check, queued ones are dropped
+        for f in not_done:
+            f.cancel()
+    for f in done:
+        st = f.result()  # raises an exception of a search
+        if stats is not None:
+            stats.merge(st)
+    with lock:
+        return list(solutions)  # a search which is still running does not change the result
+
+
+# ################################ Free-threaded backend ###############################################################
+
+# On a free-threaded CPython build (3.13t) the threads of one process run in parallel on all cores. The backend splits
+# the search trees into the subtrees of _subtrees() like the split backend, but its workers are threads which take the
+# next subtree from a shared iterator. The searches share only the one-element list shortest_length, which is read
+# without a lock and replaced under the lock once per improved solution, and the termination event. Solutions, search
+# contexts and statistics are local to each worker thread and are combined when all workers have finished.
+# The backend also works with the GIL, but then the workers take turns on one core.
+FREE_THREADED = not getattr(sys, '_is_gil_enabled', lambda: True)()  # True if the GIL is disabled
+FREE_THREAD_WORKERS = os.cpu_count() or 1  # read on every call
+
+
+def _run_free_threads(cc, tr, max_length, timeout, s_time, deadline, terminated=None, stats=None, notify=None):
+    shortest_length = [999]
+    if terminated is None:
+        terminated = threading.Event()
+    lock = threading.Lock()  # guards shortest_length, next(tasks) and the results
+    thread_class = SolverThread if stats is None else InstrumentedSolverThread
+    dists = []
+    for i in tr:
+        dists.append(SolverThread(cc, i % 3, i // 3, 0, 0, 0, [], terminated, shortest_length).prepare())
+    directions = dict(zip(tr, dists))
+    tasks = _subtrees(tr, dists)
+    results = []
+
+    def work():
+        contexts = {}  # i -> prepared search context of direction i
+        solutions = []
+        local_stats = SearchStats() if stats is not None else None
+        while not terminated.is_set():
+            with lock:
+                task = next(tasks, None)
+            if task is None:
+                break
+            i, togo1, prefix = task
+            args = (cc, i % 3, i // 3, max_length, timeout, s_time, solutions, terminated, shortest_length, lock,
+                    deadline)
+            ctx = contexts.get(i)
+            if ctx is None:
+                ctx = contexts[i] = thread_class(*args, notify=notify)
+                ctx.prepare()
+            else:  # a new search, the leaf before the first leaf of the subtree may belong to another worker
+                ctx.reset(*args, notify=notify)
+            co = ctx.co_cube
+            ctx.search(co.flip, co.twist, co.slice_sorted, directions[i], togo1, prefix)
+            if local_stats is not None:
+                local_stats.merge(ctx.stats)
+        with lock:
+            results.extend(solutions)
+            if stats is not None:
+                stats.merge(local_stats)
+
+    with ThreadPoolExecutor(max_workers=FREE_THREAD_WORKERS, thread_name_prefix='freethread') as ex:
+        for f in [ex.submit(work) for _ in range(FREE_THREAD_WORKERS)]:
+            f.result()  # raises an exception of a worker
+    return sorted(results, key=len, reverse=True)
+
+
+_BACKENDS = {'thread': _run_threads, 'process': _run_processes, 'split': _run_split, 'freethread': _run_free_threads}
+
+
+# A cache.SolutionCache in front of solve() and solveto(), None disables caching. For example
+# solver.solution_cache = cache.SolutionCache(maxsize=100000, path='solutions.db')
+solution_cache = None
+
+
+def _maneuver_string(man):
+    s = ''
+    for m in man:
+        s += m.name + ' '
+    return s + '(' + str(len(s) // 3) + 'f)'
+
+
+def _quick_solution(cc, deadline):
+    """Return a fast, usually longer maneuver which solves cc: the first solution of a single search with long phase 2
+    maneuvers allowed. Return None if the search has not found it before the deadline."""
+    solutions = []
+    th = SolverThread(cc, 0, 0, 999, 0, time.monotonic(), solutions, threading.Event(), [999], deadline=deadline,
+                      quick=True)
+    th.run()  # terminates with the first solution because of ret_length 999
+    return solutions[-1] if solutions else None
+
+
+def _directions(cc):
+    """The (rot, inv) directions i = rot + 3 * inv to search. Symmetries of the cube make some of them redundant."""
+    syms = cc.symmetries()
+    if len(list({16, 20, 24, 28} & set(syms))) > 0:  # we have some rotational symmetry along a long diagonal
+        tr = [0, 3]  # so we search only one direction and the inverse
+    else:
+        tr = range(6)  # This means search in 3 directions + inverse cube
+    if len(list(set(range(48, 96)) & set(syms))) > 0:  # we have some antisymmetry so we do not search the inverses
+        tr = list(filter(lambda x: x < 3, tr))
+    return tr
+
+
+def _result(text, deadline_hit, stats):
+    """The return value of solve(): the maneuver string or error message, followed by deadline_hit and the statistics
+    if requested."""
+    result = (text,)
+    if deadline_hit is not None:
+        result += (deadline_hit,)
+    if stats is not None:
+        result += (stats.as_dict(),)
+    return result if len(result) > 1 else result[0]
+
+
+def _error(message, hard_deadline, return_stats):
+    """The return value of solve() for an invalid input. It has the same shape as a solution, with deadline_hit False
+    and empty statistics."""
+    return _result(message, False if hard_deadline else None, SearchStats() if return_stats else None)
+
+
+def _search(cc, max_length, timeout, backend, hard_deadline=False, terminated=None, return_stats=False):
+    """Search a maneuver which solves cc with the given backend and return it in solve() format.
+    With hard_deadline, return (maneuver, deadline_hit) instead. Setting the event terminated stops the search.
+    With return_stats, the statistics of the search are appended to the result."""
+    _check_phase2_pruning()
+    if backend not in _BACKENDS:
+        return _error('Error: Unknown backend ' + str(backend) + '.', hard_deadline, return_stats)
+    stats = SearchStats() if return_stats else None
+    cache = solution_cache
+    if cache is not None:
+        man = cache.lookup(cc, max_length)
+        if man is not None:
+            if stats is not None:
+                stats.cache_hit = True
+            return _result(_maneuver_string(man), False if hard_deadline else None, stats)
+    s_time = time.monotonic()
+    deadline = s_time + timeout if hard_deadline else None
+    # the fallback of the hard deadline is computed first, so it is bounded by the deadline, too
+    quick = _quick_solution(cc, deadline) if hard_deadline else None
+    solutions = _BACKENDS[backend](cc, _directions(cc), max_length, timeout, s_time, deadline, terminated, stats)
+    deadline_hit = None
+    if hard_deadline:
+        deadline_hit = time.monotonic() > deadline
+        if len(solutions) == 0:
+            if quick is None:
+                return _result('Error: No solution found before the deadline.', deadline_hit, stats)
+            solutions = [quick]
+    if len(solutions) == 0:
+        return _result(_maneuver_string([]), deadline_hit, stats)
+    if cache is not None:
+        cache.store(cc, solutions[-1])
+    return _result(_maneuver_string(solutions[-1]), deadline_hit, stats)  # the last solution is the shortest
+
+
+def solve(cubestring, max_length=20, timeout=3, backend='thread', hard_deadline=False, terminated=None,
+          return_stats=False):
     """Solve a cube defined by its cube definition string.
      :param cubestring: The format of the string is given in the Facelet class defined in the file enums.py
      :param max_length: The function will return if a maneuver of length <= max_length has been found
      :param timeout: If the function times out, the best solution found so far is returned. If there has not been found
      any solution yet the computation continues until a first solution appears.
+     :param backend: 'thread' runs the searches in threads of this process, 'process' runs them in worker processes
+     which use several cores. 'split' splits the search trees of all directions into many small tasks for the worker
+     processes of 'process' and uses all cores. The worker processes are kept alive between the calls, see shutdown().
+     'freethread' searches the same small tasks in FREE_THREAD_WORKERS threads, for free-threaded Python builds.
+     :param hard_deadline: If True, the search stops after timeout seconds in any case and the best solution found so
+     far is returned. If there is none, the fast but longer maneuver of a quick search which runs first is returned,
+     or an error message if not even the quick search has finished in time. The return value is then the tuple
+     (maneuver, deadline_hit).
+     :param terminated: None or a threading.Event. Setting it from another thread stops the search early, the best
+     solution found so far is returned.
+     :param return_stats: If True, the searches count nodes, prunings and solution times and a dictionary with these
+     statistics, summed over all searches, is returned as last element of the tuple (maneuver, ..., stats). Without
+     it the searches are not instrumented at all.
+     An error message for an invalid cube is returned in place of the maneuver, in the same tuple with deadline_hit
+     False and empty statistics.
     """
     fc = face.FaceCube()
     s = fc.from_string(cubestring)
     if s != cubie.CUBE_OK:
-        return s  # no valid cubestring, gives invalid facelet cube
+        return _error(s, hard_deadline, return_stats)  # no valid cubestring, gives invalid facelet cube
     cc = fc.to_cubie_cube()
     s = cc.verify()
     if s != cubie.CUBE_OK:
-        return s  # no valid facelet cube, gives invalid cubie cube
-
-    my_threads = []
-    s_time = time.monotonic()
-
-    # these mutable variables are modidified by all six threads
-    s_length = [999]
-    solutions = []
-    terminated = thr.Event()
-    terminated.clear()
-    syms = cc.symmetries()
-    if len(list({16, 20, 24, 28} & set(syms))) > 0:  # we have some rotational symmetry along a long diagonal
-        tr = [0, 3]  # so we search only one direction and the inverse
-    else:
-        tr = range(6)  # This means search in 3 directions + inverse cube
-    if len(list(set(range(48, 96)) & set(syms))) > 0:  # we have some antisymmetry so we do not search the inverses
-        tr = list(filter(lambda x: x < 3, tr))
-    for i in tr:
-        th = SolverThread(cc, i % 3, i // 3, max_length, timeout, s_time, solutions, terminated, [999])
-        my_threads.append(th)
-        th.start()
-    for t in my_threads:
-        t.join()  # wait until all threads have finished
-    s = ''
-    if len(solutions) > 0:
-        for m in solutions[-1]:  # the last solution is the shortest
-            s += m.name + ' '
-    return s + '(' + str(len(s) // 3) + 'f)'
+        return _error(s, hard_deadline, return_stats)  # no valid facelet cube, gives invalid cubie cube
+    return _search(cc, max_length, timeout, backend, hard_deadline, terminated, return_stats)
 
 
 ########################################################################################################################
 
 
-def solveto(cubestring, goalstring, max_length=20, timeout=3):
+def solveto(cubestring, goalstring, max_length=20, timeout=3, backend='thread', hard_deadline=False,
+            terminated=None, return_stats=False):
     """Solve a cube defined by cubstring to a position defined by goalstring.
      :param cubestring: The format of the string is given in the Facelet class defined in the file enums.py
      :param goalstring: The format of the string is given in the Facelet class defined in the file enums.py
      :param max_length: The function will return if a maneuver of length <= max_length has been found
      :param timeout: If the function times out, the best solution found so far is returned. If there has not been found
      any solution yet the computation continues until a first solution appears.
+     :param backend: 'thread', 'process', 'split' or 'freethread', see solve()
+     :param hard_deadline: See solve()
+     :param terminated: See solve()
+     :param return_stats: See solve()
     """
     fc0 = face.FaceCube()
     fcg = face.FaceCube()
     s = fc0.from_string(cubestring)
     if s != cubie.CUBE_OK:
-        return 'first cube ' + s  # no valid cubestring, gives invalid facelet cube
+        return _error('first cube ' + s, hard_deadline, return_stats)  # no valid cubestring, gives invalid facelet cube
     s = fcg.from_string(goalstring)
     if s != cubie.CUBE_OK:
-        return 'second cube ' + s  # no valid goalstring, gives invalid facelet cube
+        return _error('second cube ' + s, hard_deadline, return_stats)  # no valid goalstring, invalid facelet cube
     cc0 = fc0.to_cubie_cube()
     s = cc0.verify()
     if s != cubie.CUBE_OK:
-        return 'first cube ' + s  # no valid facelet cube, gives invalid cubie cube
+        return _error('first cube ' + s, hard_deadline, return_stats)  # no valid facelet cube, gives invalid cubie cube
     ccg = fcg.to_cubie_cube()
     s = ccg.verify()
     if s != cubie.CUBE_OK:
-        return 'second cube ' + s  # no valid facelet cube, gives invalid cubie cube
+        return _error('second cube ' + s, hard_deadline, return_stats)  # no valid facelet cube, invalid cubie cube
     # cc0 * S = ccg  <=> (ccg^-1 * cc0) * S = Id
     cc = cubie.CubieCube()
     ccg.inv_cubie_cube(cc)
     cc.multiply(cc0)
+    return _search(cc, max_length, timeout, backend, hard_deadline, terminated, return_stats)
 
-    my_threads = []
-    s_time = time.monotonic()
 
-    # these mutable variables are modidified by all six threads
+def iter_solutions(cubestring, max_length=20, timeout=None):
+    """Solve a cube and yield every new shortest solution as soon as it is found, as (maneuver, length, seconds).
+     :param cubestring: The format of the string is given in the Facelet class defined in the file enums.py
+     :param max_length: The search stops when a maneuver of length <= max_length has been found
+     :param timeout: None to search until max_length is reached or the consumer stops, else see solve()
+     The searches run in threads of their own. If the consumer stops iterating, they are terminated. For an invalid
+     cube a single error message is yielded, as (message, None, None).
+    """
+    fc = face.FaceCube()
+    s = fc.from_string(cubestring)
+    if s != cubie.CUBE_OK:
+        yield s, None, None  # no valid cubestring, gives invalid facelet cube
+        return
+    cc = fc.to_cubie_cube()
+    s = cc.verify()
+    if s != cubie.CUBE_OK:
+        yield s, None, None  # no valid facelet cube, gives invalid cubie cube
+        return
+    _check_phase2_pruning()
+    found = queue.Queue()
+    terminated = threading.Event()
+    tr = _directions(cc)
+    s_time = time.monotonic()
     shortest_length = [999]
-    solutions = []
-    terminated = thr.Event()
-    terminated.clear()
-    syms = cc.symmetries()
-    if len(list({16, 20, 24, 28} & set(syms))) > 0:  # we have some rotational symmetry along a long diagonal
-        tr = [0, 3]  # so we search only one direction and the inverse
-    else:
-        tr = range(6)  # This means search in 3 directions + inverse cube
-    if len(list(set(range(48, 96)) & set(syms))) > 0:  # we have some antisymmetry so we do not search the inverses
-        tr = list(filter(lambda x: x < 3, tr))
-    for i in tr:
-        th = SolverThread(cc, i % 3, i // 3, max_length, timeout, s_time, solutions, terminated, shortest_length)
-        my_threads.append(th)
-        th.start()
-    for t in my_threads:
-        t.join()  # wait until all threads have finished
-    s = ''
-    if len(solutions) > 0:
-        for m in solutions[-1]:  # the last solution is the shortest
-            s += m.name + ' '
-    return s + '(' + str(len(s) // 3) + 'f)'
\ No newline at end of file
+    lock = threading.Lock()
+    # The generator may stay open for a long time, so its searches run in threads of their own and not in the shared
+    # pool of the thread backend, whose workers they would hold for as long as the generator is open.
+    threads = [SolverThread(cc, i % 3, i // 3, max_length, float('inf') if timeout is None else timeout, s_time, [],
+                            terminated, shortest_length, lock, notify=lambda man, seconds: found.put((man, seconds)))
+               for i in tr]
+
+    def run():
+        try:
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+        finally:
+            found.put(None)  # all searches have finished
+
+    searches = threading.Thread(target=run)
+    searches.start()
+    try:
+        while True:
+            item = found.get()
+            if item is None:
+                break
+            man, seconds = item
+            yield _maneuver_string(man), len(man), seconds
+    finally:
+        terminated.set()  # the consumer stopped early or all searches have finished
+        searches.join()
+
+
+########################################################################################################################
+
+# ################################ Batch solving #######################################################################
+
+# Worker processes of solve_many, one pool per number of workers. Each worker solves whole cubes and keeps its tables
+# loaded for the whole batch and for later batches.
+_batch_pools = {}
+_batch_lock = threading.Lock()
+
+
+def _get_batch_pool(workers):
+    with _batch_lock:
+        if workers not in _batch_pools:
+            _batch_pools[workers] = ProcessPoolExecutor(max_workers=workers, initializer=_preload)
+        return _batch_pools[workers]
+
+
+def solve_many(cubestrings, max_length=20, timeout=3, workers=None):
+    """Solve many cubes in worker processes and yield (index, solution) as soon as a cube is solved.
+     :param cubestrings: An iterable of cube definition strings, for example a generator which reads them from a file.
+     It is consumed lazily, at most 2 * workers cubes are in flight at any time.
+     :param max_length: See solve()
+     :param timeout: See solve()
+     :param workers: The number of worker processes, default is the number of cores
+     The index is the position of the cube in cubestrings, the solution has the format of solve(). The results are not
+     ordered by index.
+    """
+    workers = workers or os.cpu_count()
+    pool = _get_batch_pool(workers)
+    pending = {}  # future -> index
+    try:
+        for index, cubestring in enumerate(cubestrings):
+            pending[pool.submit(solve, cubestring, max_length, timeout)] = index
+            if len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    yield pending.pop(f), f.result()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield pending.pop(f), f.result()
+    finally:
+        for f in pending:  # the consumer stopped early
+            f.cancel()
+
+
+# ################################ asyncio front end ###################################################################
+
+# All awaiting tasks share one bounded thread pool, so many concurrent awaits do not start more searches at a time than
+# the pool has threads. The searches themselves run in the backend given by the caller.
+ASYNC_WORKERS = 4
+_async_executor = None
+_async_lock = threading.Lock()
+
+
+def _get_async_executor():
+    global _async_executor
+    with _async_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix='solver')
+        return _async_executor
+
+
+async def _run_async(func, *args):
+    terminated = threading.Event()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_async_executor(), functools.partial(func, *args, terminated=terminated))
+    try:
+        return await future
+    except asyncio.CancelledError:
+        terminated.set()  # a running search stops at its next check, a queued one is dropped by the executor
+        raise
+
+
+async def solve_async(cubestring, max_length=20, timeout=3, backend='thread', hard_deadline=False):
+    """Awaitable version of solve() which does not block the event loop. Cancelling the awaiting task stops the
+    search."""
+    return await _run_async(solve, cubestring, max_length, timeout, backend, hard_deadline)
+
+
+async def solveto_async(cubestring, goalstring, max_length=20, timeout=3, backend='thread', hard_deadline=False):
+    """Awaitable version of solveto() which does not block the event loop. Cancelling the awaiting task stops the
+    search."""
+    return await _run_async(solveto, cubestring, goalstring, max_length, timeout, backend, hard_deadline)
@@ -0,0 +1,361 @@
+# Group tables of the 48 cube symmetries. Generated by symmetries.write_group_tables(), do not edit.
+
+SYM_CP = [
+    [0, 1, 2, 3, 4, 5, 6, 7],
+    [1, 0, 3, 2, 5, 4, 7, 6],
+    [3, 0, 1, 2, 7, 4, 5, 6],
+    [0, 3, 2, 1, 4, 7, 6, 5],
+    [2, 3, 0, 1, 6, 7, 4, 5],
+    [3, 2, 1, 0, 7, 6, 5, 4],
+    [1, 2, 3, 0, 5, 6, 7, 4],
+    [2, 1, 0, 3, 6, 5, 4, 7],
+    [5, 4, 7, 6, 1, 0, 3, 2],
+    [4, 5, 6, 7, 0, 1, 2, 3],
+    [6, 5, 4, 7, 2, 1, 0, 3],
+    [5, 6, 7, 4, 1, 2, 3, 0],
+    [7, 6, 5, 4, 3, 2, 1, 0],
+    [6, 7, 4, 5, 2, 3, 0, 1],
+    [4, 7, 6, 5, 0, 3, 2, 1],
+    [7, 4, 5, 6, 3, 0, 1, 2],
+    [0, 4, 5, 1, 3, 7, 6, 2],
+    [4, 0, 1, 5, 7, 3, 2, 6],
+    [1, 0, 4, 5, 2, 3, 7, 6],
+    [0, 1, 5, 4, 3, 2, 6, 7],
+    [5, 1, 0, 4, 6, 2, 3, 7],
+    [1, 5, 4, 0, 2, 6, 7, 3],
+    [4, 5, 1, 0, 7, 6, 2, 3],
+    [5, 4, 0, 1, 6, 7, 3, 2],
+    [7, 3, 2, 6, 4, 0, 1, 5],
+    [3, 7, 6, 2, 0, 4, 5, 1],
+    [6, 7, 3, 2, 5, 4, 0, 1],
+    [7, 6, 2, 3, 4, 5, 1, 0],
+    [2, 6, 7, 3, 1, 5, 4, 0],
+    [6, 2, 3, 7, 5, 1, 0, 4],
+    [3, 2, 6, 7, 0, 1, 5, 4],
+    [2, 3, 7, 6, 1, 0, 4, 5],
+    [0, 3, 7, 4, 1, 2, 6, 5],
+    [3, 0, 4, 7, 2, 1, 5, 6],
+    [4, 0, 3, 7, 5, 1, 2, 6],
+    [0, 4, 7, 3, 1, 5, 6, 2],
+    [7, 4, 0, 3, 6, 5, 1, 2],
+    [4, 7, 3, 0, 5, 6, 2, 1],
+    [3, 7, 4, 0, 2, 6, 5, 1],
+    [7, 3, 0, 4, 6, 2, 1, 5],
+    [2, 1, 5, 6, 3, 0, 4, 7],
+    [1, 2, 6, 5, 0, 3, 7, 4],
+    [6, 2, 1, 5, 7, 3, 0, 4],
+    [2, 6, 5, 1, 3, 7, 4, 0],
+    [5, 6, 2, 1, 4, 7, 3, 0],
+    [6, 5, 1, 2, 7, 4, 0, 3],
+    [1, 5, 6, 2, 0, 4, 7, 3],
+    [5, 1, 2, 6, 4, 0, 3, 7],
+]
+
+SYM_CO = [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [3, 3, 3, 3, 3, 3, 3, 3],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+    [2, 1, 2, 1, 1, 2, 1, 2],
+    [4, 5, 4, 5, 5, 4, 5, 4],
+    [1, 2, 1, 2, 2, 1, 2, 1],
+    [5, 4, 5, 4, 4, 5, 4, 5],
+]
+
+SYM_EP = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
+    [2, 1, 0, 3, 6, 5, 4, 7, 9, 8, 11, 10],
+    [3, 0, 1, 2, 7, 4, 5, 6, 11, 8, 9, 10],
+    [1, 0, 3, 2, 5, 4, 7, 6, 8, 11, 10, 9],
+    [2, 3, 0, 1, 6, 7, 4, 5, 10, 11, 8, 9],
+    [0, 3, 2, 1, 4, 7, 6, 5, 11, 10, 9, 8],
+    [1, 2, 3, 0, 5, 6, 7, 4, 9, 10, 11, 8],
+    [3, 2, 1, 0, 7, 6, 5, 4, 10, 9, 8, 11],
+    [6, 5, 4, 7, 2, 1, 0, 3, 9, 8, 11, 10],
+    [4, 5, 6, 7, 0, 1, 2, 3, 8, 9, 10, 11],
+    [7, 6, 5, 4, 3, 2, 1, 0, 10, 9, 8, 11],
+    [5, 6, 7, 4, 1, 2, 3, 0, 9, 10, 11, 8],
+    [4, 7, 6, 5, 0, 3, 2, 1, 11, 10, 9, 8],
+    [6, 7, 4, 5, 2, 3, 0, 1, 10, 11, 8, 9],
+    [5, 4, 7, 6, 1, 0, 3, 2, 8, 11, 10, 9],
+    [7, 4, 5, 6, 3, 0, 1, 2, 11, 8, 9, 10],
+    [1, 8, 5, 9, 3, 11, 7, 10, 0, 4, 6, 2],
+    [5, 8, 1, 9, 7, 11, 3, 10, 4, 0, 2, 6],
+    [9, 1, 8, 5, 10, 3, 11, 7, 2, 0, 4, 6],
+    [8, 1, 9, 5, 11, 3, 10, 7, 0, 2, 6, 4],
+    [5, 9, 1, 8, 7, 10, 3, 11, 6, 2, 0, 4],
+    [1, 9, 5, 8, 3, 10, 7, 11, 2, 6, 4, 0],
+    [8, 5, 9, 1, 11, 7, 10, 3, 4, 6, 2, 0],
+    [9, 5, 8, 1, 10, 7, 11, 3, 6, 4, 0, 2],
+    [7, 11, 3, 10, 5, 8, 1, 9, 4, 0, 2, 6],
+    [3, 11, 7, 10, 1, 8, 5, 9, 0, 4, 6, 2],
+    [10, 7, 11, 3, 9, 5, 8, 1, 6, 4, 0, 2],
+    [11, 7, 10, 3, 8, 5, 9, 1, 4, 6, 2, 0],
+    [3, 10, 7, 11, 1, 9, 5, 8, 2, 6, 4, 0],
+    [7, 10, 3, 11, 5, 9, 1, 8, 6, 2, 0, 4],
+    [11, 3, 10, 7, 8, 1, 9, 5, 0, 2, 6, 4],
+    [10, 3, 11, 7, 9, 1, 8, 5, 2, 0, 4, 6],
+    [8, 0, 11, 4, 9, 2, 10, 6, 1, 3, 7, 5],
+    [11, 0, 8, 4, 10, 2, 9, 6, 3, 1, 5, 7],
+    [4, 8, 0, 11, 6, 9, 2, 10, 5, 1, 3, 7],
+    [0, 8, 4, 11, 2, 9, 6, 10, 1, 5, 7, 3],
+    [11, 4, 8, 0, 10, 6, 9, 2, 7, 5, 1, 3],
+    [8, 4, 11, 0, 9, 6, 10, 2, 5, 7, 3, 1],
+    [0, 11, 4, 8, 2, 10, 6, 9, 3, 7, 5, 1],
+    [4, 11, 0, 8, 6, 10, 2, 9, 7, 3, 1, 5],
+    [10, 2, 9, 6, 11, 0, 8, 4, 3, 1, 5, 7],
+    [9, 2, 10, 6, 8, 0, 11, 4, 1, 3, 7, 5],
+    [6, 10, 2, 9, 4, 11, 0, 8, 7, 3, 1, 5],
+    [2, 10, 6, 9, 0, 11, 4, 8, 3, 7, 5, 1],
+    [9, 6, 10, 2, 8, 4, 11, 0, 5, 7, 3, 1],
+    [10, 6, 9, 2, 11, 4, 8, 0, 7, 5, 1, 3],
+    [2, 9, 6, 10, 0, 8, 4, 11, 1, 5, 7, 3],
+    [6, 9, 2, 10, 4, 8, 0, 11, 5, 1, 3, 7],
+]
+
+SYM_EO = [
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+]
+
+INV_IDX = [
+    0, 1, 6, 3, 4, 5, 2, 7, 8, 9, 10, 15, 12, 13, 14, 11,
+    32, 41, 18, 19, 40, 33, 30, 31, 44, 37, 26, 27, 36, 45, 22, 23,
+    16, 21, 46, 35, 28, 25, 38, 43, 20, 17, 42, 39, 24, 29, 34, 47,
+]
+
+MULT_SYM = [
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23,
+    24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47,
+    1, 0, 7, 6, 5, 4, 3, 2, 9, 8, 15, 14, 13, 12, 11, 10, 21, 20, 19, 18, 17, 16, 23, 22,
+    29, 28, 27, 26, 25, 24, 31, 30, 41, 40, 47, 46, 45, 44, 43, 42, 33, 32, 39, 38, 37, 36, 35, 34,
+    2, 3, 4, 5, 6, 7, 0, 1, 14, 15, 8, 9, 10, 11, 12, 13, 38, 39, 32, 33, 34, 35, 36, 37,
+    42, 43, 44, 45, 46, 47, 40, 41, 30, 31, 24, 25, 26, 27, 28, 29, 18, 19, 20, 21, 22, 23, 16, 17,
+    3, 2, 1, 0, 7, 6, 5, 4, 15, 14, 13, 12, 11, 10, 9, 8, 35, 34, 33, 32, 39, 38, 37, 36,
+    47, 46, 45, 44, 43, 42, 41, 40, 19, 18, 17, 16, 23, 22, 21, 20, 31, 30, 29, 28, 27, 26, 25, 24,
+    4, 5, 6, 7, 0, 1, 2, 3, 12, 13, 14, 15, 8, 9, 10, 11, 28, 29, 30, 31, 24, 25, 26, 27,
+    20, 21, 22, 23, 16, 17, 18, 19, 40, 41, 42, 43, 44, 45, 46, 47, 32, 33, 34, 35, 36, 37, 38, 39,
+    5, 4, 3, 2, 1, 0, 7, 6, 13, 12, 11, 10, 9, 8, 15, 14, 25, 24, 31, 30, 29, 28, 27, 26,
+    17, 16, 23, 22, 21, 20, 19, 18, 33, 32, 39, 38, 37, 36, 35, 34, 41, 40, 47, 46, 45, 44, 43, 42,
+    6, 7, 0, 1, 2, 3, 4, 5, 10, 11, 12, 13, 14, 15, 8, 9, 46, 47, 40, 41, 42, 43, 44, 45,
+    34, 35, 36, 37, 38, 39, 32, 33, 18, 19, 20, 21, 22, 23, 16, 17, 30, 31, 24, 25, 26, 27, 28, 29,
+    7, 6, 5, 4, 3, 2, 1, 0, 11, 10, 9, 8, 15, 14, 13, 12, 43, 42, 41, 40, 47, 46, 45, 44,
+    39, 38, 37, 36, 35, 34, 33, 32, 31, 30, 29, 28, 27, 26, 25, 24, 19, 18, 17, 16, 23, 22, 21, 20,
+    8, 9, 10, 11, 12, 13, 14, 15, 0, 1, 2, 3, 4, 5, 6, 7, 20, 21, 22, 23, 16, 17, 18, 19,
+    28, 29, 30, 31, 24, 25, 26, 27, 44, 45, 46, 47, 40, 41, 42, 43, 36, 37, 38, 39, 32, 33, 34, 35,
+    9, 8, 15, 14, 13, 12, 11, 10, 1, 0, 7, 6, 5, 4, 3, 2, 17, 16, 23, 22, 21, 20, 19, 18,
+    25, 24, 31, 30, 29, 28, 27, 26, 37, 36, 35, 34, 33, 32, 39, 38, 45, 44, 43, 42, 41, 40, 47, 46,
+    10, 11, 12, 13, 14, 15, 8, 9, 6, 7, 0, 1, 2, 3, 4, 5, 42, 43, 44, 45, 46, 47, 40, 41,
+    38, 39, 32, 33, 34, 35, 36, 37, 26, 27, 28, 29, 30, 31, 24, 25, 22, 23, 16, 17, 18, 19, 20, 21,
+    11, 10, 9, 8, 15, 14, 13, 12, 7, 6, 5, 4, 3, 2, 1, 0, 47, 46, 45, 44, 43, 42, 41, 40,
+    35, 34, 33, 32, 39, 38, 37, 36, 23, 22, 21, 20, 19, 18, 17, 16, 27, 26, 25, 24, 31, 30, 29, 28,
+    12, 13, 14, 15, 8, 9, 10, 11, 4, 5, 6, 7, 0, 1, 2, 3, 24, 25, 26, 27, 28, 29, 30, 31,
+    16, 17, 18, 19, 20, 21, 22, 23, 36, 37, 38, 39, 32, 33, 34, 35, 44, 45, 46, 47, 40, 41, 42, 43,
+    13, 12, 11, 10, 9, 8, 15, 14, 5, 4, 3, 2, 1, 0, 7, 6, 29, 28, 27, 26, 25, 24, 31, 30,
+    21, 20, 19, 18, 17, 16, 23, 22, 45, 44, 43, 42, 41, 40, 47, 46, 37, 36, 35, 34, 33, 32, 39, 38,
+    14, 15, 8, 9, 10, 11, 12, 13, 2, 3, 4, 5, 6, 7, 0, 1, 34, 35, 36, 37, 38, 39, 32, 33,
+    46, 47, 40, 41, 42, 43, 44, 45, 22, 23, 16, 17, 18, 19, 20, 21, 26, 27, 28, 29, 30, 31, 24, 25,
+    15, 14, 13, 12, 11, 10, 9, 8, 3, 2, 1, 0, 7, 6, 5, 4, 39, 38, 37, 36, 35, 34, 33, 32,
+    43, 42, 41, 40, 47, 46, 45, 44, 27, 26, 25, 24, 31, 30, 29, 28, 23, 22, 21, 20, 19, 18, 17, 16,
+    16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39,
+    40, 41, 42, 43, 44, 45, 46, 47, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    17, 16, 23, 22, 21, 20, 19, 18, 25, 24, 31, 30, 29, 28, 27, 26, 37, 36, 35, 34, 33, 32, 39, 38,
+    45, 44, 43, 42, 41, 40, 47, 46, 9, 8, 15, 14, 13, 12, 11, 10, 1, 0, 7, 6, 5, 4, 3, 2,
+    18, 19, 20, 21, 22, 23, 16, 17, 30, 31, 24, 25, 26, 27, 28, 29, 6, 7, 0, 1, 2, 3, 4, 5,
+    10, 11, 12, 13, 14, 15, 8, 9, 46, 47, 40, 41, 42, 43, 44, 45, 34, 35, 36, 37, 38, 39, 32, 33,
+    19, 18, 17, 16, 23, 22, 21, 20, 31, 30, 29, 28, 27, 26, 25, 24, 3, 2, 1, 0, 7, 6, 5, 4,
+    15, 14, 13, 12, 11, 10, 9, 8, 35, 34, 33, 32, 39, 38, 37, 36, 47, 46, 45, 44, 43, 42, 41, 40,
+    20, 21, 22, 23, 16, 17, 18, 19, 28, 29, 30, 31, 24, 25, 26, 27, 44, 45, 46, 47, 40, 41, 42, 43,
+    36, 37, 38, 39, 32, 33, 34, 35, 8, 9, 10, 11, 12, 13, 14, 15, 0, 1, 2, 3, 4, 5, 6, 7,
+    21, 20, 19, 18, 17, 16, 23, 22, 29, 28, 27, 26, 25, 24, 31, 30, 41, 40, 47, 46, 45, 44, 43, 42,
+    33, 32, 39, 38, 37, 36, 35, 34, 1, 0, 7, 6, 5, 4, 3, 2, 9, 8, 15, 14, 13, 12, 11, 10,
+    22, 23, 16, 17, 18, 19, 20, 21, 26, 27, 28, 29, 30, 31, 24, 25, 14, 15, 8, 9, 10, 11, 12, 13,
+    2, 3, 4, 5, 6, 7, 0, 1, 34, 35, 36, 37, 38, 39, 32, 33, 46, 47, 40, 41, 42, 43, 44, 45,
+    23, 22, 21, 20, 19, 18, 17, 16, 27, 26, 25, 24, 31, 30, 29, 28, 11, 10, 9, 8, 15, 14, 13, 12,
+    7, 6, 5, 4, 3, 2, 1, 0, 47, 46, 45, 44, 43, 42, 41, 40, 35, 34, 33, 32, 39, 38, 37, 36,
+    24, 25, 26, 27, 28, 29, 30, 31, 16, 17, 18, 19, 20, 21, 22, 23, 36, 37, 38, 39, 32, 33, 34, 35,
+    44, 45, 46, 47, 40, 41, 42, 43, 12, 13, 14, 15, 8, 9, 10, 11, 4, 5, 6, 7, 0, 1, 2, 3,
+    25, 24, 31, 30, 29, 28, 27, 26, 17, 16, 23, 22, 21, 20, 19, 18, 33, 32, 39, 38, 37, 36, 35, 34,
+    41, 40, 47, 46, 45, 44, 43, 42, 5, 4, 3, 2, 1, 0, 7, 6, 13, 12, 11, 10, 9, 8, 15, 14,
+    26, 27, 28, 29, 30, 31, 24, 25, 22, 23, 16, 17, 18, 19, 20, 21, 10, 11, 12, 13, 14, 15, 8, 9,
+    6, 7, 0, 1, 2, 3, 4, 5, 42, 43, 44, 45, 46, 47, 40, 41, 38, 39, 32, 33, 34, 35, 36, 37,
+    27, 26, 25, 24, 31, 30, 29, 28, 23, 22, 21, 20, 19, 18, 17, 16, 15, 14, 13, 12, 11, 10, 9, 8,
+    3, 2, 1, 0, 7, 6, 5, 4, 39, 38, 37, 36, 35, 34, 33, 32, 43, 42, 41, 40, 47, 46, 45, 44,
+    28, 29, 30, 31, 24, 25, 26, 27, 20, 21, 22, 23, 16, 17, 18, 19, 40, 41, 42, 43, 44, 45, 46, 47,
+    32, 33, 34, 35, 36, 37, 38, 39, 4, 5, 6, 7, 0, 1, 2, 3, 12, 13, 14, 15, 8, 9, 10, 11,
+    29, 28, 27, 26, 25, 24, 31, 30, 21, 20, 19, 18, 17, 16, 23, 22, 45, 44, 43, 42, 41, 40, 47, 46,
+    37, 36, 35, 34, 33, 32, 39, 38, 13, 12, 11, 10, 9, 8, 15, 14, 5, 4, 3, 2, 1, 0, 7, 6,
+    30, 31, 24, 25, 26, 27, 28, 29, 18, 19, 20, 21, 22, 23, 16, 17, 2, 3, 4, 5, 6, 7, 0, 1,
+    14, 15, 8, 9, 10, 11, 12, 13, 38, 39, 32, 33, 34, 35, 36, 37, 42, 43, 44, 45, 46, 47, 40, 41,
+    31, 30, 29, 28, 27, 26, 25, 24, 19, 18, 17, 16, 23, 22, 21, 20, 7, 6, 5, 4, 3, 2, 1, 0,
+    11, 10, 9, 8, 15, 14, 13, 12, 43, 42, 41, 40, 47, 46, 45, 44, 39, 38, 37, 36, 35, 34, 33, 32,
+    32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 0, 1, 2, 3, 4, 5, 6, 7,
+    8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31,
+    33, 32, 39, 38, 37, 36, 35, 34, 41, 40, 47, 46, 45, 44, 43, 42, 5, 4, 3, 2, 1, 0, 7, 6,
+    13, 12, 11, 10, 9, 8, 15, 14, 25, 24, 31, 30, 29, 28, 27, 26, 17, 16, 23, 22, 21, 20, 19, 18,
+    34, 35, 36, 37, 38, 39, 32, 33, 46, 47, 40, 41, 42, 43, 44, 45, 22, 23, 16, 17, 18, 19, 20, 21,
+    26, 27, 28, 29, 30, 31, 24, 25, 14, 15, 8, 9, 10, 11, 12, 13, 2, 3, 4, 5, 6, 7, 0, 1,
+    35, 34, 33, 32, 39, 38, 37, 36, 47, 46, 45, 44, 43, 42, 41, 40, 19, 18, 17, 16, 23, 22, 21, 20,
+    31, 30, 29, 28, 27, 26, 25, 24, 3, 2, 1, 0, 7, 6, 5, 4, 15, 14, 13, 12, 11, 10, 9, 8,
+    36, 37, 38, 39, 32, 33, 34, 35, 44, 45, 46, 47, 40, 41, 42, 43, 12, 13, 14, 15, 8, 9, 10, 11,
+    4, 5, 6, 7, 0, 1, 2, 3, 24, 25, 26, 27, 28, 29, 30, 31, 16, 17, 18, 19, 20, 21, 22, 23,
+    37, 36, 35, 34, 33, 32, 39, 38, 45, 44, 43, 42, 41, 40, 47, 46, 9, 8, 15, 14, 13, 12, 11, 10,
+    1, 0, 7, 6, 5, 4, 3, 2, 17, 16, 23, 22, 21, 20, 19, 18, 25, 24, 31, 30, 29, 28, 27, 26,
+    38, 39, 32, 33, 34, 35, 36, 37, 42, 43, 44, 45, 46, 47, 40, 41, 30, 31, 24, 25, 26, 27, 28, 29,
+    18, 19, 20, 21, 22, 23, 16, 17, 2, 3, 4, 5, 6, 7, 0, 1, 14, 15, 8, 9, 10, 11, 12, 13,
+    39, 38, 37, 36, 35, 34, 33, 32, 43, 42, 41, 40, 47, 46, 45, 44, 27, 26, 25, 24, 31, 30, 29, 28,
+    23, 22, 21, 20, 19, 18, 17, 16, 15, 14, 13, 12, 11, 10, 9, 8, 3, 2, 1, 0, 7, 6, 5, 4,
+    40, 41, 42, 43, 44, 45, 46, 47, 32, 33, 34, 35, 36, 37, 38, 39, 4, 5, 6, 7, 0, 1, 2, 3,
+    12, 13, 14, 15, 8, 9, 10, 11, 28, 29, 30, 31, 24, 25, 26, 27, 20, 21, 22, 23, 16, 17, 18, 19,
+    41, 40, 47, 46, 45, 44, 43, 42, 33, 32, 39, 38, 37, 36, 35, 34, 1, 0, 7, 6, 5, 4, 3, 2,
+    9, 8, 15, 14, 13, 12, 11, 10, 21, 20, 19, 18, 17, 16, 23, 22, 29, 28, 27, 26, 25, 24, 31, 30,
+    42, 43, 44, 45, 46, 47, 40, 41, 38, 39, 32, 33, 34, 35, 36, 37, 26, 27, 28, 29, 30, 31, 24, 25,
+    22, 23, 16, 17, 18, 19, 20, 21, 10, 11, 12, 13, 14, 15, 8, 9, 6, 7, 0, 1, 2, 3, 4, 5,
+    43, 42, 41, 40, 47, 46, 45, 44, 39, 38, 37, 36, 35, 34, 33, 32, 31, 30, 29, 28, 27, 26, 25, 24,
+    19, 18, 17, 16, 23, 22, 21, 20, 7, 6, 5, 4, 3, 2, 1, 0, 11, 10, 9, 8, 15, 14, 13, 12,
+    44, 45, 46, 47, 40, 41, 42, 43, 36, 37, 38, 39, 32, 33, 34, 35, 8, 9, 10, 11, 12, 13, 14, 15,
+    0, 1, 2, 3, 4, 5, 6, 7, 20, 21, 22, 23, 16, 17, 18, 19, 28, 29, 30, 31, 24, 25, 26, 27,
+    45, 44, 43, 42, 41, 40, 47, 46, 37, 36, 35, 34, 33, 32, 39, 38, 13, 12, 11, 10, 9, 8, 15, 14,
+    5, 4, 3, 2, 1, 0, 7, 6, 29, 28, 27, 26, 25, 24, 31, 30, 21, 20, 19, 18, 17, 16, 23, 22,
+    46, 47, 40, 41, 42, 43, 44, 45, 34, 35, 36, 37, 38, 39, 32, 33, 18, 19, 20, 21, 22, 23, 16, 17,
+    30, 31, 24, 25, 26, 27, 28, 29, 6, 7, 0, 1, 2, 3, 4, 5, 10, 11, 12, 13, 14, 15, 8, 9,
+    47, 46, 45, 44, 43, 42, 41, 40, 35, 34, 33, 32, 39, 38, 37, 36, 23, 22, 21, 20, 19, 18, 17, 16,
+    27, 26, 25, 24, 31, 30, 29, 28, 11, 10, 9, 8, 15, 14, 13, 12, 7, 6, 5, 4, 3, 2, 1, 0,
+]
+
+CONJ_MOVE = [
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17,
+    2, 1, 0, 14, 13, 12, 8, 7, 6, 11, 10, 9, 5, 4, 3, 17, 16, 15,
+    0, 1, 2, 15, 16, 17, 3, 4, 5, 9, 10, 11, 6, 7, 8, 12, 13, 14,
+    2, 1, 0, 8, 7, 6, 5, 4, 3, 11, 10, 9, 17, 16, 15, 14, 13, 12,
+    0, 1, 2, 12, 13, 14, 15, 16, 17, 9, 10, 11, 3, 4, 5, 6, 7, 8,
+    2, 1, 0, 5, 4, 3, 17, 16, 15, 11, 10, 9, 14, 13, 12, 8, 7, 6,
+    0, 1, 2, 6, 7, 8, 12, 13, 14, 9, 10, 11, 15, 16, 17, 3, 4, 5,
+    2, 1, 0, 17, 16, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3,
+    9, 10, 11, 12, 13, 14, 6, 7, 8, 0, 1, 2, 3, 4, 5, 15, 16, 17,
+    11, 10, 9, 5, 4, 3, 8, 7, 6, 2, 1, 0, 14, 13, 12, 17, 16, 15,
+    9, 10, 11, 15, 16, 17, 12, 13, 14, 0, 1, 2, 6, 7, 8, 3, 4, 5,
+    11, 10, 9, 8, 7, 6, 14, 13, 12, 2, 1, 0, 17, 16, 15, 5, 4, 3,
+    9, 10, 11, 3, 4, 5, 15, 16, 17, 0, 1, 2, 12, 13, 14, 6, 7, 8,
+    11, 10, 9, 14, 13, 12, 17, 16, 15, 2, 1, 0, 5, 4, 3, 8, 7, 6,
+    9, 10, 11, 6, 7, 8, 3, 4, 5, 0, 1, 2, 15, 16, 17, 12, 13, 14,
+    11, 10, 9, 17, 16, 15, 5, 4, 3, 2, 1, 0, 8, 7, 6, 14, 13, 12,
+    6, 7, 8, 0, 1, 2, 3, 4, 5, 15, 16, 17, 9, 10, 11, 12, 13, 14,
+    8, 7, 6, 11, 10, 9, 5, 4, 3, 17, 16, 15, 2, 1, 0, 14, 13, 12,
+    6, 7, 8, 12, 13, 14, 0, 1, 2, 15, 16, 17, 3, 4, 5, 9, 10, 11,
+    8, 7, 6, 5, 4, 3, 2, 1, 0, 17, 16, 15, 14, 13, 12, 11, 10, 9,
+    6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 0, 1, 2, 3, 4, 5,
+    8, 7, 6, 2, 1, 0, 14, 13, 12, 17, 16, 15, 11, 10, 9, 5, 4, 3,
+    6, 7, 8, 3, 4, 5, 9, 10, 11, 15, 16, 17, 12, 13, 14, 0, 1, 2,
+    8, 7, 6, 14, 13, 12, 11, 10, 9, 17, 16, 15, 5, 4, 3, 2, 1, 0,
+    15, 16, 17, 9, 10, 11, 3, 4, 5, 6, 7, 8, 0, 1, 2, 12, 13, 14,
+    17, 16, 15, 2, 1, 0, 5, 4, 3, 8, 7, 6, 11, 10, 9, 14, 13, 12,
+    15, 16, 17, 12, 13, 14, 9, 10, 11, 6, 7, 8, 3, 4, 5, 0, 1, 2,
+    17, 16, 15, 5, 4, 3, 11, 10, 9, 8, 7, 6, 14, 13, 12, 2, 1, 0,
+    15, 16, 17, 0, 1, 2, 12, 13, 14, 6, 7, 8, 9, 10, 11, 3, 4, 5,
+    17, 16, 15, 11, 10, 9, 14, 13, 12, 8, 7, 6, 2, 1, 0, 5, 4, 3,
+    15, 16, 17, 3, 4, 5, 0, 1, 2, 6, 7, 8, 12, 13, 14, 9, 10, 11,
+    17, 16, 15, 14, 13, 12, 2, 1, 0, 8, 7, 6, 5, 4, 3, 11, 10, 9,
+    3, 4, 5, 6, 7, 8, 0, 1, 2, 12, 13, 14, 15, 16, 17, 9, 10, 11,
+    5, 4, 3, 17, 16, 15, 2, 1, 0, 14, 13, 12, 8, 7, 6, 11, 10, 9,
+    3, 4, 5, 9, 10, 11, 6, 7, 8, 12, 13, 14, 0, 1, 2, 15, 16, 17,
+    5, 4, 3, 2, 1, 0, 8, 7, 6, 14, 13, 12, 11, 10, 9, 17, 16, 15,
+    3, 4, 5, 15, 16, 17, 9, 10, 11, 12, 13, 14, 6, 7, 8, 0, 1, 2,
+    5, 4, 3, 8, 7, 6, 11, 10, 9, 14, 13, 12, 17, 16, 15, 2, 1, 0,
+    3, 4, 5, 0, 1, 2, 15, 16, 17, 12, 13, 14, 9, 10, 11, 6, 7, 8,
+    5, 4, 3, 11, 10, 9, 17, 16, 15, 14, 13, 12, 2, 1, 0, 8, 7, 6,
+    12, 13, 14, 15, 16, 17, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11,
+    14, 13, 12, 8, 7, 6, 2, 1, 0, 5, 4, 3, 17, 16, 15, 11, 10, 9,
+    12, 13, 14, 9, 10, 11, 15, 16, 17, 3, 4, 5, 0, 1, 2, 6, 7, 8,
+    14, 13, 12, 2, 1, 0, 17, 16, 15, 5, 4, 3, 11, 10, 9, 8, 7, 6,
+    12, 13, 14, 6, 7, 8, 9, 10, 11, 3, 4, 5, 15, 16, 17, 0, 1, 2,
+    14, 13, 12, 17, 16, 15, 11, 10, 9, 5, 4, 3, 8, 7, 6, 2, 1, 0,
+    12, 13, 14, 0, 1, 2, 6, 7, 8, 3, 4, 5, 9, 10, 11, 15, 16, 17,
+    14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 0, 17, 16, 15,
+]
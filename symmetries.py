@@ -1,14 +1,17 @@
 # #################### Symmetry related functions. Symmetry considerations increase the performance of the solver.######
-import os
-from os import path
+# All tables of this module are registered in the table registry and are built or loaded on first use, for example by
+# accessing symmetries.twist_conj. Importing the module has no side effects.
 import array
-from defs import N_TWIST, N_SYM, N_SYM_D4h, N_FLIP, N_SLICE, N_CORNERS, N_UD_EDGES, N_MOVE, N_FLIPSLICE_CLASS, \
-    N_CORNERS_CLASS, FOLDER
+import tables
+import symdata
+from cubedefs import N_TWIST, N_SYM, N_SYM_D4h, N_FLIP, N_SLICE, N_CORNERS, N_UD_EDGES, N_MOVE, N_FLIPSLICE_CLASS, \
+    N_CORNERS_CLASS, N_UD_EDGES_CLASS, N_PERM_4
 from cubedefs import Corner, Edge, Move, BS
 from cube import RoughCube, moveCube
+from tables import load_table
 
 INVALID = 65535
-uint32 = 'I' if ar.array('I').itemsize >= 4 else 'L'  # type codes differ between architectures
+uint32 = 'I' if array.array('I').itemsize >= 4 else 'L'  # type codes differ between architectures
 
 #  #################### Permutations and orientation changes of the basic symmetries ###################################
 
@@ -51,246 +54,225 @@ basicSymCube[BS.ROT_U4] = RoughCube(cpROT_U4, coROT_U4, epROT_U4, eoROT_U4)
 basicSymCube[BS.MIRR_LR2] = RoughCube(cpMIRR_LR2, coMIRR_LR2, epMIRR_LR2, eoMIRR_LR2)
 # ######################################################################################################################
 
-# ######################################## Fill SymCube list ###########################################################
-
-# 48 CubieCubes will represent the 48 cube symmetries
-symCube = []
-cc = RoughCube()  # Identity cube
-idx = 0
-for urf3 in range(3):
-    for f2 in range(2):
-        for u4 in range(4):
-            for lr2 in range(2):
-                symCube.append(RoughCube(cc.cp, cc.co, cc.ep, cc.eo))
-                idx += 1
-                cc.multiply(basicSymCube[BS.MIRR_LR2])
-            cc.multiply(basicSymCube[BS.ROT_U4])
-        cc.multiply(basicSymCube[BS.ROT_F2])
-    cc.multiply(basicSymCube[BS.ROT_URF3])
-########################################################################################################################
+# ######################################## The group tables of the 48 symmetries #####################################
+# The group tables are small and ship precomputed in symdata.py. The functions below compute them from the basic
+# symmetries, write_group_tables() regenerates symdata.py.
 
-# ########################################## Fill the inv_idx array ####################################################
 
-# Indices for the inverse symmetries: SymCube[inv_idx[idx]] == SymCube[idx]^(-1)
-inv_idx = array.array('B', [0] * N_SYM)
-for j in range(N_SYM):
-    for i in range(N_SYM):
-        cc = RoughCube(symCube[j].cp, symCube[j].co, symCube[j].ep, symCube[j].eo)
-        cc.corner_multiply(symCube[i])
-        if (cc.cp[Corner.URF] == Corner.URF
-                and cc.cp[Corner.UFL] == Corner.UFL
-                and cc.cp[Corner.ULB] == Corner.ULB):
-            inv_idx[j] = i
-            break
-########################################################################################################################
+def compute_sym_cube():
+    """48 RoughCubes represent the 48 cube symmetries."""
+    sym_cube = []
+    cc = RoughCube()  # Identity cube
+    for urf3 in range(3):
+        for f2 in range(2):
+            for u4 in range(4):
+                for lr2 in range(2):
+                    sym_cube.append(cc.copy())
+                    cc.multiply(basicSymCube[BS.MIRR_LR2])
+                cc.multiply(basicSymCube[BS.ROT_U4])
+            cc.multiply(basicSymCube[BS.ROT_F2])
+        cc.multiply(basicSymCube[BS.ROT_URF3])
+    return sym_cube
 
-# ################################# Generate the group table for the 48 cube symmetries ################################
-mult_sym = array.array('B', [0] * (N_SYM * N_SYM))
-for i in range(N_SYM):
+
+def compute_inv_idx(sym_cube):
+    """Indices for the inverse symmetries: sym_cube[inv_idx[idx]] == sym_cube[idx]^(-1)"""
+    inv = array.array('B', [0] * N_SYM)
     for j in range(N_SYM):
-        cc = RoughCube(symCube[i].cp, symCube[i].co, symCube[i].ep, symCube[i].eo)
-        cc.multiply(symCube[j])
-        for k in range(N_SYM):
-            if cc == symCube[k]:  # SymCube[i]*SymCube[j] == SymCube[k]
-                mult_sym[N_SYM * i + j] = k
+        for i in range(N_SYM):
+            cc = sym_cube[j].copy()
+            cc.corner_multiply(sym_cube[i])
+            if (cc.cp[Corner.URF] == Corner.URF
+                    and cc.cp[Corner.UFL] == Corner.UFL
+                    and cc.cp[Corner.ULB] == Corner.ULB):
+                inv[j] = i
                 break
-########################################################################################################################
+    return inv
 
-# #### Generate the table for the conjugation of a move m by a symmetry s. conj_move[N_MOVE*s + m] = s*m*s^-1 ##########
-conj_move = array.array('H', [0] * (N_MOVE * N_SYM))
-for s in range(N_SYM):
-    for m in Mv:
-        ss = RoughCube(symCube[s].cp, symCube[s].co, symCube[s].ep, symCube[s].eo)  # copy cube
-        ss.multiply(moveCube[m])  # s*m
-        ss.multiply(symCube[inv_idx[s]])  # s*m*s^-1
-        for m2 in Mv:
-            if ss == moveCube[m2]:
-                conj_move[N_MOVE * s + m] = m2
-########################################################################################################################
 
-if not os.path.exists(FOLDER):
-    os.mkdir(FOLDER)
-
-# ###### Generate the phase 1 table for the conjugation of the twist t by a symmetry s. twist_conj[t, s] = s*t*s^-1 ####
-fname = "conj_twist"
-if not path.isfile(os.path.join(FOLDER, fname)):
-    print('On the first run, several tables will be created. This takes about 1/2 hour or longer '
-          '(depending on the hardware).')
-    print('All tables are stored in ' + path.dirname(path.abspath(path.join(FOLDER, fname))))
-    print()
-    print("creating " + fname + " table...")
-    twist_conj = ar.array('H', [0] * (N_TWIST * N_SYM_D4h))
-    for t in range(N_TWIST):
-        cc = cb.CubieCube()
-        cc.set_twist(t)
-        for s in range(N_SYM_D4h):
-            ss = cb.CubieCube(symCube[s].cp, symCube[s].co, symCube[s].ep, symCube[s].eo)  # copy cube
-            ss.corner_multiply(cc)  # s*t
-            ss.corner_multiply(symCube[inv_idx[s]])  # s*t*s^-1
-            twist_conj[N_SYM_D4h * t + s] = ss.get_twist()
-    fh = open(os.path.join(FOLDER, fname), "wb")
-    twist_conj.tofile(fh)
-else:
-    print("loading " + fname + " table...")
-    fh = open(path.join(FOLDER, fname), 'rb')
-    twist_conj = ar.array('H')
-    twist_conj.fromfile(fh, N_TWIST * N_SYM_D4h)
-
-fh.close()
-# ######################################################################################################################
+def compute_mult_sym(sym_cube):
+    """The group table for the 48 cube symmetries: sym_cube[i]*sym_cube[j] == sym_cube[mult_sym[N_SYM * i + j]]"""
+    mult = array.array('B', [0] * (N_SYM * N_SYM))
+    for i in range(N_SYM):
+        for j in range(N_SYM):
+            cc = sym_cube[i].copy()
+            cc.multiply(sym_cube[j])
+            for k in range(N_SYM):
+                if cc == sym_cube[k]:
+                    mult[N_SYM * i + j] = k
+                    break
+    return mult
 
-# #################### Generate the phase 2 table for the conjugation of the URtoDB coordinate by a symmetrie ##########
-fname = "conj_ud_edges"
-if not path.isfile(path.join(FOLDER, fname)):
-    print("creating " + fname + " table...")
-    ud_edges_conj = ar.array('H', [0] * (N_UD_EDGES * N_SYM_D4h))
-    for t in range(N_UD_EDGES):
-        if (t + 1) % 400 == 0:
-            print('.', end='', flush=True)
-        if (t + 1) % 32000 == 0:
-            print('')
-        cc = cb.CubieCube()
-        cc.set_ud_edges(t)
-        for s in range(N_SYM_D4h):
-            ss = cb.CubieCube(symCube[s].cp, symCube[s].co, symCube[s].ep, symCube[s].eo)  # copy cube
-            ss.edge_multiply(cc)  # s*t
-            ss.edge_multiply(symCube[inv_idx[s]])  # s*t*s^-1
-            ud_edges_conj[N_SYM_D4h * t + s] = ss.get_ud_edges()
-    print('')
-    fh = open(path.join(FOLDER, fname), "wb")
-    ud_edges_conj.tofile(fh)
-else:
-    print("loading " + fname + " table...")
-    fh = open(path.join(FOLDER, fname), "rb")
-    ud_edges_conj = ar.array('H')
-    ud_edges_conj.fromfile(fh, N_UD_EDGES * N_SYM_D4h)
-fh.close()
-# ######################################################################################################################
 
-# ############## Generate the tables to handle the symmetry reduced flip-slice coordinate in  phase 1 ##################
-fname1 = "fs_classidx"
-fname2 = "fs_sym"
-fname3 = "fs_rep"
-if not (path.isfile(path.join(FOLDER, fname1)) and path.isfile(path.join(FOLDER, fname2)) and path.isfile(
-        path.join(FOLDER, fname3))):
-    print("creating " + "flipslice sym-tables...")
-    flipslice_classidx = ar.array('H', [INVALID] * (N_FLIP * N_SLICE))  # idx -> classidx
-    flipslice_sym = ar.array('B', [0] * (N_FLIP * N_SLICE))  # idx -> symmetry
-    flipslice_rep = ar.array(uint32, [0] * N_FLIPSLICE_CLASS)  # classidx -> idx of representant
-
-    classidx = 0
-    cc = cb.CubieCube()
-    for slc in range(N_SLICE):
-        cc.set_slice(slc)
-        for flip in range(N_FLIP):
-            cc.set_flip(flip)
-            idx = N_FLIP * slc + flip
-            if (idx + 1) % 4000 == 0:
-                print('.', end='', flush=True)
-            if (idx + 1) % 320000 == 0:
-                print('')
-
-            if flipslice_classidx[idx] == INVALID:
-                flipslice_classidx[idx] = classidx
-                flipslice_sym[idx] = 0
-                flipslice_rep[classidx] = idx
-            else:
-                continue
-            for s in range(N_SYM_D4h):  # conjugate representant by all 16 symmetries
-                ss = cb.CubieCube(symCube[inv_idx[s]].cp, symCube[inv_idx[s]].co, symCube[inv_idx[s]].ep,
-                                  symCube[inv_idx[s]].eo)  # copy cube
-                ss.edge_multiply(cc)
-                ss.edge_multiply(symCube[s])  # s^-1*cc*s
-                idx_new = N_FLIP * ss.get_slice() + ss.get_flip()
-                if flipslice_classidx[idx_new] == INVALID:
-                    flipslice_classidx[idx_new] = classidx
-                    flipslice_sym[idx_new] = s
-            classidx += 1
-    print('')
-    fh = open(path.join(FOLDER, fname1), 'wb')
-    flipslice_classidx.tofile(fh)
-    fh.close()
-    fh = open(path.join(FOLDER, fname2), 'wb')
-    flipslice_sym.tofile(fh)
-    fh.close()
-    fh = open(path.join(FOLDER, fname3), 'wb')
-    flipslice_rep.tofile(fh)
-    fh.close()
-
-else:
-    print("loading " + "flipslice sym-tables...")
-
-    fh = open(path.join(FOLDER, fname1), 'rb')
-    flipslice_classidx = ar.array('H')
-    flipslice_classidx.fromfile(fh, N_FLIP * N_SLICE)
-    fh.close()
-    fh = open(path.join(FOLDER, fname2), 'rb')
-    flipslice_sym = ar.array('B')
-    flipslice_sym.fromfile(fh, N_FLIP * N_SLICE)
-    fh.close()
-    fh = open(path.join(FOLDER, fname3), 'rb')
-    flipslice_rep = ar.array(uint32)
-    flipslice_rep.fromfile(fh, N_FLIPSLICE_CLASS)
-    fh.close()
+def compute_conj_move(sym_cube, inv):
+    """The conjugation of a move m by a symmetry s. conj_move[N_MOVE*s + m] = s*m*s^-1"""
+    conj = array.array('H', [0] * (N_MOVE * N_SYM))
+    for s in range(N_SYM):
+        for m in Move:
+            ss = sym_cube[s].copy()
+            ss.multiply(moveCube[m])  # s*m
+            ss.multiply(sym_cube[inv[s]])  # s*m*s^-1
+            for m2 in Move:
+                if ss == moveCube[m2]:
+                    conj[N_MOVE * s + m] = m2
+    return conj
+
+
+def write_group_tables(fname=symdata.__file__):
+    """Compute the group tables and write them to symdata.py."""
+    sym_cube = compute_sym_cube()
+    inv = compute_inv_idx(sym_cube)
+
+    def rows(name, values, width):
+        s = name + ' = [\n'
+        for i in range(0, len(values), width):
+            s += '    ' + ', '.join(str(int(v)) for v in values[i:i + width]) + ',\n'
+        return s + ']\n'
+
+    with open(fname, 'w') as fh:
+        fh.write('# Group tables of the 48 cube symmetries. '
+                 'Generated by symmetries.write_group_tables(), do not edit.\n')
+        for name, attr in (('SYM_CP', 'cp'), ('SYM_CO', 'co'), ('SYM_EP', 'ep'), ('SYM_EO', 'eo')):
+            fh.write('\n' + name + ' = [\n')
+            for c in sym_cube:
+                fh.write('    [' + ', '.join(str(int(v)) for v in getattr(c, attr)) + '],\n')
+            fh.write(']\n')
+        fh.write('\n' + rows('INV_IDX', inv, 16))
+        fh.write('\n' + rows('MULT_SYM', compute_mult_sym(sym_cube), N_SYM // 2))
+        fh.write('\n' + rows('CONJ_MOVE', compute_conj_move(sym_cube, inv), N_MOVE))
 ########################################################################################################################
 
-# ############ Generate the tables to handle the symmetry reduced corner permutation coordinate in phase 2 #############
-fname1 = "co_classidx"
-fname2 = "co_sym"
-fname3 = "co_rep"
-if not (path.isfile(path.join(FOLDER, fname1)) and path.isfile(path.join(FOLDER, fname2)) and path.isfile(
-        path.join(FOLDER, fname3))):
-    print("creating " + "corner sym-tables...")
-    corner_classidx = ar.array('H', [INVALID] * N_CORNERS)  # idx -> classidx
-    corner_sym = ar.array('B', [0] * N_CORNERS)  # idx -> symmetry
-    corner_rep = ar.array('H', [0] * N_CORNERS_CLASS)  # classidx -> idx of representant
-
-    classidx = 0
-    cc = cb.CubieCube()
-    for cp in range(N_CORNERS):
-        cc.set_corners(cp)
-        if (cp + 1) % 8000 == 0:
-            print('.', end='', flush=True)
-
-        if corner_classidx[cp] == INVALID:
-            corner_classidx[cp] = classidx
-            corner_sym[cp] = 0
-            corner_rep[classidx] = cp
-        else:
-            continue
-        for s in range(N_SYM_D4h):  # conjugate representant by all 16 symmetries
-            ss = cb.CubieCube(symCube[inv_idx[s]].cp, symCube[inv_idx[s]].co, symCube[inv_idx[s]].ep,
-                              symCube[inv_idx[s]].eo)  # copy cube
-            ss.corner_multiply(cc)
-            ss.corner_multiply(symCube[s])  # s^-1*cc*s
-            cp_new = ss.get_corners()
-            if corner_classidx[cp_new] == INVALID:
-                corner_classidx[cp_new] = classidx
-                corner_sym[cp_new] = s
-        classidx += 1
-    print('')
-    fh = open(path.join(FOLDER, fname1), 'wb')
-    corner_classidx.tofile(fh)
-    fh.close()
-    fh = open(path.join(FOLDER, fname2), 'wb')
-    corner_sym.tofile(fh)
-    fh.close()
-    fh = open(path.join(FOLDER, fname3), 'wb')
-    corner_rep.tofile(fh)
-    fh.close()
-
-else:
-    print("loading " + "corner sym-tables...")
-
-    fh = open(path.join(FOLDER, fname1), 'rb')
-    corner_classidx = ar.array('H')
-    corner_classidx.fromfile(fh, N_CORNERS)
-    fh.close()
-    fh = open(path.join(FOLDER, fname2), 'rb')
-    corner_sym = array.array('B')
-    corner_sym.fromfile(fh, N_CORNERS)
-    fh.close()
-    fh = open(path.join(FOLDER, fname3), 'rb')
-    corner_rep = ar.array('H')
-    corner_rep.fromfile(fh, N_CORNERS_CLASS)
-    fh.close()
\ No newline at end of file
+
+# ################################ Loaders of the tables ##############################################################
+
+def _sym_cube():
+    return [RoughCube(cp, co, ep, eo)
+            for cp, co, ep, eo in zip(symdata.SYM_CP, symdata.SYM_CO, symdata.SYM_EP, symdata.SYM_EO)]
+
+
+def _group():
+    """The symmetry cubes and their inverse indices for the table builder. Functions of this module do not see the
+    lazy attributes, so they request the tables from the registry."""
+    return tables.get('symCube'), tables.get('inv_idx')
+
+
+# The tables are generated with NumPy by the vectorized builder in tablegen.py. NumPy is only needed for the
+# generation, the stored tables are loaded without it. python tablegen.py --jobs N builds all missing tables with N
+# worker processes.
+
+def _twist_conj():
+    """The phase 1 table for the conjugation of the twist t by a symmetry s. twist_conj[t, s] = s*t*s^-1"""
+    fname = "conj_twist"
+    if not tables.has_table(fname):
+        import tablegen
+        print("creating " + fname + " table...")
+        tables.store_tables({fname: ('H', tablegen.twist_conj(*_group(), jobs=tablegen.JOBS))})
+    return load_table(fname, 'H', N_TWIST * N_SYM_D4h)
+
+
+def _ud_edges_conj():
+    """The phase 2 table for the conjugation of the URtoDB coordinate by a symmetry"""
+    fname = "conj_ud_edges"
+    if not tables.has_table(fname):
+        import tablegen
+        print("creating " + fname + " table...")
+        tables.store_tables({fname: ('H', tablegen.ud_edges_conj(*_group(), jobs=tablegen.JOBS))})
+    return load_table(fname, 'H', N_UD_EDGES * N_SYM_D4h)
+
+
+def _flipslice_tables():
+    """The tables to handle the symmetry reduced flip-slice coordinate in phase 1"""
+    fnames = ("fs_classidx", "fs_sym", "fs_rep")
+    if not all(tables.has_table(fname) for fname in fnames):
+        import tablegen
+        print("creating " + "flipslice sym-tables...")
+        # idx -> classidx, idx -> sym, classidx -> idx of representant
+        tables.store_tables(dict(zip(fnames, zip(('H', 'B', uint32),
+                                                 tablegen.flipslice_tables(*_group(), jobs=tablegen.JOBS)))))
+    return (load_table(fnames[0], 'H', N_FLIP * N_SLICE),
+            load_table(fnames[1], 'B', N_FLIP * N_SLICE),
+            load_table(fnames[2], uint32, N_FLIPSLICE_CLASS))
+
+
+def _flipslice_sym_move():
+    """The phase 1 move table of the flipslice classes. flipslice_sym_move[N_MOVE * c + m] = 16 * c' + s where the
+    representant of class c times m is s^-1 * rep' * s and rep' is the representant of class c'"""
+    fname = "fs_sym_move"
+    if not tables.has_table(fname):
+        import tablegen
+        print("creating " + fname + " table...")
+        tables.store_tables({fname: (uint32, tablegen.flipslice_sym_move(*tables.get('flipslice_tables')))})
+    return load_table(fname, uint32, N_FLIPSLICE_CLASS * N_MOVE)
+
+
+def _corner_tables():
+    """The tables to handle the symmetry reduced corner permutation coordinate in phase 2"""
+    fnames = ("co_classidx", "co_sym", "co_rep")
+    if not all(tables.has_table(fname) for fname in fnames):
+        import tablegen
+        print("creating " + "corner sym-tables...")
+        # idx -> classidx, idx -> sym, classidx -> idx of representant
+        tables.store_tables(dict(zip(fnames, zip(('H', 'B', 'H'),
+                                                 tablegen.corner_tables(*_group(), jobs=tablegen.JOBS)))))
+    return (load_table(fnames[0], 'H', N_CORNERS),
+            load_table(fnames[1], 'B', N_CORNERS),
+            load_table(fnames[2], 'H', N_CORNERS_CLASS))
+
+
+def _ud_edges_tables():
+    """The tables to handle the symmetry reduced ud_edges coordinate, used by the phase 2 edges pruning table"""
+    fnames = ("ud_classidx", "ud_sym", "ud_rep")
+    if not all(tables.has_table(fname) for fname in fnames):
+        import tablegen
+        print("creating " + "ud_edges sym-tables...")
+        # idx -> classidx, idx -> sym, classidx -> idx of representant
+        tables.store_tables(dict(zip(fnames, zip(('H', 'B', 'H'),
+                                                 tablegen.ud_edges_tables(*_group(), jobs=tablegen.JOBS)))))
+    return (load_table(fnames[0], 'H', N_UD_EDGES),
+            load_table(fnames[1], 'B', N_UD_EDGES),
+            load_table(fnames[2], 'H', N_UD_EDGES_CLASS))
+
+
+def _slice_conj():
+    """The phase 2 table for the conjugation of the slice_sorted coordinate t < 24 by a symmetry s"""
+    fname = "conj_slice"
+    if not tables.has_table(fname):
+        import tablegen
+        print("creating " + fname + " table...")
+        tables.store_tables({fname: ('B', tablegen.slice_conj(*_group()))})
+    return load_table(fname, 'B', N_PERM_4 * N_SYM_D4h)
+
+
+_LOADERS = {
+    'symCube': _sym_cube,
+    'inv_idx': lambda: array.array('B', symdata.INV_IDX),
+    'mult_sym': lambda: array.array('B', symdata.MULT_SYM),
+    'conj_move': lambda: array.array('H', symdata.CONJ_MOVE),
+    'twist_conj': _twist_conj,
+    'ud_edges_conj': _ud_edges_conj,
+    'flipslice_classidx': lambda: tables.get('flipslice_tables')[0],
+    'flipslice_sym': lambda: tables.get('flipslice_tables')[1],
+    'flipslice_rep': lambda: tables.get('flipslice_tables')[2],
+    'flipslice_sym_move': _flipslice_sym_move,
+    'corner_classidx': lambda: tables.get('corner_tables')[0],
+    'corner_sym': lambda: tables.get('corner_tables')[1],
+    'corner_rep': lambda: tables.get('corner_tables')[2],
+    'ud_edges_classidx': lambda: tables.get('ud_edges_tables')[0],
+    'ud_edges_sym': lambda: tables.get('ud_edges_tables')[1],
+    'ud_edges_rep': lambda: tables.get('ud_edges_tables')[2],
+    'slice_conj': _slice_conj,
+}
+tables.register('flipslice_tables', _flipslice_tables)
+tables.register('corner_tables', _corner_tables)
+tables.register('ud_edges_tables', _ud_edges_tables)
+for _name, _loader in _LOADERS.items():
+    tables.register(_name, _loader)
+
+
+def __getattr__(name):
+    """Build or load a table of this module on first access."""
+    if name in _LOADERS:
+        table = tables.get(name)
+        globals()[name] = table  # later accesses are plain module attribute lookups
+        return table
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
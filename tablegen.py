@@ -0,0 +1,361 @@
+# ############### Vectorized generation of the symmetry tables. The cubes are NumPy permutation/orientation arrays. ####
+# Each function computes exactly the same table as the per-coordinate loops with RoughCube did, but conjugates all
+# coordinates of a range with one symmetry in a single pass.
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+import numpy as np
+from cube import ori_add
+from cubedefs import N_TWIST, N_FLIP, N_SLICE, N_CORNERS, N_UD_EDGES, N_SYM_D4h, N_FLIPSLICE_CLASS, N_CORNERS_CLASS, \
+    N_UD_EDGES_CLASS, N_PERM_4, N_MOVE, Move
+
+
+# The number of processes which build a table. Set by the --jobs option of main(), the loaders of symmetries.py pass
+# it to the table functions.
+JOBS = 1
+
+# ORI_ADD[ori_a, ori_b] is the orientation of a corner with orientation ori_a in a and ori_b in b after a*b
+ORI_ADD = np.array([[ori_add(a, b) for b in range(6)] for a in range(6)], dtype=np.int8)
+
+# binomial coefficients C(n, k) for n, k < 13
+C_NK = np.array([[comb(n, k) for k in range(13)] for n in range(13)], dtype=np.int64)
+
+
+def sym_arrays(sym_cube):
+    """Convert the list of the 48 symmetry cubes to the arrays (cp, co, ep, eo) with one row per symmetry."""
+    cp = np.array([[int(c) for c in s.cp] for s in sym_cube], dtype=np.int8)
+    co = np.array([[int(c) for c in s.co] for s in sym_cube], dtype=np.int8)
+    ep = np.array([[int(e) for e in s.ep] for s in sym_cube], dtype=np.int8)
+    eo = np.array([[int(e) for e in s.eo] for s in sym_cube], dtype=np.int8)
+    return cp, co, ep, eo
+
+
+# ################################ products s*x*t of a batch x with two fixed cubes s and t ###########################
+
+def conj_corners(s_cp, s_co, cp, co, t_cp, t_co):
+    """Return the corners of s*x*t for every cube x of the batch (cp, co)."""
+    cp1 = s_cp[cp]  # s*x
+    co1 = ORI_ADD[s_co[cp], co]
+    return cp1[:, t_cp], ORI_ADD[co1[:, t_cp], t_co]  # (s*x)*t
+
+
+def conj_edges(s_ep, s_eo, ep, eo, t_ep, t_eo):
+    """Return the edges of s*x*t for every cube x of the batch (ep, eo)."""
+    ep1 = s_ep[ep]  # s*x
+    eo1 = (eo + s_eo[ep]) % 2
+    return ep1[:, t_ep], (t_eo + eo1[:, t_ep]) % 2  # (s*x)*t
+
+
+# ################################ coordinates of a batch of cubes #####################################################
+
+def set_twist(twist):
+    twist = np.asarray(twist, dtype=np.int64)
+    co = np.zeros((len(twist), 8), dtype=np.int8)
+    for i in range(6, -1, -1):
+        co[:, i] = twist % 3
+        twist = twist // 3
+    co[:, 7] = (3 - co[:, :7].sum(axis=1) % 3) % 3
+    return co
+
+
+def get_twist(co):
+    return (co[:, :7].astype(np.int64) * 3 ** np.arange(6, -1, -1)).sum(axis=1)
+
+
+def set_flip(flip):
+    flip = np.asarray(flip, dtype=np.int64)
+    eo = np.zeros((len(flip), 12), dtype=np.int8)
+    for i in range(10, -1, -1):
+        eo[:, i] = flip % 2
+        flip = flip // 2
+    eo[:, 11] = eo[:, :11].sum(axis=1) % 2
+    return eo
+
+
+def get_flip(eo):
+    return (eo[:, :11].astype(np.int64) << np.arange(10, -1, -1)).sum(axis=1)
+
+
+def set_slice(idx):
+    """Edge permutations with the FR, FL, BL, BR edges at the positions given by the slice coordinate idx."""
+    a = np.array(idx, dtype=np.int64)
+    ep = np.full((len(a), 12), -1, dtype=np.int8)
+    x = np.full(len(a), 4)
+    for j in range(12):
+        c = C_NK[11 - j, x]
+        hit = a - c >= 0
+        ep[hit, j] = 12 - x[hit]  # slice_edge[4 - x] with slice_edge = [FR, FL, BL, BR]
+        a[hit] -= c[hit]
+        x[hit] -= 1
+    rest = ep == -1  # the remaining edges UR..DB in increasing order
+    ep[rest] = np.tile(np.arange(8, dtype=np.int8), len(a))
+    return ep
+
+
+def get_slice(ep):
+    a = np.zeros(len(ep), dtype=np.int64)
+    x = np.zeros(len(ep), dtype=np.int64)
+    for j in range(11, -1, -1):
+        hit = ep[:, j] >= 8
+        a[hit] += C_NK[11 - j, x[hit] + 1]
+        x[hit] += 1
+    return a
+
+
+def set_perm(idx, n):
+    """Permutations of 0..n-1 for the coordinates idx, as used for the corners and the ud_edges."""
+    idx = np.asarray(idx, dtype=np.int64)
+    perm = np.tile(np.arange(n, dtype=np.int8), (len(idx), 1))
+    rows = np.arange(len(idx))[:, None]
+    for j in range(n):
+        k = idx % (j + 1)
+        idx = idx // (j + 1)
+        perm[:, :j + 1] = perm[rows, (np.arange(j + 1) - k[:, None]) % (j + 1)]  # rotate right k times
+    return perm
+
+
+def get_perm(perm):
+    perm = perm.copy()
+    n = perm.shape[1]
+    rows = np.arange(len(perm))[:, None]
+    b = np.zeros(len(perm), dtype=np.int64)
+    for j in range(n - 1, 0, -1):
+        k = (np.argmax(perm[:, :j + 1] == j, axis=1) + 1) % (j + 1)  # left rotations until perm[j] == j
+        perm[:, :j + 1] = perm[rows, (np.arange(j + 1) + k[:, None]) % (j + 1)]
+        b = (j + 1) * b + k
+    return b
+
+
+# ################################ the tables ##########################################################################
+# Every table is computed in chunks of coordinates. With jobs > 1 the chunks are computed in a process pool, the
+# results are concatenated in the order of the chunks, so the tables do not depend on the number of jobs.
+
+def _map_chunks(func, sym_cube, inv_idx, chunks, jobs):
+    """Return [func(sym_cube, inv_idx, chunk) for chunk in chunks], computed in jobs processes if jobs > 1."""
+    if jobs <= 1:
+        return [func(sym_cube, inv_idx, chunk) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        n = len(chunks)
+        return list(pool.map(func, [sym_cube] * n, [inv_idx] * n, chunks))
+
+
+def _chunks(n, size):
+    return [np.arange(i, min(i + size, n)) for i in range(0, n, size)]
+
+
+def _twist_rows(sym_cube, inv_idx, twists):
+    s_cp, s_co, _, _ = sym_arrays(sym_cube)
+    cp = np.tile(np.arange(8, dtype=np.int8), (len(twists), 1))
+    co = set_twist(twists)
+    table = np.empty((len(twists), N_SYM_D4h), dtype=np.uint16)
+    for s in range(N_SYM_D4h):
+        si = inv_idx[s]
+        table[:, s] = get_twist(conj_corners(s_cp[s], s_co[s], cp, co, s_cp[si], s_co[si])[1])
+    return table
+
+
+def twist_conj(sym_cube, inv_idx, jobs=1):
+    """twist_conj[16 * t + s] = twist of s*t*s^-1."""
+    return np.concatenate(_map_chunks(_twist_rows, sym_cube, inv_idx, _chunks(N_TWIST, 243), jobs)).ravel()
+
+
+def _ud_edges_rows(sym_cube, inv_idx, ud_edges):
+    _, _, s_ep, s_eo = sym_arrays(sym_cube)
+    ep = np.concatenate((set_perm(ud_edges, 8), np.tile(np.arange(8, 12, dtype=np.int8), (len(ud_edges), 1))), axis=1)
+    eo = np.zeros((len(ud_edges), 12), dtype=np.int8)
+    table = np.empty((len(ud_edges), N_SYM_D4h), dtype=np.uint16)
+    for s in range(N_SYM_D4h):
+        si = inv_idx[s]
+        table[:, s] = get_perm(conj_edges(s_ep[s], s_eo[s], ep, eo, s_ep[si], s_eo[si])[0][:, :8])
+    return table
+
+
+def ud_edges_conj(sym_cube, inv_idx, jobs=1):
+    """ud_edges_conj[16 * t + s] = ud_edges coordinate of s*t*s^-1."""
+    return np.concatenate(_map_chunks(_ud_edges_rows, sym_cube, inv_idx, _chunks(N_UD_EDGES, 5040), jobs)).ravel()
+
+
+def rep_sym(conj, inv_idx):
+    """Compute rep[idx] and sym[idx] for the rows of conj[idx, s] = coordinate of s^-1*idx*s.
+    The representant rep of the class of idx is its smallest element and sym is the smallest s with s^-1*rep*s = idx,
+    that is rep = s*idx*s^-1 = conj[idx, s^-1]. So each row is computed from that row alone.
+    """
+    rep = conj.min(axis=1)
+    inv = np.array([inv_idx[s] for s in range(N_SYM_D4h)])
+    sym = np.argmax(conj[:, inv] == rep[:, None], axis=1).astype(np.uint8)
+    return rep, sym
+
+
+def sym_classes(rep, sym, n_class):
+    """Compute the classidx, sym and rep tables from rep and sym of all coordinates.
+    The result is the same as with the serial loop which visits the coordinates in increasing order: the classes are
+    numbered in the order of their representants.
+    """
+    reps = np.flatnonzero(rep == np.arange(len(rep)))
+    if len(reps) != n_class:
+        raise ValueError('found ' + str(len(reps)) + ' classes, expected ' + str(n_class))
+    classidx = np.searchsorted(reps, rep).astype(np.uint16)
+    return classidx, sym, reps
+
+
+def flipslice_conj(sym_cube, inv_idx, slices=None):
+    """conj[idx, s] = flipslice coordinate of s^-1*idx*s for idx = N_FLIP * slice + flip and the given slices."""
+    _, _, s_ep, s_eo = sym_arrays(sym_cube)
+    slices = np.arange(N_SLICE) if slices is None else np.asarray(slices)
+    ep = set_slice(slices)
+    eo = set_flip(np.arange(N_FLIP))
+    conj = np.empty((len(slices), N_FLIP, N_SYM_D4h), dtype=np.int32)
+    for s in range(N_SYM_D4h):
+        si = inv_idx[s]
+        # The edge orientations of s^-1*x*s are the permuted orientations of x xor the orientations s^-1*(slice)*s
+        # gets from the symmetries alone. The flip coordinate is linear in the orientations, so we can xor the flips.
+        ep_new, eo_sym = conj_edges(s_ep[si], s_eo[si], ep, np.zeros_like(ep), s_ep[s], s_eo[s])
+        flip_new = get_flip(eo[:, s_ep[s]])[None, :] ^ get_flip(eo_sym)[:, None]
+        conj[:, :, s] = N_FLIP * get_slice(ep_new)[:, None] + flip_new
+    return conj.reshape(-1, N_SYM_D4h)
+
+
+def _flipslice_rep_sym(sym_cube, inv_idx, slices):
+    return rep_sym(flipslice_conj(sym_cube, inv_idx, slices), inv_idx)
+
+
+def flipslice_tables(sym_cube, inv_idx, jobs=1):
+    """Return the tables flipslice_classidx, flipslice_sym and flipslice_rep."""
+    parts = _map_chunks(_flipslice_rep_sym, sym_cube, inv_idx, _chunks(N_SLICE, 33), jobs)
+    classidx, sym, reps = sym_classes(np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]),
+                                      N_FLIPSLICE_CLASS)
+    return classidx, sym, reps.astype(np.uint32)
+
+
+def flipslice_sym_move(classidx, sym, rep):
+    """Return the move table of the flipslice classes, flipslice_sym_move[N_MOVE * c + m] = 16 * c' + s, where
+    rep[c] * m = s^-1 * rep[c'] * s. The arguments are the tables of flipslice_tables()."""
+    from cube import moveCube
+    classidx = np.asarray(classidx)
+    sym = np.asarray(sym)
+    rep = np.asarray(rep, dtype=np.int64)
+    ep = set_slice(rep // N_FLIP)
+    eo = set_flip(rep % N_FLIP)
+    table = np.empty((len(rep), N_MOVE), dtype=np.uint32)
+    for m in range(N_MOVE):
+        e = np.frombuffer(moveCube[m].edges, dtype=np.int8)
+        m_ep, m_eo = e & 15, e >> 4
+        flipslice = N_FLIP * get_slice(ep[:, m_ep]) + get_flip((eo[:, m_ep] + m_eo) % 2)  # rep*m
+        table[:, m] = classidx[flipslice].astype(np.uint32) << 4 | sym[flipslice]
+    return table.ravel()
+
+
+def corner_conj(sym_cube, inv_idx, corners=None):
+    """conj[cp, s] = corners coordinate of s^-1*cp*s for the given corner coordinates."""
+    s_cp, s_co, _, _ = sym_arrays(sym_cube)
+    corners = np.arange(N_CORNERS) if corners is None else np.asarray(corners)
+    cp = set_perm(corners, 8)
+    co = np.zeros((len(cp), 8), dtype=np.int8)
+    conj = np.empty((len(cp), N_SYM_D4h), dtype=np.int32)
+    for s in range(N_SYM_D4h):
+        si = inv_idx[s]
+        conj[:, s] = get_perm(conj_corners(s_cp[si], s_co[si], cp, co, s_cp[s], s_co[s])[0])
+    return conj
+
+
+def _corner_rep_sym(sym_cube, inv_idx, corners):
+    return rep_sym(corner_conj(sym_cube, inv_idx, corners), inv_idx)
+
+
+def corner_tables(sym_cube, inv_idx, jobs=1):
+    """Return the tables corner_classidx, corner_sym and corner_rep."""
+    parts = _map_chunks(_corner_rep_sym, sym_cube, inv_idx, _chunks(N_CORNERS, 5040), jobs)
+    classidx, sym, reps = sym_classes(np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]),
+                                      N_CORNERS_CLASS)
+    return classidx, sym, reps.astype(np.uint16)
+
+
+def _ud_edges_rep_sym(sym_cube, inv_idx, ud_edges):
+    inv = [inv_idx[s] for s in range(N_SYM_D4h)]
+    return rep_sym(_ud_edges_rows(sym_cube, inv_idx, ud_edges)[:, inv], inv_idx)  # column s is s^-1*t*s
+
+
+def ud_edges_tables(sym_cube, inv_idx, jobs=1):
+    """Return the tables ud_edges_classidx, ud_edges_sym and ud_edges_rep."""
+    parts = _map_chunks(_ud_edges_rep_sym, sym_cube, inv_idx, _chunks(N_UD_EDGES, 5040), jobs)
+    classidx, sym, reps = sym_classes(np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]),
+                                      N_UD_EDGES_CLASS)
+    return classidx, sym, reps.astype(np.uint16)
+
+
+def _slice_edges(slices):
+    """Edge permutations of phase 2 with the permutations slices of the FR, FL, BL, BR edges in the slice."""
+    ud = np.tile(np.arange(8, dtype=np.int8), (len(slices), 1))
+    return np.concatenate((ud, set_perm(slices, 4) + 8), axis=1)
+
+
+def slice_conj(sym_cube, inv_idx):
+    """slice_conj[16 * t + s] = slice_sorted coordinate of s*t*s^-1 for the phase 2 slice_sorted coordinates t < 24.
+    The symmetries of D4h map the slice to itself, so the result does not depend on the other edges."""
+    _, _, s_ep, s_eo = sym_arrays(sym_cube)
+    ep = _slice_edges(np.arange(N_PERM_4))
+    eo = np.zeros_like(ep)
+    table = np.empty((N_PERM_4, N_SYM_D4h), dtype=np.uint8)
+    for s in range(N_SYM_D4h):
+        si = inv_idx[s]
+        table[:, s] = get_perm(conj_edges(s_ep[s], s_eo[s], ep, eo, s_ep[si], s_eo[si])[0][:, 8:] - 8)
+    return table.ravel()
+
+
+_PHASE2_MOVES = (Move.U1, Move.U2, Move.U3, Move.R2, Move.F2, Move.D1, Move.D2, Move.D3, Move.L2, Move.B2)
+
+
+def edges_depth3(ud_edges_rep):
+    """Return the phase 2 pruning table for the edges, the distance mod 3 of 24 * classidx + slice_sorted for the
+    ud_edges classes with the representants ud_edges_rep, packed with 2 bits per entry. Entry ix is
+    (table[ix >> 2] >> 2 * (ix & 3)) & 3. The distances come from a breadth first search over all 8! * 4! edge
+    permutations of phase 2. They do not change under conjugation with D4h, which maps phase 2 moves to phase 2 moves.
+    """
+    from cube import moveCube
+    ud = set_perm(np.arange(N_UD_EDGES), 8)
+    sl = set_perm(np.arange(N_PERM_4), 4)
+    ud_move = np.empty((N_UD_EDGES, len(_PHASE2_MOVES)), dtype=np.int64)
+    sl_move = np.empty((N_PERM_4, len(_PHASE2_MOVES)), dtype=np.int64)
+    for k, m in enumerate(_PHASE2_MOVES):
+        m_ep = np.frombuffer(moveCube[m].edges, dtype=np.int8) & 15  # phase 2 moves keep the slice edges in the slice
+        ud_move[:, k] = get_perm(ud[:, m_ep[:8]])
+        sl_move[:, k] = get_perm(sl[:, m_ep[8:] - 8])
+
+    depth = np.full(N_UD_EDGES * N_PERM_4, -1, dtype=np.int8)
+    depth[0] = 0
+    frontier = np.zeros(1, dtype=np.int64)
+    d = 0
+    while len(frontier) > 0:
+        d += 1
+        nxt = (N_PERM_4 * ud_move[frontier // N_PERM_4] + sl_move[frontier % N_PERM_4]).ravel()
+        frontier = np.unique(nxt[depth[nxt] < 0])
+        depth[frontier] = d
+
+    entries = (depth.reshape(N_UD_EDGES, N_PERM_4)[np.asarray(ud_edges_rep, dtype=np.int64)].ravel() % 3)
+    entries = np.concatenate((entries, np.zeros(-len(entries) % 4, dtype=entries.dtype))).astype(np.uint8)
+    entries = entries.reshape(-1, 4)
+    return entries[:, 0] | entries[:, 1] << 2 | entries[:, 2] << 4 | entries[:, 3] << 6
+
+
+def main(argv=None):
+    """Build all tables of the symmetries module which are not in the table bundle yet, then check the bundle."""
+    parser = argparse.ArgumentParser(description='Build the table bundle of the two-phase solver.')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='number of worker processes')
+    args = parser.parse_args(argv)
+    import tablegen  # the loaders read tablegen.JOBS, which is not this module if it runs as a script
+    tablegen.JOBS = args.jobs
+    import symmetries  # noqa: F401 - registers the tables
+    import phase2prun  # noqa: F401
+    import tables
+    tables.preload()
+    for name, seconds in tables.load_times.items():
+        print(name + ': ' + format(seconds, '.2f') + ' s')
+    corrupt = tables.verify_bundle()
+    if corrupt:
+        raise SystemExit('corrupt tables in ' + tables.BUNDLE + ': ' + ', '.join(corrupt))
+    print(tables.BUNDLE + ' is complete')
+
+
+if __name__ == '__main__':
+    main()
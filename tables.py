@@ -0,0 +1,206 @@
+# ################################ Loading of the precomputed tables from the table bundle ###########################
+import array
+import json
+import mmap
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from os import path
+from cubedefs import FOLDER
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# The table registry. A table is built or loaded by its loader the first time it is requested with get().
+_loaders = {}  # name -> function which builds or loads the table
+_tables = {}  # name -> table
+_lock = threading.RLock()  # loaders may request other tables
+load_times = {}  # name -> seconds the loader took, to measure the start-up of the solver per table
+
+
+def register(name, loader):
+    """Register the function loader which builds or loads the table name."""
+    _loaders[name] = loader
+
+
+def get(name):
+    """Return the table name. It is built or loaded on the first call."""
+    try:
+        return _tables[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _tables:
+            t = time.perf_counter()
+            _tables[name] = _loaders[name]()
+            load_times[name] = time.perf_counter() - t
+        return _tables[name]
+
+
+def preload(names=None, exclude=()):
+    """Build or load the given tables, default are all registered tables except those in exclude."""
+    for name in list(_loaders) if names is None else names:
+        if name not in exclude:
+            get(name)
+
+
+# ################################ The table bundle ####################################################################
+# All generated tables are stored in the single file BUNDLE. Layout:
+#   8 bytes   magic b'TWOPHASE'
+#   4 bytes   length of the header, unsigned little endian
+#   header    JSON: {"version": 1, "byteorder": "little", "tables": {name: {"offset", "typecode", "itemsize", "n",
+#             "crc32"}}}, offsets relative to the start of the file and aligned to 8 bytes
+#   data      the raw tables in native byte order
+# The bundle is always written completely to a temporary file which then replaces the old bundle, so a killed build
+# never leaves a partial bundle behind. Processes which build tables at the same time take turns with the lock file
+# BUNDLE + '.lock', and each of them adds its tables to the newest bundle. The CRC-32 of all tables is checked by
+# verify_bundle() after a build, see tablegen.main(). Reading a table for its checksum faults in all of its pages, so
+# load_table() checks it only if VERIFY_ON_LOAD is set.
+BUNDLE = path.join(FOLDER, 'tables.bundle')
+BUNDLE_VERSION = 1
+VERIFY_ON_LOAD = False
+_MAGIC = b'TWOPHASE'
+_bundle = None  # (header tables dict, mmap) of the open bundle or None
+
+
+def _open_bundle():
+    """Return the table dictionary of the header and the mapping of the bundle. Empty if there is no bundle."""
+    global _bundle
+    if _bundle is None:
+        if not path.isfile(BUNDLE):
+            return {}, None
+        with open(BUNDLE, 'rb') as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)  # the mapping stays valid after closing the file
+        if mm[:8] != _MAGIC:
+            raise ValueError(BUNDLE + ' is not a table bundle')
+        size = int.from_bytes(mm[8:12], 'little')
+        header = json.loads(mm[12:12 + size].decode('ascii'))
+        if header['version'] != BUNDLE_VERSION:
+            raise ValueError(BUNDLE + ' has version ' + str(header['version']) + ', expected ' + str(BUNDLE_VERSION)
+                             + '. Delete it to rebuild the tables.')
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(BUNDLE + ' was built on a ' + header['byteorder'] + ' endian machine')
+        for name, t in header['tables'].items():
+            if t['offset'] + t['itemsize'] * t['n'] > len(mm):
+                raise ValueError(BUNDLE + ' is truncated in table ' + name)
+        _bundle = header['tables'], mm
+    return _bundle
+
+
+@contextmanager
+def _locked_folder():
+    """Hold the lock file of the table folder, which serializes the writers of all processes."""
+    if not path.exists(FOLDER):
+        os.makedirs(FOLDER, exist_ok=True)
+        print('All tables are stored in ' + path.abspath(BUNDLE))
+    with open(BUNDLE + '.lock', 'a+b') as fh:
+        fh.seek(0)  # msvcrt locks the bytes after the current position
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)  # retries for 10 seconds before it fails
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is None:  # flock is released when the file is closed
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def has_table(name):
+    """Return True if the table name is in the bundle."""
+    with _lock:
+        return name in _open_bundle()[0]
+
+
+def store_tables(new_tables):
+    """Add tables to the bundle. The bundle is rewritten atomically with the old and the new tables.
+    :param new_tables: A dictionary name -> (typecode, table). A table is an array.array, a NumPy array or anything
+     else which supports the buffer protocol with the item size of typecode.
+    """
+    global _bundle
+    with _lock, _locked_folder():
+        _bundle = None  # another process may have replaced the bundle since it was opened
+        entries, mm = _open_bundle()
+        data = {name: (t['typecode'], mm[t['offset']:t['offset'] + t['itemsize'] * t['n']])
+                for name, t in entries.items() if name not in new_tables}
+        for name, (typecode, table) in new_tables.items():
+            data[name] = (typecode, memoryview(table).cast('B'))
+        header = {'version': BUNDLE_VERSION, 'byteorder': sys.byteorder, 'tables': {}}
+        rel_offsets = {}  # offsets relative to the first table
+        offset = 0
+        for name, (typecode, raw) in data.items():
+            itemsize = array.array(typecode).itemsize
+            header['tables'][name] = {'offset': 0, 'typecode': typecode, 'itemsize': itemsize,
+                                      'n': len(raw) // itemsize, 'crc32': zlib.crc32(raw)}
+            rel_offsets[name] = offset
+            offset += (len(raw) + 7) // 8 * 8
+        start = 0  # the position of the first table depends on the length of the header with the offsets
+        while True:
+            for name, t in header['tables'].items():
+                t['offset'] = start + rel_offsets[name]
+            text = json.dumps(header).encode('ascii')
+            if (12 + len(text) + 7) // 8 * 8 <= start:
+                break
+            start = (12 + len(text) + 7) // 8 * 8
+        text += b' ' * (start - 12 - len(text))  # pad the header up to the first table
+
+        fd, tmp = tempfile.mkstemp(dir=FOLDER, prefix='.tables.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(_MAGIC + len(text).to_bytes(4, 'little') + text)
+                for name, (typecode, raw) in data.items():
+                    fh.seek(header['tables'][name]['offset'])
+                    fh.write(raw)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.chmod(tmp, 0o644)  # mkstemp creates the file readable by the owner only
+            os.replace(tmp, BUNDLE)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        _bundle = None  # the tables loaded so far keep the mapping of the old file
+
+
+def load_table(name, typecode, n):
+    """Map a table of the bundle read-only and return a typed view with n entries.
+    All processes which map the bundle share one copy in the page cache, and only the pages which are accessed are
+    read from disk. With VERIFY_ON_LOAD, the whole table is read once for its checksum.
+    :param name: The name of the table in the bundle
+    :param typecode: The array typecode the table was stored with, for example 'H' or 'B'
+    :param n: The number of entries of the table
+    """
+    global _bundle
+    with _lock:
+        entries, mm = _open_bundle()
+        if name not in entries:  # the table may have been stored by another process since the bundle was opened
+            _bundle = None
+            entries, mm = _open_bundle()
+    if name not in entries:
+        raise KeyError('table ' + name + ' is not in ' + BUNDLE)
+    t = entries[name]
+    if t['itemsize'] != array.array(typecode).itemsize or t['n'] < n:
+        raise ValueError('table ' + name + ' has ' + str(t['n']) + ' entries of ' + str(t['itemsize']) + ' bytes, '
+                         'expected ' + str(n) + ' entries of type ' + typecode)
+    raw = memoryview(mm)[t['offset']:t['offset'] + t['itemsize'] * t['n']]  # read-only because of ACCESS_READ
+    if VERIFY_ON_LOAD and zlib.crc32(raw) != t['crc32']:
+        raise ValueError('table ' + name + ' in ' + BUNDLE + ' is corrupt. Delete the bundle to rebuild the tables.')
+    return raw.cast(typecode)[:n]
+
+
+def verify_bundle():
+    """Check the checksums of all tables of the bundle. Return the names of the corrupt tables."""
+    with _lock:
+        entries, mm = _open_bundle()
+    return [name for name, t in entries.items()
+            if zlib.crc32(memoryview(mm)[t['offset']:t['offset'] + t['itemsize'] * t['n']]) != t['crc32']]
@@ -0,0 +1,17 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tables  # noqa: E402
+
+
+@pytest.fixture(scope='session', autouse=True)
+def table_folder(tmp_path_factory):
+    """Build the tables the tests need in a temporary folder instead of the folder of the solver."""
+    folder = str(tmp_path_factory.mktemp('twophase'))
+    saved = tables.FOLDER, tables.BUNDLE, tables._bundle
+    tables.FOLDER, tables.BUNDLE, tables._bundle = folder, os.path.join(folder, 'tables.bundle'), None
+    yield folder
+    tables.FOLDER, tables.BUNDLE, tables._bundle = saved
@@ -0,0 +1,128 @@
+# ################ The symmetry-canonical solution cache of cache.py ###################################################
+import multiprocessing as mp
+import random
+import pytest
+import symmetries as sy
+from cache import SolutionCache, canonical, from_canonical, to_canonical
+from cube import RoughCube, moveCube
+from cubedefs import Move, N_MOVE, N_SYM
+
+
+def _apply(cube, maneuver):
+    """Return a copy of the cube with the maneuver applied."""
+    cube = cube.copy()
+    for m in maneuver:
+        cube.multiply(moveCube[m])
+    return cube
+
+
+def _inverse(maneuver):
+    return [Move((m // 3) * 3 + 2 - m % 3) for m in reversed(maneuver)]
+
+
+def _conjugate(cube, s):
+    """symCube[s] * cube * symCube[s]^-1"""
+    x = sy.symCube[s].copy()
+    x.multiply(cube)
+    x.multiply(sy.symCube[sy.inv_idx[s]])
+    return x
+
+
+def _scramble(seed, length=12):
+    """A random maneuver and the cube it generates."""
+    rng = random.Random(seed)
+    maneuver = [Move(rng.randrange(N_MOVE)) for _ in range(length)]
+    return maneuver, _apply(RoughCube(), maneuver)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_canonical_is_a_class_invariant(seed):
+    maneuver, cube = _scramble(seed)
+    key, s, inverted = canonical(cube)
+    rep = _conjugate(cube, s)
+    if inverted:
+        inv = RoughCube()
+        rep.inv_rough_cube(inv)
+        rep = inv
+    assert bytes(rep.corners + rep.edges) == key
+    inv = RoughCube()
+    cube.inv_rough_cube(inv)
+    for t in (0, 5, 17, 47):
+        assert canonical(_conjugate(cube, t))[0] == key
+        assert canonical(_conjugate(inv, t))[0] == key
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_frame_mapping(seed):
+    maneuver, cube = _scramble(seed)
+    solution = _inverse(maneuver)
+    for s in range(N_SYM):
+        for inverted in (False, True):
+            assert from_canonical(to_canonical(solution, s, inverted), s, inverted) == solution
+    key, s, inverted = canonical(cube)
+    rep = RoughCube()
+    rep.corners[:], rep.edges[:] = key[:8], key[8:]
+    assert _apply(rep, to_canonical(solution, s, inverted)) == RoughCube()
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_lookup_of_symmetric_and_inverse_cubes(seed):
+    maneuver, cube = _scramble(seed)
+    cache = SolutionCache()
+    cache.store(cube, _inverse(maneuver))
+    inv = RoughCube()
+    cube.inv_rough_cube(inv)
+    for t in (0, 3, 16, 33):
+        for other in (_conjugate(cube, t), _conjugate(inv, t)):
+            solution = cache.lookup(other)
+            assert len(solution) == len(maneuver)
+            assert _apply(other, solution) == RoughCube()
+    assert cache.stats() == {'hits': 8, 'misses': 0, 'size': 1}
+
+
+def test_lru_and_length_limit(tmp_path):
+    cubes = [_scramble(seed) for seed in range(3)]
+    cache = SolutionCache(maxsize=2)
+    for maneuver, cube in cubes:
+        cache.store(cube, _inverse(maneuver))
+    assert len(cache) == 2
+    assert cache.lookup(cubes[0][1]) is None  # evicted
+    assert cache.lookup(cubes[2][1], max_length=11) is None
+    assert cache.lookup(cubes[2][1]) is not None
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'size': 2}
+
+    maneuver, cube = cubes[0]
+    path = str(tmp_path / 'solutions')
+    cache = SolutionCache(path=path)
+    cache.store(cube, _inverse(maneuver) + [Move.R1, Move.R3])
+    cache.store(cube, _inverse(maneuver))
+    cache.store(cube, _inverse(maneuver) + [Move.U2, Move.U2])  # a longer maneuver does not replace a shorter one
+    cache.close()
+    cache = SolutionCache(path=path)
+    assert _apply(cube, cache.lookup(cube)) == RoughCube()
+    assert len(cache.lookup(cube)) == len(maneuver)
+    cache.close()
+
+
+def _store_in_child(cache, cubes):
+    for maneuver, cube in cubes:
+        cache.store(cube, _inverse(maneuver))
+        assert cache.lookup(cube) is not None
+
+
+def test_forked_children_do_not_write_the_database(tmp_path):
+    """The workers of solve_many are forked with the cache, only the parent writes the database."""
+    cubes = [_scramble(seed) for seed in range(4)]
+    path = str(tmp_path / 'solutions')
+    cache = SolutionCache(path=path)
+    cache.store(cubes[0][1], _inverse(cubes[0][0]))
+    files = {p: p.read_bytes() for p in tmp_path.iterdir()}
+    child = mp.get_context('fork').Process(target=_store_in_child, args=(cache, cubes[1:3]))
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+    assert {p: p.read_bytes() for p in tmp_path.iterdir()} == files
+    cache.store(cubes[3][1], _inverse(cubes[3][0]))
+    cache.close()
+    cache = SolutionCache(path=path)
+    assert [cache.lookup(cube) is not None for _, cube in cubes] == [True, False, False, True]
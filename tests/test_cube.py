@@ -0,0 +1,113 @@
+# ################ The bulk facelet parser and the symmetries of RoughCube in cube.py ##################################
+import random
+import pytest
+import symmetries as sy
+from cube import FaceCube, RoughCube, moveCube, parse_cube, parse_cubes
+from cubedefs import Corner as C, Edge as E, CubeError, Facelet as F, Move, N_MOVE, N_SYM
+
+SOLVED = 'UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB'
+
+
+def _scrambled():
+    """A cube after the maneuver R U F' D2 L B'."""
+    cube = RoughCube()
+    for m in (Move.R1, Move.U1, Move.F3, Move.D2, Move.L1, Move.B3):
+        cube.multiply(moveCube[m])
+    return cube
+
+
+def _facelets(cube):
+    return FaceCube.from_roughcube(cube).to_string()
+
+
+def _swap(s, i, j):
+    """Swap the facelets i and j of the cube definition string s."""
+    t = list(s)
+    t[i], t[j] = t[j], t[i]
+    return ''.join(t)
+
+
+def test_parse_cube_decodes_the_cube():
+    cube = _scrambled()
+    error, parsed = parse_cube(_facelets(cube))
+    assert error == CubeError.OK
+    assert parsed == cube
+    assert parse_cube(_facelets(cube).encode()) == (CubeError.OK, cube)
+
+
+def test_parse_cube_scanner_colors():
+    cube = _scrambled()
+    colors = _facelets(cube).translate(str.maketrans('URFDLB', 'YRBWOG'))
+    assert parse_cube(colors, colors=True) == (CubeError.OK, cube)
+    assert parse_cube(colors)[0] == CubeError.CHARACTER
+
+
+@pytest.mark.parametrize('record, error', [
+    (SOLVED[:53], CubeError.LENGTH),
+    (SOLVED + 'U', CubeError.LENGTH),
+    ('X' + SOLVED[1:], CubeError.CHARACTER),
+    ('R' + SOLVED[1:], CubeError.COLOR_COUNT),
+    (_swap(SOLVED, F.U5, F.R5), CubeError.CENTERS),
+    (_swap(SOLVED, F.U9, F.R1), CubeError.CORNER),  # the colors of URF in the wrong cyclic order
+    (_swap(SOLVED, F.U8, F.F8), CubeError.EDGE),
+    (_facelets(RoughCube(cp=[C.URF, C.URF, C.ULB, C.ULB, C.DFR, C.DLF, C.DBL, C.DRB])), CubeError.CORNER_DUPLICATE),
+    (_facelets(RoughCube(ep=[E.UR, E.UR, E.UL, E.UB, E.DF, E.DF, E.DL, E.DB, E.FR, E.FL, E.BL, E.BR])),
+     CubeError.EDGE_DUPLICATE),
+    (_facelets(RoughCube(co=[1, 0, 0, 0, 0, 0, 0, 0])), CubeError.TWIST),
+    (_facelets(RoughCube(eo=[1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])), CubeError.FLIP),
+    (_facelets(RoughCube(cp=[C.UFL, C.URF, C.ULB, C.UBR, C.DFR, C.DLF, C.DBL, C.DRB])), CubeError.PARITY),
+])
+def test_parse_cube_error_codes(record, error):
+    assert parse_cube(record) == (error, None)
+
+
+def test_parse_cubes_stride():
+    cube = _scrambled()
+    data = (SOLVED + '\n' + _facelets(cube) + '\n' + SOLVED[:20]).encode()
+    results = parse_cubes(data, stride=55)
+    assert results == [(CubeError.OK, RoughCube()), (CubeError.OK, cube), (CubeError.LENGTH, None)]
+
+
+def _brute_force_symmetries(cube):
+    """The symmetries j with S_j * cube * S_j^-1 == cube and j + 48 for those with S_j * cube * S_j^-1 == cube^-1."""
+    inv = RoughCube()
+    cube.inv_rough_cube(inv)
+    s = []
+    for j in range(N_SYM):
+        x = sy.symCube[j].copy()
+        x.multiply(cube)
+        x.multiply(sy.symCube[sy.inv_idx[j]])
+        if x == cube:
+            s.append(j)
+        if x == inv:
+            s.append(j + N_SYM)
+    return s
+
+
+def _symmetry_test_cubes():
+    superflip = RoughCube(eo=[1] * 12)
+    checkerboard = RoughCube()
+    for m in (Move.U2, Move.D2, Move.F2, Move.B2, Move.L2, Move.R2):
+        checkerboard.multiply(moveCube[m])
+    cubes = [RoughCube(), superflip, checkerboard, moveCube[Move.U1], moveCube[Move.R2]]
+    rng = random.Random(0)
+    for n in (2, 3, 20, 20, 20):  # short maneuvers often have symmetries or antisymmetries
+        cube = RoughCube()
+        for _ in range(n):
+            cube.multiply(moveCube[rng.randrange(N_MOVE)])
+        cubes.append(cube)
+    for _ in range(5):  # cubes which are not solvable
+        cubes.append(RoughCube(rng.sample(range(8), 8), [rng.randrange(3) for _ in range(8)], rng.sample(range(12), 12),
+                               [rng.randrange(2) for _ in range(12)]))
+    return cubes
+
+
+def test_symmetries_match_the_conjugation():
+    found = []
+    for cube in _symmetry_test_cubes():
+        s = cube.symmetries(sy.symCube, sy.inv_idx)
+        assert s == _brute_force_symmetries(cube)
+        found.append(s)
+    assert found[0] == [j for i in range(N_SYM) for j in (i, i + N_SYM)]  # the solved cube is its own inverse
+    assert len(found[1]) == len(found[2]) == 2 * N_SYM
+    assert any(j >= N_SYM for j in found[3]) and not all(j >= N_SYM for j in found[3])  # U is mirrored to U'
@@ -0,0 +1,126 @@
+# ################ CubeBatch of cubebatch.py against RoughCube, cube by cube ###########################################
+import numpy as np
+import pytest
+import symmetries as sy
+from cube import FaceCube, RoughCube, moveCube
+from cubebatch import CubeBatch
+from cubedefs import Move
+
+N = 50
+
+
+def _random_cubes(seed, n=N):
+    """n cubes with random permutations and orientations, most of them are not solvable."""
+    rng = np.random.default_rng(seed)
+    return [RoughCube(rng.permutation(8).tolist(), rng.integers(3, size=8).tolist(), rng.permutation(12).tolist(),
+                      rng.integers(2, size=12).tolist()) for _ in range(n)]
+
+
+def _scrambled_cubes(seed, n=N):
+    """n solvable cubes made with random maneuvers."""
+    rng = np.random.default_rng(seed)
+    cubes = []
+    for _ in range(n):
+        cube = RoughCube()
+        for m in rng.integers(len(Move), size=20):
+            cube.multiply(moveCube[m])
+        cubes.append(cube)
+    return cubes
+
+
+def _symmetric_cubes():
+    """The solved cube, the superflip, the checkerboard and a cube with only a few symmetries."""
+    superflip = RoughCube(eo=[1] * 12)
+    checkerboard = RoughCube()
+    for m in (Move.U2, Move.D2, Move.F2, Move.B2, Move.L2, Move.R2):
+        checkerboard.multiply(moveCube[m])
+    u = moveCube[Move.U1].copy()
+    return [RoughCube(), superflip, checkerboard, u]
+
+
+def test_round_trip():
+    cubes = _random_cubes(0)
+    batch = CubeBatch.from_roughcubes(cubes)
+    assert len(batch) == N
+    assert batch.to_roughcubes() == cubes
+    assert batch[7] == cubes[7]
+    assert batch[3:5].to_roughcubes() == cubes[3:5]
+    assert batch.copy().to_roughcubes() == cubes
+    assert CubeBatch.identity(3).to_roughcubes() == [RoughCube()] * 3
+
+
+def test_multiply():
+    a, b = _random_cubes(1), _random_cubes(2)
+    batch = CubeBatch.from_roughcubes(a)
+    batch.multiply(CubeBatch.from_roughcubes(b))
+    expected = []
+    for x, y in zip(a, b):
+        x = x.copy()
+        x.multiply(y)
+        expected.append(x)
+    assert batch.to_roughcubes() == expected
+
+    batch = CubeBatch.from_roughcubes(a)
+    batch.multiply(moveCube[Move.F3])  # a single cube broadcasts against the batch
+    for x, y in zip(a, batch.to_roughcubes()):
+        x = x.copy()
+        x.multiply(moveCube[Move.F3])
+        assert x == y
+
+
+def test_inverse():
+    cubes = _random_cubes(3)
+    batch = CubeBatch.from_roughcubes(cubes)
+    inv = batch.inv_rough_cube()
+    for cube, y in zip(cubes, inv.to_roughcubes()):
+        x = RoughCube()
+        cube.inv_rough_cube(x)
+        assert x == y
+    other = CubeBatch.identity(N)
+    assert batch.inv_rough_cube(other) is other and (other == inv).all()
+    batch.multiply(inv)
+    assert (batch == CubeBatch.identity(N)).all()
+
+
+def test_parity_twist_and_verify():
+    cubes = _random_cubes(4) + _scrambled_cubes(5)
+    batch = CubeBatch.from_roughcubes(cubes)
+    assert batch.corner_parity().tolist() == [c.corner_parity() for c in cubes]
+    assert batch.edge_parity().tolist() == [c.edge_parity() for c in cubes]
+    assert batch.get_twist().tolist() == [c.get_twist() for c in cubes]
+    assert batch.verify().tolist() == [sum(c.co) % 3 == 0 and sum(c.eo) % 2 == 0
+                                       and c.corner_parity() == c.edge_parity() for c in cubes]
+    assert batch.verify()[N:].all()
+
+    twists = batch.get_twist()
+    batch = CubeBatch.identity(N)
+    batch.set_twist(twists)
+    for twist, y in zip(twists, batch.to_roughcubes()):
+        x = RoughCube()
+        x.set_twist(int(twist))
+        assert x.co == y.co
+
+
+def test_symmetries():
+    cubes = _symmetric_cubes() + _scrambled_cubes(6, 10)
+    found = CubeBatch.from_roughcubes(cubes).symmetries(sy.symCube, sy.inv_idx)
+    for cube, row in zip(cubes, found):
+        assert np.flatnonzero(row).tolist() == sorted(cube.symmetries(sy.symCube, sy.inv_idx))
+    assert found[0].all()
+
+
+def test_strings():
+    cubes = _scrambled_cubes(7)
+    strings = CubeBatch.from_roughcubes(cubes).to_strings()
+    assert strings == [FaceCube.from_roughcube(c).to_string() for c in cubes]
+    assert CubeBatch.from_strings(strings).to_roughcubes() == cubes
+
+
+@pytest.mark.parametrize('strings', [
+    ['UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBB'],  # 53 facelets
+    ['XUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB'],
+    ['UUUUUUUUFRRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB'],  # a corner with two F facelets
+])
+def test_from_strings_errors(strings):
+    with pytest.raises(ValueError):
+        CubeBatch.from_strings(strings)
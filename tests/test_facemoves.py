@@ -0,0 +1,71 @@
+# ################ The facelet level moves of facemoves.py #############################################################
+import random
+import numpy as np
+import pytest
+import facemoves as fm
+from cube import FaceCube, RoughCube, moveCube
+from cubedefs import Move, N_MOVE
+
+SOLVED = 'UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB'
+
+
+def _maneuver(seed, length=15):
+    rng = random.Random(seed)
+    return [Move(rng.randrange(N_MOVE)) for _ in range(length)]
+
+
+def _facelets(maneuver):
+    """The cube definition string after the maneuver, computed on the cubie level."""
+    cube = RoughCube()
+    for m in maneuver:
+        cube.multiply(moveCube[m])
+    return FaceCube.from_roughcube(cube).to_string()
+
+
+def test_single_moves():
+    for m in Move:
+        assert fm.apply_move(SOLVED, m) == _facelets([m])
+        assert fm.apply_maneuver(fm.apply_move(SOLVED, m), [m, m, m]) == SOLVED  # m^4 is the identity
+        assert fm.apply_maneuver(SOLVED, [m, Move(m // 3 * 3 + 2 - m % 3)]) == SOLVED
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_maneuvers_match_the_cubie_level(seed):
+    maneuver = _maneuver(seed)
+    state = _facelets(maneuver)
+    assert fm.apply_maneuver(SOLVED, maneuver) == state
+    assert fm.apply_maneuver(SOLVED.encode(), maneuver) == state.encode()
+    assert list(fm.iter_states(SOLVED, maneuver)) == [_facelets(maneuver[:i + 1]) for i in range(len(maneuver))]
+    perm = fm.maneuver_permutation(maneuver)
+    assert ''.join(SOLVED[i] for i in perm) == state
+
+
+def test_parse_maneuver():
+    assert fm.parse_maneuver("R1 U2 F3 (3f)") == [Move.R1, Move.U2, Move.F3]
+    assert fm.parse_maneuver("R U2 F'") == [Move.R1, Move.U2, Move.F3]
+    assert fm.parse_maneuver((Move.D1, Move.B2)) == [Move.D1, Move.B2]
+    assert fm.parse_maneuver('') == []
+    with pytest.raises(ValueError):
+        fm.parse_maneuver('R1 X2')
+
+
+def test_batch():
+    maneuver = _maneuver(7, 5)
+    states = np.array([list(SOLVED.encode()), list(_facelets(_maneuver(8)).encode())], dtype=np.uint8)
+    expected = [[list(fm.apply_maneuver(bytes(row), maneuver[:i + 1])) for row in states] for i in range(5)]
+    assert fm.apply_maneuver_batch(states, maneuver).tolist() == expected[-1]
+    assert fm.apply_maneuver_batch(states, maneuver, intermediate=True).tolist() == expected
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_verify_solution(seed):
+    maneuver = _maneuver(seed)
+    state = _facelets(maneuver)
+    solution = [Move(m // 3 * 3 + 2 - m % 3) for m in reversed(maneuver)]
+    text = ' '.join(m.name for m in solution) + ' (' + str(len(solution)) + 'f)'
+    assert fm.verify_solution(state, solution)
+    assert fm.verify_solution(state.encode(), text)
+    assert not fm.verify_solution(state, solution[:-1])
+    assert not fm.verify_solution(state, text.replace(' ', ' X1 ', 1))  # an invalid move
+    assert not fm.verify_solution(state[:53], solution)
+    assert fm.verify_solutions([state, SOLVED, state], [solution, '', solution[1:]]) == [True, True, False]
@@ -0,0 +1,41 @@
+# ################ The phase 2 pruning table of the edges of phase2prun.py #############################################
+# The table is checked against a breadth first search over the permutations of the 12 edges, as tuples of edges, up
+# to MAX_DEPTH moves. The entries are looked up through the symmetry reduction of get_edges_depth3.
+import numpy as np
+import phase2prun as p2
+import tablegen as tg
+from cube import moveCube
+
+MAX_DEPTH = 6
+
+
+def _phase2_edge_moves():
+    """The edge permutations of the phase 2 moves: after move m, position i holds the edge of position perm[i]."""
+    return [tuple(e & 15 for e in moveCube[m].edges) for m in tg._PHASE2_MOVES]
+
+
+def _bfs(max_depth):
+    """Return the edge permutations with a distance <= max_depth and their distances."""
+    moves = _phase2_edge_moves()
+    depth = {tuple(range(12)): 0}
+    frontier = list(depth)
+    for d in range(1, max_depth + 1):
+        nxt = []
+        for ep in frontier:
+            for perm in moves:
+                ep_new = tuple(ep[i] for i in perm)
+                if ep_new not in depth:
+                    depth[ep_new] = d
+                    nxt.append(ep_new)
+        frontier = nxt
+    return np.array(list(depth), dtype=np.int8), np.array(list(depth.values()))
+
+
+def test_edges_depth3_matches_a_breadth_first_search():
+    ep, depth = _bfs(MAX_DEPTH)
+    assert len(ep) > 10000 and depth.max() == MAX_DEPTH
+    ud_edges = tg.get_perm(ep[:, :8])
+    slice_sorted = tg.get_perm(ep[:, 8:] - 8)
+    assert ud_edges[0] == 0 and slice_sorted[0] == 0
+    table = [p2.get_edges_depth3(int(u), int(s)) for u, s in zip(ud_edges, slice_sorted)]
+    assert table == list(depth % 3)
@@ -0,0 +1,497 @@
+# ################ The search kernels of solver.py against a recursive reference search ##############################
+# The kernels are run with mock move and pruning tables and compared with _ReferenceSearch, which searches like the
+# recursive search the kernels replaced. flip_move and slice_sorted_move are the real move tables, because the
+# flipslice classes of symmetries.py are defined by them. The other move tables are random, with the three moves of a
+# face the powers P, P^2 and P^3 of a random permutation P, so R3 = R1 * R2 holds like in the real tables. The
+# pruning values are pseudo random, in phase 1 they depend only on the flipslice class. So they do not depend on which
+# symmetry maps a flipslice coordinate to the representant of its class.
+import functools
+import threading
+import time
+import types
+import numpy as np
+import pytest
+import solver
+import symmetries as sy
+import tablegen as tg
+from cube import moveCube
+from cubedefs import Move, N_FLIP, N_TWIST, N_SLICE, N_PERM_4, N_CORNERS, N_UD_EDGES
+
+MAX_PHASE2 = 4  # short phase 2 maneuvers keep the search with the weak mock pruning fast
+
+
+def _slice_positions(ep):
+    """The positions of the FR, FL, BL, BR edges in increasing order."""
+    return np.sort(np.argsort(ep < 8, axis=1, kind='stable')[:, :4], axis=1)
+
+
+@functools.lru_cache(maxsize=None)
+def _edge_move_tables():
+    """The real flip_move and slice_sorted_move tables, computed from the edges of moveCube."""
+    eo = tg.set_flip(np.arange(N_FLIP))
+    slice_sorted = np.arange(N_SLICE * N_PERM_4)
+    ep = tg.set_slice(slice_sorted // N_PERM_4)
+    rows = np.arange(len(ep))[:, None]
+    ep[rows, _slice_positions(ep)] = tg.set_perm(slice_sorted % N_PERM_4, 4) + 8
+    flip_move = np.empty((N_FLIP, len(Move)), dtype=np.int64)
+    slice_sorted_move = np.empty((N_SLICE * N_PERM_4, len(Move)), dtype=np.int64)
+    for m in Move:
+        e = np.frombuffer(moveCube[m].edges, dtype=np.int8)
+        m_ep, m_eo = e & 15, e >> 4
+        flip_move[:, m] = tg.get_flip((eo[:, m_ep] + m_eo) % 2)
+        ep_new = ep[:, m_ep]
+        slice_sorted_move[:, m] = (N_PERM_4 * tg.get_slice(ep_new)
+                                   + tg.get_perm(ep_new[rows, _slice_positions(ep_new)] - 8))
+    return flip_move.ravel().tolist(), slice_sorted_move.ravel().tolist()
+
+
+def _face_move_table(rng, n):
+    """A random move table for n coordinates, the moves of a face are P, P^2 and P^3 of a random permutation P."""
+    table = np.empty((n, len(Move)), dtype=np.int64)
+    for face in range(6):
+        p = rng.permutation(n)
+        table[:, 3 * face], table[:, 3 * face + 1], table[:, 3 * face + 2] = p, p[p], p[p[p]]
+    return table.ravel().tolist()
+
+
+class _Hashed:
+    """A pseudo random table with the values 0 .. n - 1."""
+
+    def __init__(self, salt, n, log=None):
+        self.salt, self.n, self.log = salt, n, log
+
+    def __getitem__(self, ix):
+        if self.log is not None:
+            self.log.append(ix)
+        return hash((ix, self.salt)) % self.n
+
+
+def mock_tables(seed):
+    """Return the mock move tables mv, the pruning tables pr, coord, the coordinates co of the cube to solve and the
+    list log of the ud_edges lookups, which the search does once for every phase 1 leaf which passes the precheck."""
+    rng = np.random.default_rng(seed)
+    mv = types.SimpleNamespace()
+    mv.flip_move, mv.slice_sorted_move = _edge_move_tables()
+    mv.twist_move = _face_move_table(rng, N_TWIST)
+    mv.corners_move = _face_move_table(rng, N_CORNERS)
+    mv.ud_edges_move = _face_move_table(rng, N_UD_EDGES)
+    mv.u_edges_move = _face_move_table(rng, N_SLICE * N_PERM_4)
+    mv.d_edges_move = _face_move_table(rng, N_SLICE * N_PERM_4)
+
+    pr = types.SimpleNamespace()
+    pr.distance = [0] * 60  # the distance from the old distance and the new distance mod 3, like in the real module
+    for i in range(20):
+        for j in range(3):
+            pr.distance[3 * i + j] = (i // 3) * 3 + j
+            if i % 3 == 2 and j == 0:
+                pr.distance[3 * i + j] += 3
+            elif i % 3 == 0 and j == 2:
+                pr.distance[3 * i + j] -= 3
+    flipslice_class_depth3 = _Hashed((seed, 1), 3)
+    pr.get_flipslice_twist_depth3 = lambda ix: flipslice_class_depth3[ix // N_TWIST]
+    pr.get_corners_ud_edges_depth3 = _Hashed((seed, 2), 3).__getitem__
+    pr.cornslice_depth = _Hashed((seed, 3), 6)
+
+    log = []
+    coord = types.SimpleNamespace(u_edges_plus_d_edges_to_ud_edges=_Hashed((seed, 4), N_UD_EDGES, log))
+    co = types.SimpleNamespace(corners=int(rng.integers(N_CORNERS)), u_edges=int(rng.integers(N_SLICE * N_PERM_4)),
+                               d_edges=int(rng.integers(N_SLICE * N_PERM_4)), flip=int(rng.integers(N_FLIP)),
+                               twist=int(rng.integers(N_TWIST)), slice_sorted=int(rng.integers(N_SLICE * N_PERM_4)))
+    depth_phase2 = _Hashed((seed, 5), 3)
+    co.get_depth_phase2 = lambda corners, ud_edges: depth_phase2[(corners, ud_edges)]
+    co.dist = seed % 3  # the phase 1 distance the search starts with
+    return mv, pr, coord, co, log
+
+
+@pytest.fixture
+def mocks(monkeypatch):
+    """Install the mock tables of a seed in solver and return them."""
+    def install(seed):
+        mv, pr, coord, co, log = mock_tables(seed)
+        for name, value in (('mv', mv), ('pr', pr), ('coord', coord)):
+            monkeypatch.setattr(solver, name, value, raising=False)
+        return mv, pr, coord, co, log
+    return install
+
+
+class _ReferenceSearch:
+    """The recursive search for a single direction without rotation and inversion. It computes the flipslice class
+    of every node from scratch and counts the nodes like InstrumentedSolverThread. Like the kernels it takes the
+    corners of a phase 1 leaf which ends with R3, F3, L3 or B3 from the leaf before, the leaf of the move R1, F1, L1 or
+    B1. The mock pruning does not guarantee that this leaf has been searched, so the shortcut is part of the searched
+    behavior."""
+
+    def __init__(self, mv, pr, coord, co):
+        self.mv, self.pr, self.coord, self.co = mv, pr, coord, co
+        self.cornersave = None
+        self.sofar_phase1 = []
+        self.sofar_phase2 = []
+        self.solutions = []
+        self.shortest_length = 999
+        self.stats = solver.SearchStats()
+
+    def search(self, flip, twist, slice_sorted, dist, togo_phase1):
+        if togo_phase1 == 0:
+            self.phase1_solved(slice_sorted)
+            return
+        mv, pr = self.mv, self.pr
+        for m in Move:
+            if dist == 0 and togo_phase1 < 5 and m in solver._PHASE2_MOVES:
+                continue
+            if self.sofar_phase1 and self.sofar_phase1[-1] // 3 - m // 3 in (0, 3):
+                continue
+            flip_new = mv.flip_move[18 * flip + m]
+            twist_new = mv.twist_move[18 * twist + m]
+            slice_sorted_new = mv.slice_sorted_move[18 * slice_sorted + m]
+            flipslice = N_FLIP * (slice_sorted_new // N_PERM_4) + flip_new
+            classidx = sy.flipslice_classidx[flipslice]
+            sym = sy.flipslice_sym[flipslice]
+            dist_new = pr.distance[3 * dist + pr.get_flipslice_twist_depth3(
+                N_TWIST * classidx + sy.twist_conj[(twist_new << 4) + sym])]
+            if dist_new >= togo_phase1:
+                self.stats.pruned_phase1 += 1
+                continue
+            self.stats.nodes_phase1[len(self.sofar_phase1) + 1] += 1
+            self.sofar_phase1.append(m)
+            self.search(flip_new, twist_new, slice_sorted_new, dist_new, togo_phase1 - 1)
+            self.sofar_phase1.pop()
+
+    def phase1_solved(self, slice_sorted):
+        self.stats.phase1_leaves += 1
+        mv, pr, co = self.mv, self.pr, self.co
+        corners, u_edges, d_edges = co.corners, co.u_edges, co.d_edges
+        for m in self.sofar_phase1:
+            corners = mv.corners_move[18 * corners + m]
+            u_edges = mv.u_edges_move[18 * u_edges + m]
+            d_edges = mv.d_edges_move[18 * d_edges + m]
+        last = self.sofar_phase1[-1] if self.sofar_phase1 else None
+        if last in (Move.R3, Move.F3, Move.L3, Move.B3) and self.cornersave is not None:
+            corners = mv.corners_move[18 * self.cornersave + last - 1]
+        else:
+            self.cornersave = corners
+        togo2_limit = min(self.shortest_length - len(self.sofar_phase1), MAX_PHASE2)
+        if pr.cornslice_depth[24 * corners + slice_sorted] >= togo2_limit:
+            self.stats.pruned_cornslice += 1
+            return
+        ud_edges = self.coord.u_edges_plus_d_edges_to_ud_edges[24 * u_edges + d_edges % 24]
+        dist2 = co.get_depth_phase2(corners, ud_edges)
+        for togo2 in range(dist2, togo2_limit):
+            self.stats.phase2_entries += 1
+            if self.search_phase2(corners, ud_edges, slice_sorted, dist2, togo2):
+                break
+
+    def search_phase2(self, corners, ud_edges, slice_sorted, dist, togo_phase2):
+        """Return True if a phase 2 maneuver has been found."""
+        if togo_phase2 == 0:
+            if slice_sorted != 0:
+                return False
+            man = self.sofar_phase1 + self.sofar_phase2
+            if len(man) < self.shortest_length:
+                self.solutions.append(man)
+                self.shortest_length = len(man)
+            return True
+        mv, pr = self.mv, self.pr
+        last = (self.sofar_phase1 + self.sofar_phase2)[-1] if self.sofar_phase1 or self.sofar_phase2 else None
+        for m in solver._PHASE2_MOVES:
+            if last is not None and last // 3 - m // 3 in (0, 3):
+                continue
+            corners_new = mv.corners_move[18 * corners + m]
+            ud_edges_new = mv.ud_edges_move[18 * ud_edges + m]
+            slice_sorted_new = mv.slice_sorted_move[18 * slice_sorted + m]
+            classidx = sy.corner_classidx[corners_new]
+            sym = sy.corner_sym[corners_new]
+            dist_new = pr.distance[3 * dist + pr.get_corners_ud_edges_depth3(
+                N_CORNERS * classidx + sy.ud_edges_conj[(ud_edges_new << 4) + sym])]
+            if max(dist_new, pr.cornslice_depth[24 * corners_new + slice_sorted_new]) >= togo_phase2:
+                self.stats.pruned_phase2 += 1
+                continue
+            self.stats.nodes_phase2[len(self.sofar_phase2) + 1] += 1
+            self.sofar_phase2.append(m)
+            found = self.search_phase2(corners_new, ud_edges_new, slice_sorted_new, dist_new, togo_phase2 - 1)
+            self.sofar_phase2.pop()
+            if found:
+                return True
+        return False
+
+
+def reference_search(mv, pr, coord, co, max_togo):
+    """Return the reference search after the iterative deepening up to max_togo phase 1 moves."""
+    ref = _ReferenceSearch(mv, pr, coord, co)
+    for togo1 in range(co.dist, max_togo + 1):
+        ref.search(co.flip, co.twist, co.slice_sorted, co.dist, togo1)
+    return ref
+
+
+def search_context(thread_class, co, solutions, shortest_length):
+    """A search context of the direction rot = 0, inv = 0 for the mock coordinates co."""
+    th = thread_class(None, 0, 0, 0, 1e9, time.monotonic(), solutions, threading.Event(), shortest_length)
+    th.co_cube = co
+    th.max_phase2 = MAX_PHASE2
+    return th
+
+
+def _counters(stats):
+    """The counters of SearchStats without the times."""
+    d = stats.as_dict()
+    return {key: d[key] for key in ('nodes_phase1', 'nodes_phase2', 'pruned_phase1', 'pruned_cornslice',
+                                    'pruned_phase2', 'phase1_leaves', 'phase2_entries')}
+
+
+@pytest.mark.parametrize('thread_class', [solver.SolverThread, solver.InstrumentedSolverThread])
+@pytest.mark.parametrize('seed', range(3))
+def test_kernel_matches_reference(mocks, seed, thread_class):
+    mv, pr, coord, co, log = mocks(seed)
+    ref = reference_search(mv, pr, coord, co, 5)
+    expected_log = list(log)
+    log.clear()
+    solutions = []
+    th = search_context(thread_class, co, solutions, [999])
+    for togo1 in range(co.dist, 6):
+        th.search(co.flip, co.twist, co.slice_sorted, co.dist, togo1)
+    assert log == expected_log
+    assert [list(map(int, man)) for man in solutions] == ref.solutions
+    if thread_class is solver.InstrumentedSolverThread:
+        assert _counters(th.stats) == _counters(ref.stats)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_subtree_counts_add_up(mocks, seed):
+    """The phase 1 counts of the subtrees of the split backends add up to those of the whole tree."""
+    mv, pr, coord, co, log = mocks(seed)
+    for togo1 in range(solver._SPLIT_DEPTH, 5):
+        whole = search_context(solver.InstrumentedSolverThread, co, [], [999])
+        whole.search(co.flip, co.twist, co.slice_sorted, co.dist, togo1)
+        split = search_context(solver.InstrumentedSolverThread, co, [], [999])
+        for prefix in solver._SPLIT_PREFIXES:
+            split.search(co.flip, co.twist, co.slice_sorted, co.dist, togo1, prefix)
+        for key in ('nodes_phase1', 'pruned_phase1', 'phase1_leaves'):
+            assert getattr(split.stats, key) == getattr(whole.stats, key)
+
+
+@pytest.fixture
+def split_mocks(mocks, monkeypatch):
+    """Mock tables for the backends which split the search trees, with a phase 1 search up to two moves. Without
+    phase 1 pruning the leaves of R1 and R3 are always both searched, like with the real tables. The corners the
+    kernel computes for every phase 1 leaf are recorded as (phase 1 maneuver, corners)."""
+    mv, pr, coord, co, log = mocks(0)
+    pr.get_flipslice_twist_depth3 = lambda ix: 0
+    pr.cornslice_depth = _Hashed(None, 1)  # every phase 1 leaf enters phase 2
+    co.dist = 0
+    monkeypatch.setattr(solver, '_MAX_PHASE1', solver._SPLIT_DEPTH + 1)
+    monkeypatch.setattr(solver, '_MAX_PHASE2', MAX_PHASE2)
+
+    def prepare(self):
+        self.co_cube = co
+        return co.dist
+    monkeypatch.setattr(solver.SolverThread, 'prepare', prepare)
+    leaves = []
+    search_phase2 = solver.SolverThread.search_phase2
+
+    def recording_search_phase2(self, corners, *args):
+        leaves.append((tuple(self.sofar_phase1[:self.n1]), corners))
+        return search_phase2(self, corners, *args)
+    monkeypatch.setattr(solver.SolverThread, 'search_phase2', recording_search_phase2)
+    return mv, co, leaves
+
+
+def _check_leaf_corners(mv, co, leaves):
+    assert any(man and man[-1] in (Move.R3, Move.F3, Move.L3, Move.B3) for man, _ in leaves)
+    for man, corners in leaves:
+        expected = co.corners
+        for m in man:
+            expected = mv.corners_move[18 * expected + m]
+        assert corners == expected, man
+
+
+def test_split_subtrees_compute_the_corners(split_mocks, monkeypatch):
+    """A subtree task of the split backend whose prefix is a phase 1 leaf ending with R3 starts with a fresh search
+    context, the leaf of R1 was searched by another task."""
+    mv, co, leaves = split_mocks
+    monkeypatch.setattr(solver, '_pool_terminated', threading.Event())
+    monkeypatch.setattr(solver, '_pool_shortest_length', solver.mp.Array('i', [999]))
+    request = next(solver._split_requests)
+    for i, togo1, prefix in solver._subtrees([0], [co.dist]):
+        solver._search_subtree(None, (request, 0, 0), togo1, prefix, 0, 1e9, time.monotonic(), None, False)
+    _check_leaf_corners(mv, co, leaves)
+
+
+def test_free_thread_subtrees_compute_the_corners(split_mocks, monkeypatch):
+    """The workers of the freethread backend reuse their search contexts for many subtrees."""
+    mv, co, leaves = split_mocks
+    monkeypatch.setattr(solver, 'FREE_THREAD_WORKERS', 3)
+    solver._run_free_threads(None, [0], 0, 1e9, time.monotonic(), None)
+    _check_leaf_corners(mv, co, leaves)
+
+
+class _MockCubieCube:
+    """A valid cube without symmetries, which the process backends can send to their workers."""
+
+    def verify(self):
+        return 0
+
+    def symmetries(self):
+        return []
+
+
+@pytest.fixture
+def cube_mocks(monkeypatch):
+    """Mock face and cubie modules, every cube definition string is a valid cube without symmetries."""
+    cc = _MockCubieCube()
+    fc = types.SimpleNamespace(from_string=lambda s: 0, to_cubie_cube=lambda: cc)
+    monkeypatch.setattr(solver, 'face', types.SimpleNamespace(FaceCube=lambda: fc), raising=False)
+    monkeypatch.setattr(solver, 'cubie', types.SimpleNamespace(CUBE_OK=0), raising=False)
+    return cc
+
+
+def test_iter_solutions_does_not_use_the_thread_pool(split_mocks, cube_mocks, monkeypatch):
+    """An open generator must not hold the shared workers of the thread backend."""
+    calls = []
+    get_thread_pool = solver._get_thread_pool
+    monkeypatch.setattr(solver, '_get_thread_pool', lambda: calls.append(1) or get_thread_pool())
+    results = list(solver.iter_solutions('cube', max_length=0))
+    assert calls == []
+    assert all(length == len(man.split()) - 1 for man, length, _ in results)
+    assert [length for _, length, _ in results] == sorted({length for _, length, _ in results}, reverse=True)
+
+
+def test_concurrent_thread_requests_do_not_wait_for_each_other(monkeypatch):
+    """The searches of a request run at once even if the searches of an earlier request are still running."""
+    release = threading.Event()
+
+    def search(thread_class, cc, *args, **kwargs):
+        if cc == 'slow':
+            release.wait(10)
+    monkeypatch.setattr(solver, '_search_in_context', search)
+    monkeypatch.setattr(solver, '_thread_pool', None)
+    slow = threading.Thread(target=solver._run_threads, args=('slow', range(6), 20, 1, time.monotonic(), None))
+    slow.start()
+    try:
+        t = time.monotonic()
+        solver._run_threads('fast', range(6), 20, 1, time.monotonic(), None)
+        assert time.monotonic() - t < 5
+    finally:
+        release.set()
+        slow.join()
+        solver._thread_pool.shutdown()
+
+
+@pytest.fixture
+def endless_search(mocks, cube_mocks, monkeypatch):
+    """A search without phase 1 pruning, which runs until it is terminated. The worker processes are forked with the
+    mock tables."""
+    mv, pr, coord, co, log = mocks(0)
+    pr.get_flipslice_twist_depth3 = lambda ix: 0
+    co.dist = 0
+
+    def prepare(self):
+        self.co_cube = co
+        return co.dist
+    monkeypatch.setattr(solver.SolverThread, 'prepare', prepare)
+    monkeypatch.setattr(solver, 'PROCESS_WORKERS', 2)
+    solver.shutdown()
+    yield
+    solver.shutdown()
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process', 'split', 'freethread'])
+def test_hard_deadline(endless_search, monkeypatch, backend):
+    monkeypatch.setattr(solver, '_quick_solution', lambda cc, deadline: [Move.R1])
+    monkeypatch.setattr(solver, 'FREE_THREAD_WORKERS', 2)
+    t = time.monotonic()
+    man, deadline_hit = solver.solve('cube', max_length=0, timeout=0.3, backend=backend, hard_deadline=True)
+    assert time.monotonic() - t < 0.3 + 0.5
+    assert deadline_hit
+    assert man.endswith('f)')
+
+
+def test_hard_deadline_bounds_the_quick_search(endless_search):
+    t = time.monotonic()
+    man, deadline_hit = solver.solve('cube', max_length=0, timeout=0.3, hard_deadline=True)
+    assert time.monotonic() - t < 0.3 + 0.5
+    assert deadline_hit
+
+
+@pytest.mark.parametrize('backend', ['process', 'split'])
+def test_process_backends_keep_the_deadline(endless_search, monkeypatch, backend):
+    """A request returns at its deadline while the workers of a cold pool are still loading the tables, and the next
+    request returns at its deadline while the pool is busy with the searches of the first one."""
+    monkeypatch.setattr(solver, '_preload', lambda: time.sleep(1))
+    for _ in range(2):
+        t = time.monotonic()
+        assert solver._BACKENDS[backend](None, range(6), 0, 0.3, t, t + 0.3) == []
+        assert time.monotonic() - t < 0.3 + 0.5
+
+
+def _distances(move, moves):
+    """The distances from the coordinate 0 of all coordinates of the move table move with the moves moves."""
+    depth = np.full(len(move), -1)
+    depth[0] = 0
+    frontier = np.zeros(1, dtype=np.int64)
+    d = 0
+    while len(frontier) > 0:
+        d += 1
+        nxt = move[frontier][:, moves].ravel()
+        frontier = np.unique(nxt[depth[nxt] < 0])
+        depth[frontier] = d
+    return depth
+
+
+@functools.lru_cache(maxsize=None)
+def _phase2_edge_tables():
+    """The real ud_edges move table for the phase 2 moves and the phase 2 distances of the ud_edges coordinate and of
+    the slice_sorted coordinates < 24."""
+    ud = tg.set_perm(np.arange(N_UD_EDGES), 8)
+    ud_edges_move = np.zeros((N_UD_EDGES, len(Move)), dtype=np.int64)
+    for m in solver._PHASE2_MOVES:
+        m_ep = np.frombuffer(moveCube[m].edges, dtype=np.int8) & 15
+        ud_edges_move[:, m] = tg.get_perm(ud[:, m_ep[:8]])
+    slice_sorted_move = np.array(_edge_move_tables()[1]).reshape(-1, len(Move))[:N_PERM_4]
+    moves = list(solver._PHASE2_MOVES)
+    return ud_edges_move, _distances(ud_edges_move, moves), _distances(slice_sorted_move, moves)
+
+
+@pytest.fixture
+def strong_mocks(mocks):
+    """Mock tables with exact phase 2 pruning for the edges and fixed corners, so the compact and the strong pruning
+    are both admissible and a phase 2 solution solves the edges. The strong pruning uses the real tables."""
+    mv, pr, coord, co, log = mocks(0)
+    ud_edges_move, ud_edges_dist, slice_dist = _phase2_edge_tables()
+    assert sy.corner_classidx[0] == 0 and sy.corner_sym[0] == 0  # the corners coordinate 0 is not conjugated
+    mv.ud_edges_move = ud_edges_move.ravel().tolist()
+    mv.corners_move = [0] * len(Move)
+    pr.get_corners_ud_edges_depth3 = lambda ix: int(ud_edges_dist[ix]) % 3  # ix = ud_edges for the corners 0
+    pr.cornslice_depth = slice_dist.tolist()
+    co.corners = 0
+    co.get_depth_phase2 = lambda corners, ud_edges: int(ud_edges_dist[ud_edges])
+    return mv, coord, co
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_strong_pruning_finds_the_same_solutions(strong_mocks, monkeypatch, seed):
+    mv, coord, co = strong_mocks
+    rng = np.random.default_rng(seed)
+    for _ in range(3):
+        ud_edges, slice_sorted = 0, 0
+        for m in rng.choice(solver._PHASE2_MOVES, 10):
+            ud_edges = mv.ud_edges_move[18 * ud_edges + m]
+            slice_sorted = mv.slice_sorted_move[18 * slice_sorted + m]
+        coord.u_edges_plus_d_edges_to_ud_edges = {24 * co.u_edges + co.d_edges % 24: ud_edges}
+        results = {}
+        for mode in ('compact', 'strong'):
+            monkeypatch.setattr(solver, 'PHASE2_PRUNING', mode)
+            for thread_class in (solver.SolverThread, solver.InstrumentedSolverThread):
+                solutions = []
+                th = search_context(thread_class, co, solutions, [999])
+                th.max_phase2 = 12
+                th.phase1_solved(slice_sorted)  # a phase 1 leaf without phase 1 moves
+                results[mode, thread_class] = [list(map(int, man)) for man in solutions], getattr(th, 'stats', None)
+        (man,), _ = results['compact', solver.SolverThread]
+        assert all(sols == [man] for sols, _ in results.values())
+        u, s = ud_edges, slice_sorted
+        for m in man:
+            u, s = mv.ud_edges_move[18 * u + m], mv.slice_sorted_move[18 * s + m]
+        assert (u, s) == (0, 0)
+        compact = results['compact', solver.InstrumentedSolverThread][1]
+        strong = results['strong', solver.InstrumentedSolverThread][1]
+        assert sum(strong.nodes_phase2) <= sum(compact.nodes_phase2)
+        assert sum(strong.nodes_phase2) == len(man)  # the edges bound is the exact distance here
@@ -0,0 +1,30 @@
+# ################ The parallel table builder of tablegen.py ###########################################################
+import runpy
+import sys
+import numpy as np
+import pytest
+import symmetries as sy
+import tablegen as tg
+import tables
+
+
+@pytest.mark.parametrize('build', [tg.twist_conj, tg.ud_edges_conj, tg.flipslice_tables, tg.corner_tables,
+                                   tg.ud_edges_tables])
+def test_jobs_do_not_change_the_tables(build):
+    serial = build(*sy._group(), jobs=1)
+    parallel = build(*sy._group(), jobs=3)
+    if isinstance(serial, tuple):
+        assert len(serial) == len(parallel)
+    else:
+        serial, parallel = (serial,), (parallel,)
+    for a, b in zip(serial, parallel):
+        assert a.dtype == b.dtype and a.tobytes() == np.asarray(b).tobytes()
+
+
+def test_main_passes_jobs_to_the_loaders(monkeypatch):
+    seen = []
+    monkeypatch.setattr(tg, 'JOBS', 1)
+    monkeypatch.setattr(tables, 'preload', lambda: seen.append(tg.JOBS))
+    monkeypatch.setattr(sys, 'argv', ['tablegen.py', '--jobs', '5'])
+    runpy.run_path(tg.__file__, run_name='__main__')  # like python tablegen.py, a second copy of the module
+    assert seen == [5]
@@ -0,0 +1,92 @@
+# ################ The table bundle of tables.py #######################################################################
+import array
+import json
+import os
+import numpy as np
+import pytest
+import tables
+
+
+@pytest.fixture
+def bundle(monkeypatch, tmp_path):
+    """An empty table folder for each test."""
+    folder = str(tmp_path / 'twophase')
+    monkeypatch.setattr(tables, 'FOLDER', folder)
+    monkeypatch.setattr(tables, 'BUNDLE', os.path.join(folder, 'tables.bundle'))
+    monkeypatch.setattr(tables, '_bundle', None)
+    return tables.BUNDLE
+
+
+def _header(path):
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    return json.loads(data[12:12 + int.from_bytes(data[8:12], 'little')])
+
+
+def _patch_file(path, offset, data):
+    with open(path, 'r+b') as fh:
+        fh.seek(offset)
+        fh.write(data)
+    tables._bundle = None
+
+
+def test_round_trip(bundle):
+    words = array.array('H', range(1000))
+    tables.store_tables({'words': ('H', words), 'bytes': ('B', np.arange(13, dtype=np.uint8))})
+    assert os.path.isfile(bundle) and os.path.isfile(bundle + '.lock')
+    assert list(tables.load_table('words', 'H', 1000)) == list(words)
+    assert list(tables.load_table('words', 'H', 10)) == list(range(10))
+    assert list(tables.load_table('bytes', 'B', 13)) == list(range(13))
+    assert all(t['offset'] % 8 == 0 for t in _header(bundle)['tables'].values())
+    assert tables.verify_bundle() == []
+
+
+def test_store_keeps_the_other_tables(bundle):
+    tables.store_tables({'a': ('B', bytes([1, 2, 3])), 'b': ('B', bytes([4, 5]))})
+    tables.store_tables({'b': ('B', bytes([6, 7, 8])), 'c': ('I', array.array('I', [2 ** 31]))})
+    assert list(tables.load_table('a', 'B', 3)) == [1, 2, 3]
+    assert list(tables.load_table('b', 'B', 3)) == [6, 7, 8]
+    assert list(tables.load_table('c', 'I', 1)) == [2 ** 31]
+    assert tables.has_table('a') and not tables.has_table('d')
+
+
+def test_missing_and_mismatched_tables(bundle):
+    tables.store_tables({'a': ('H', array.array('H', [1, 2]))})
+    with pytest.raises(KeyError):
+        tables.load_table('d', 'B', 1)
+    with pytest.raises(ValueError):
+        tables.load_table('a', 'B', 2)  # wrong item size
+    with pytest.raises(ValueError):
+        tables.load_table('a', 'H', 3)  # too short
+
+
+def test_corruption_is_detected(bundle, monkeypatch):
+    tables.store_tables({'a': ('B', bytes(100)), 'b': ('B', bytes(100))})
+    _patch_file(bundle, _header(bundle)['tables']['b']['offset'] + 50, b'\x01')
+    assert tables.verify_bundle() == ['b']
+    assert tables.load_table('b', 'B', 100)[50] == 1  # the checksum is not checked on load by default
+    monkeypatch.setattr(tables, 'VERIFY_ON_LOAD', True)
+    assert list(tables.load_table('a', 'B', 100)) == [0] * 100
+    with pytest.raises(ValueError, match='corrupt'):
+        tables.load_table('b', 'B', 100)
+
+
+def test_foreign_and_old_bundles_are_rejected(bundle):
+    tables.store_tables({'a': ('B', bytes(8))})
+    header = _header(bundle)
+    text = json.dumps(dict(header, version=tables.BUNDLE_VERSION + 1)).encode('ascii')
+    _patch_file(bundle, 12, text.ljust(header['tables']['a']['offset'] - 12))
+    with pytest.raises(ValueError, match='version'):
+        tables.load_table('a', 'B', 8)
+    _patch_file(bundle, 0, b'NOBUNDLE')
+    with pytest.raises(ValueError, match='not a table bundle'):
+        tables.load_table('a', 'B', 8)
+
+
+def test_truncated_bundle_is_rejected(bundle):
+    tables.store_tables({'a': ('B', bytes(64))})
+    with open(bundle, 'r+b') as fh:
+        fh.truncate(_header(bundle)['tables']['a']['offset'] + 32)
+    tables._bundle = None
+    with pytest.raises(ValueError, match='truncated'):
+        tables.has_table('a')